@@ -1,4 +1,57 @@
-from swagger_coverage_tool import SwaggerCoverageTracker
+import functools
+from typing import TYPE_CHECKING, Callable
 
+from httpx import Response
 
-tracker = SwaggerCoverageTracker(service="test_api")
\ No newline at end of file
+from clients.recorders import APICall, notify_recorders
+from tools.warmup import is_warming_up
+
+if TYPE_CHECKING:
+    from swagger_coverage_tool import SwaggerCoverageTracker
+
+
+class LazyCoverageTracker:
+    """
+    Обертка над SwaggerCoverageTracker, которая импортирует и создает трекер
+    только при первом выполненном запросе, а не при импорте клиентов.
+    """
+    def __init__(self, service: str):
+        self.service = service
+        self._tracker: "SwaggerCoverageTracker | None" = None
+
+    @property
+    def tracker(self) -> "SwaggerCoverageTracker":
+        if self._tracker is None:
+            from swagger_coverage_tool import SwaggerCoverageTracker
+
+            self._tracker = SwaggerCoverageTracker(service=self.service)
+        return self._tracker
+
+    def track_coverage_httpx(self, endpoint: str):
+        """
+        Аналог `SwaggerCoverageTracker.track_coverage_httpx`.
+
+        :param endpoint: Шаблон маршрута, например /api/v1/courses/{course_id}
+        :return: Декоратор метода клиента
+        """
+        def wrapper(func: Callable[..., Response]):
+            @functools.wraps(func)
+            def inner(*args, **kwargs):
+                response = func(*args, **kwargs)
+                if is_warming_up():
+                    return response
+
+                notify_recorders(APICall(func, args, kwargs, endpoint, response))
+
+                tracker = self.tracker
+                if coverage := tracker.build_endpoint_coverage_for_httpx(endpoint, response):
+                    tracker.storage.save(coverage)
+
+                return response
+
+            return inner
+
+        return wrapper
+
+
+tracker = LazyCoverageTracker(service="test_api")
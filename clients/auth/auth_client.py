@@ -1,19 +1,20 @@
-import allure
 from httpx import Response
 
 from clients.api_coverage import tracker
 from clients.auth.auth_schema import LoginRequestSchema, LoginResponseSchema, RefreshRequestSchema
 from clients.base_client import BaseAPIClient
 from clients.public_builder import get_public_client
+from tools.allure.steps import step
 from tools.routes import APIRoutes
 from clients import api_coverage
+from clients.schema_registry import schema_registry
 
 
 class AuthAPIClient(BaseAPIClient):
     """
     Клиент для работы с методами авторизации
     """
-    @allure.step("Логин пользователя")
+    @step("Логин пользователя")
     @tracker.track_coverage_httpx(f'{APIRoutes.AUTHENTICATION}/login')
     def login_api(self, request_body: LoginRequestSchema) -> Response:
         """
@@ -22,10 +23,10 @@ class AuthAPIClient(BaseAPIClient):
         :param request_body: Словарь с почтой и паролем
         :return: Ответ сервера с токеном
         """
-        return self.post(f'{APIRoutes.AUTHENTICATION}/login', json=request_body.model_dump(by_alias=True))
+        return self.post(f'{APIRoutes.AUTHENTICATION}/login', json=request_body)
 
     @tracker.track_coverage_httpx(f'{APIRoutes.AUTHENTICATION}/refresh')
-    @allure.step("Обновление токена")
+    @step("Обновление токена")
     def refresh_api(self, request_body: RefreshRequestSchema) -> Response:
         """
         Выполняет POST запрос для обновления токена
@@ -33,14 +34,14 @@ class AuthAPIClient(BaseAPIClient):
         :param request_body: Словарь с рефреш токеном
         :return: Ответ сервера с обновленным токеном
         """
-        return self.post(f'{APIRoutes.AUTHENTICATION}/refresh', json=request_body.model_dump(by_alias=True))
+        return self.post(f'{APIRoutes.AUTHENTICATION}/refresh', json=request_body)
 
-    @allure.step("Логин пользователя и валидация ответа по схеме")
+    @step("Логин пользователя и валидация ответа по схеме")
     def login(self, request_body: LoginRequestSchema) -> LoginResponseSchema:
         response = self.login_api(request_body)
-        return LoginResponseSchema.model_validate_json(response.text) # вернет объект json, не поднимет ошибку
+        return schema_registry.validate_response(LoginResponseSchema, response.content) # вернет провалидированную модель, при невалидном ответе поднимет ValidationError
 
-@allure.step("Получение клиента для работы с API аутентификации")
+@step("Получение клиента для работы с API аутентификации")
 def get_auth_client() -> AuthAPIClient:
     """
     Функция получения клиента для работы с методами авторизации
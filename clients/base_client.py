@@ -1,8 +1,21 @@
+import gzip
+from json import dumps
 from typing import Any
 
-import allure
 from httpx import URL, Client, QueryParams, Response
 from httpx._types import RequestData, RequestFiles
+from pydantic import BaseModel
+
+from config import settings
+from tools.allure.steps import step
+from tools.http.timings import TimingCollector
+from tools.tracing import SpanKind, StatusCode, tracer
+
+def dumps_json(data: Any) -> bytes:
+    """
+    Кодирует данные в JSON так же, как httpx для аргумента json.
+    """
+    return dumps(data, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
 
 
 class BaseAPIClient:
@@ -12,7 +25,58 @@ class BaseAPIClient:
     def __init__(self, client: Client):
         self.client = client
 
-    @allure.step("Создание GET запроса на URL: {url}")
+    @staticmethod
+    def _json_body(json: BaseModel | Any | None) -> dict[str, Any]:
+        """
+        Кодирует JSON тело запроса в bytes. Если включено `settings.compression.request_compression`,
+        тела не меньше `request_min_size` байт сжимаются gzip.
+
+        :param json: Модель запроса или данные в формате JSON
+        :return: Аргументы запроса httpx: content с заголовками
+        """
+        if json is None:
+            return {}
+
+        if isinstance(json, BaseModel):
+            # Сериализатор модели возвращает bytes сразу, без промежуточного dict и строки
+            content = json.__pydantic_serializer__.to_json(json, by_alias=True)
+        else:
+            content = dumps_json(json)
+
+        headers = {"Content-Type": "application/json"}
+        compression = settings.compression
+        if compression.request_compression and len(content) >= compression.request_min_size:
+            content = gzip.compress(content, compression.request_level, mtime=0)
+            headers["Content-Encoding"] = "gzip"
+        return {"content": content, "headers": headers}
+
+    def _send(self, method: str, url: str | URL, headers: dict[str, str] | None = None, **kwargs: Any) -> Response:
+        """
+        Выполняет запрос в спане трассировки и передает серверу контекст трассы в заголовке traceparent.
+        Длительности фаз запроса сохраняются в `response.extensions["timings"]`, см. `get_timings`.
+
+        :param method: HTTP метод
+        :param url: URL ресурса
+        :param headers: Дополнительные заголовки запроса
+        :param kwargs: Остальные аргументы `httpx.Client.request`
+        :return: Ответ сервера
+        """
+        attributes = {"http.request.method": method, "url.path": str(url)}
+        with tracer.span(f"HTTP {method}", SpanKind.CLIENT, attributes) as span:
+            if span is not None:
+                headers = {**(headers or {}), "traceparent": span.traceparent}
+
+            timings = TimingCollector()
+            response = self.client.request(method, url, headers=headers, extensions={"trace": timings}, **kwargs)
+            response.extensions["timings"] = timings.build(response)
+
+            if span is not None:
+                span.attributes["http.response.status_code"] = response.status_code
+                if response.is_server_error:
+                    span.status = StatusCode.ERROR
+            return response
+
+    @step("Создание GET запроса на URL: {url}")
     def get(self,
             url: str | URL,
             params: QueryParams | None = None
@@ -24,12 +88,12 @@ class BaseAPIClient:
         :param params: Параметры запроса
         :return: Ответ сервера
         """
-        return self.client.get(url, params=params)
+        return self._send("GET", url, params=params)
 
-    @allure.step("Создание POST запроса на URL: {url}")
+    @step("Создание POST запроса на URL: {url}")
     def post(self,
              url: str | URL,
-             json: Any | None = None,
+             json: BaseModel | Any | None = None,
              data: RequestData | None = None,
              files: RequestFiles | None = None
              ) -> Response:
@@ -37,28 +101,28 @@ class BaseAPIClient:
         Выполняет POST запрос
 
         :param url: URL ресурса
-        :param json: Данные в формате JSON
+        :param json: Модель запроса или данные в формате JSON
         :param data: Данные в формате x-www-form-urlencoded
         :param files: Файлы
         :return: Ответ сервера
         """
-        return self.client.post(url, json=json, data=data, files=files)
+        return self._send("POST", url, data=data, files=files, **self._json_body(json))
 
-    @allure.step("Создание PATCH запроса на URL: {url}")
+    @step("Создание PATCH запроса на URL: {url}")
     def patch(self,
              url: str | URL,
-             json: Any | None
+             json: BaseModel | Any | None
               ) -> Response:
         """
         Выполняет PATCH запрос
 
         :param url: URL ресурса
-        :param json: Данные в формате JSON
+        :param json: Модель запроса или данные в формате JSON
         :return: Ответ сервера
         """
-        return self.client.patch(url, json=json)
+        return self._send("PATCH", url, **self._json_body(json))
 
-    @allure.step("Создание DELETE запроса на URL: {url}")
+    @step("Создание DELETE запроса на URL: {url}")
     def delete(self, url: str | URL) -> Response:
         """
         Выполняет DELETE запрос
@@ -66,4 +130,4 @@ class BaseAPIClient:
         :param url: URL ресурса
         :return: Ответ сервера
         """
-        return self.client.delete(url)
\ No newline at end of file
+        return self._send("DELETE", url)
\ No newline at end of file
@@ -1,4 +1,3 @@
-import allure
 from httpx import Response
 
 from clients.api_coverage import tracker
@@ -10,6 +9,8 @@ from clients.courses.courses_schema import (
     UpdateCourseRequestSchema,
 )
 from clients.private_builder import AuthUserSchema, get_private_client
+from clients.schema_registry import schema_registry
+from tools.allure.steps import step
 from tools.routes import APIRoutes
 
 
@@ -17,7 +18,7 @@ class CoursesAPIClient(BaseAPIClient):
     """
     Клиент для работы с курсами
     """
-    @allure.step("Получение списка курсов")
+    @step("Получение списка курсов")
     @tracker.track_coverage_httpx(APIRoutes.COURSES)
     def get_courses_api(self, query: GetCoursesQuerySchema) -> Response:
         """
@@ -28,7 +29,7 @@ class CoursesAPIClient(BaseAPIClient):
         """
         return self.get(APIRoutes.COURSES, params=query.model_dump(by_alias=True))
 
-    @allure.step("Получение курса с id: {course_id}")
+    @step("Получение курса с id: {course_id}")
     @tracker.track_coverage_httpx(APIRoutes.COURSES + '/{course_id}')
     def get_course_api(self, course_id: str) -> Response:
         """
@@ -39,7 +40,7 @@ class CoursesAPIClient(BaseAPIClient):
         """
         return self.get(f'{APIRoutes.COURSES}/{course_id}')
 
-    @allure.step("Создание курса")
+    @step("Создание курса")
     @tracker.track_coverage_httpx(APIRoutes.COURSES)
     def create_course_api(self, request_body: CreateCourseRequestSchema) -> Response:
         """
@@ -48,14 +49,14 @@ class CoursesAPIClient(BaseAPIClient):
         :param request_body: Тело запроса с данными курса
         :return: Ответ сервера с сущностью созданного курса
         """
-        return self.post(APIRoutes.COURSES, json=request_body.model_dump(by_alias=True))
+        return self.post(APIRoutes.COURSES, json=request_body)
 
-    @allure.step("Создание курса и валидация ответа по схеме")
+    @step("Создание курса и валидация ответа по схеме")
     def create_course(self, request_body: CreateCourseRequestSchema) -> CreateCourseResponseSchema:
         response = self.create_course_api(request_body)
-        return CreateCourseResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(CreateCourseResponseSchema, response.content)
 
-    @allure.step("Обновление курса")
+    @step("Обновление курса")
     @tracker.track_coverage_httpx(APIRoutes.COURSES + '/{course_id}')
     def update_course_api(self, course_id: str, request_body: UpdateCourseRequestSchema) -> Response:
         """
@@ -65,14 +66,14 @@ class CoursesAPIClient(BaseAPIClient):
         :param request_body: Тело запроса с данными для обновления
         :return: Ответ сервера с обновленной сущностью курса
         """
-        return self.patch(f'{APIRoutes.COURSES}/{course_id}', json=request_body.model_dump(by_alias=True))
+        return self.patch(f'{APIRoutes.COURSES}/{course_id}', json=request_body)
 
-    @allure.step("Удаление курса")
+    @step("Удаление курса")
     @tracker.track_coverage_httpx(APIRoutes.COURSES + '/{course_id}')
     def delete_course_api(self, course_id: str) -> Response:
         return self.delete(f'{APIRoutes.COURSES}/{course_id}')
 
-@allure.step("Получение клиента для работы с API курсов")
+@step("Получение клиента для работы с API курсов")
 def get_private_courses_client(user: AuthUserSchema) -> CoursesAPIClient:
     """
     Функция получения клиента для работы с методами курсов
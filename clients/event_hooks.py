@@ -1,8 +1,12 @@
+import time
+
 import allure
 from httpx import Request, Response
 
 from tools.http.curl import make_curl_from_request
 from tools.logger import get_logger
+from tools.metrics import api_request_duration, api_requests, normalize_path
+from tools.warmup import is_warming_up
 
 logger = get_logger("HTTP_CLIENT")
 
@@ -35,4 +39,29 @@ def log_response_event_hook(response: Response):  # Создаем event hook д
     # Пишем в лог информационное сообщение о полученном ответе
     logger.info(
         f"Получаю ответ {response.status_code} {response.reason_phrase} от {response.url}"
-    )
\ No newline at end of file
+    )
+
+
+def metrics_request_event_hook(request: Request):
+    """
+    Запоминает время отправки запроса для метрики длительности.
+
+    :param request: Объект запроса HTTPX.
+    """
+    request.extensions["metrics_started_at"] = time.perf_counter()
+
+
+def metrics_response_event_hook(response: Response):
+    """
+    Учитывает запрос в метриках: количество по статусу и длительность до получения заголовков ответа.
+
+    :param response: Объект ответа HTTPX.
+    """
+    if is_warming_up():
+        return
+
+    request = response.request
+    route = normalize_path(request.url.path)
+    api_requests.inc(method=request.method, route=route, status=str(response.status_code))
+    if (started_at := request.extensions.get("metrics_started_at")) is not None:
+        api_request_duration.observe(time.perf_counter() - started_at, method=request.method, route=route)
@@ -1,4 +1,3 @@
-import allure
 from httpx import Response
 
 from clients.api_coverage import tracker
@@ -16,6 +15,8 @@ from clients.exercises.exercises_schema import (
     UpdateExerciseResponseSchema,
 )
 from clients.private_builder import AuthUserSchema, get_private_client
+from clients.schema_registry import schema_registry
+from tools.allure.steps import step
 from tools.routes import APIRoutes
 
 
@@ -23,7 +24,7 @@ class ExercisesAPIClient(BaseAPIClient):
     """
     Клиент для работы с упражнениями
     """
-    @allure.step("Получение списка упражнений")
+    @step("Получение списка упражнений")
     @tracker.track_coverage_httpx(APIRoutes.EXERCISES)
     def get_exercises_api(self, query: GetExercisesQuerySchema) -> Response:
         """
@@ -34,12 +35,12 @@ class ExercisesAPIClient(BaseAPIClient):
         """
         return self.get(APIRoutes.EXERCISES, params=query.model_dump(by_alias=True))
 
-    @allure.step("Получение списка упражнений и валидация ответа по схеме")
+    @step("Получение списка упражнений и валидация ответа по схеме")
     def get_exercises(self, course_id: GetExercisesQuerySchema) -> GetExercisesResponseSchema:
         response = self.get_exercises_api(course_id)
-        return response.json()
+        return schema_registry.validate_response(GetExercisesResponseSchema, response.content)
 
-    @allure.step("Получение данных упражнения с id: {query}")
+    @step("Получение данных упражнения с id: {query}")
     @tracker.track_coverage_httpx(APIRoutes.EXERCISES + '/{exercise_id}')
     def get_exercise_api(self, query: GetExerciseQuerySchema) -> Response:
         """
@@ -50,12 +51,12 @@ class ExercisesAPIClient(BaseAPIClient):
         """
         return self.get(f"{APIRoutes.EXERCISES}/{query.exercise_id}")
 
-    @allure.step("Получение упражнения с id: {query}")
+    @step("Получение упражнения с id: {query}")
     def get_exercise(self, query: GetExerciseQuerySchema) -> GetExerciseResponseSchema:
         response = self.get_exercise_api(query=query)
-        return GetExerciseResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(GetExerciseResponseSchema, response.content)
 
-    @allure.step("Создание нового упражнения")
+    @step("Создание нового упражнения")
     @tracker.track_coverage_httpx(APIRoutes.EXERCISES)
     def create_exercise_api(self, request_body: CreateExerciseRequestSchema) -> Response:
         """
@@ -64,14 +65,14 @@ class ExercisesAPIClient(BaseAPIClient):
         :param request_body: Тело запроса 
         :return: Ответ сервера
         """
-        return self.post(APIRoutes.EXERCISES, json=request_body.model_dump(by_alias=True))
+        return self.post(APIRoutes.EXERCISES, json=request_body)
 
-    @allure.step("Создание упражнения и валидация ответа по схеме")
+    @step("Создание упражнения и валидация ответа по схеме")
     def create_exercise(self, request_body: CreateExerciseRequestSchema) -> CreateExerciseResponseSchema:
         response = self.create_exercise_api(request_body)
-        return CreateExerciseResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(CreateExerciseResponseSchema, response.content)
 
-    @allure.step("Обновление упражнения с id: {query}")
+    @step("Обновление упражнения с id: {query}")
     @tracker.track_coverage_httpx(APIRoutes.EXERCISES + '/{exercise_id}')
     def update_exercise_api(self, query: UpdateExerciseQuerySchema, request_body: UpdateExerciseRequestSchema) -> Response:
         """
@@ -81,14 +82,14 @@ class ExercisesAPIClient(BaseAPIClient):
         :param request_body: Тело запроса
         :return: Ответ сервера
         """
-        return self.patch(f"{APIRoutes.EXERCISES}/{query.exercise_id}", json=request_body.model_dump(by_alias=True))
+        return self.patch(f"{APIRoutes.EXERCISES}/{query.exercise_id}", json=request_body)
 
-    @allure.step("Обновление упражнения с id: {query} и валидация ответа по схеме")
+    @step("Обновление упражнения с id: {query} и валидация ответа по схеме")
     def update_exercise(self, exercise_id: UpdateExerciseQuerySchema, request_body: UpdateExerciseRequestSchema) -> UpdateExerciseResponseSchema:
         response = self.update_exercise_api(exercise_id, request_body)
-        return UpdateExerciseResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(UpdateExerciseResponseSchema, response.content)
 
-    @allure.step("Удаления упражнения с id: {query}")
+    @step("Удаления упражнения с id: {query}")
     @tracker.track_coverage_httpx(APIRoutes.EXERCISES + '/{exercise_id}')
     def delete_exercise_api(self, query: DeleteExerciseQuerySchema) -> Response:
         """
@@ -99,7 +100,7 @@ class ExercisesAPIClient(BaseAPIClient):
         """
         return self.delete(f"{APIRoutes.EXERCISES}/{query.exercise_id}")
 
-@allure.step("Получение клиента для работы с API упражнений")
+@step("Получение клиента для работы с API упражнений")
 def get_private_exercises_client(user: AuthUserSchema) -> ExercisesAPIClient:
     """
     Функция получения клиента для работы с упражнениями
@@ -1,10 +1,11 @@
-import allure
 from httpx import Response
 
 from clients.api_coverage import tracker
 from clients.base_client import BaseAPIClient
 from clients.files.files_schema import CreateFileRequestSchema, CreateFileResponseSchema
 from clients.private_builder import AuthUserSchema, get_private_client
+from clients.schema_registry import schema_registry
+from tools.allure.steps import step
 from tools.routes import APIRoutes
 
 
@@ -12,7 +13,7 @@ class FilesAPIClient(BaseAPIClient):
     """
     Клиент для работы с файлами
     """
-    @allure.step("Получение файла")
+    @step("Получение файла")
     @tracker.track_coverage_httpx(APIRoutes.FILES + '/{file_id}')
     def get_file_api(self, file_id: str) -> Response:
         """
@@ -23,7 +24,7 @@ class FilesAPIClient(BaseAPIClient):
         """
         return self.get(f'{APIRoutes.FILES}/{file_id}')
 
-    @allure.step("Создание файла")
+    @step("Создание файла")
     @tracker.track_coverage_httpx(APIRoutes.FILES)
     def create_file_api(self, request_body: CreateFileRequestSchema) -> Response:
         """
@@ -38,12 +39,12 @@ class FilesAPIClient(BaseAPIClient):
             files={'upload_file': request_body.upload_file.read_bytes()}
         )
 
-    @allure.step("Создание файла и валидация ответа по схеме")
+    @step("Создание файла и валидация ответа по схеме")
     def create_file(self, request_body: CreateFileRequestSchema) -> CreateFileResponseSchema:
         response = self.create_file_api(request_body)
-        return CreateFileResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(CreateFileResponseSchema, response.content)
 
-    @allure.step("Удаление файла")
+    @step("Удаление файла")
     @tracker.track_coverage_httpx(APIRoutes.FILES + '/{file_id}')
     def delete_file_api(self, file_id: str) -> Response:
         """
@@ -54,7 +55,7 @@ class FilesAPIClient(BaseAPIClient):
         """
         return self.delete(f'{APIRoutes.FILES}/{file_id}')
 
-@allure.step("Получение клиента для работы с API файлов")
+@step("Получение клиента для работы с API файлов")
 def get_private_files_client(user: AuthUserSchema) -> FilesAPIClient:
     """
     Функция получения клиента для работы с методами файлов
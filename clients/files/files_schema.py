@@ -9,7 +9,7 @@ class CreateFileRequestSchema(BaseModel):
     """
     filename: str = Field(default='image.png')
     directory: str = Field(default='courses')
-    upload_file: FilePath = Field(default=settings.test_data.image_png_file)
+    upload_file: FilePath = Field(default_factory=lambda: settings.test_data.image_png_file)
 
 class FileSchema(BaseModel):
     """
@@ -5,8 +5,8 @@ from pydantic import BaseModel
 
 from clients.auth.auth_client import get_auth_client
 from clients.auth.auth_schema import LoginRequestSchema
-from clients.event_hooks import curl_event_hook, log_request_event_hook, log_response_event_hook
-from config import settings
+from clients.schema_registry import schema_registry
+from clients.transport import build_client
 
 
 class AuthUserSchema(BaseModel, frozen=True): # делаем модель неизменяемой
@@ -24,12 +24,6 @@ def get_private_client(user: AuthUserSchema) -> Client:
     :return: Готовый к использованию объект httpx.Client
     """
     auth_client = get_auth_client()
-    login_request = LoginRequestSchema(email=user.email, password=user.password)
+    login_request = schema_registry.build_request(LoginRequestSchema, email=user.email, password=user.password)
     login_response = auth_client.login(login_request)
-    return Client(
-        timeout=settings.http_client.timeout,
-        base_url=settings.http_client.url,
-        headers={"Authorization": f"Bearer {login_response.token.access_token}"},
-        event_hooks={"request": [curl_event_hook, log_request_event_hook],
-                     "response": [log_response_event_hook]}
-    )
\ No newline at end of file
+    return build_client(headers={"Authorization": f"Bearer {login_response.token.access_token}"})
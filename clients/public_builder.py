@@ -1,18 +1,16 @@
+from functools import lru_cache
+
 from httpx import Client
 
-from clients.event_hooks import curl_event_hook, log_request_event_hook, log_response_event_hook
-from config import settings
+from clients.transport import build_client
 
 
+@lru_cache(maxsize=None)
 def get_public_client() -> Client:
     """
-    Функция создает экземпляр httpx.Client с базовыми настройками
+    Функция создает экземпляр httpx.Client с базовыми настройками.
+    Клиент общий для всех публичных методов: соединения пула переиспользуются между тестами
 
     :return: Готовый к использованию объект httpx.Client
     """
-    return Client(
-        timeout=settings.http_client.timeout,
-        base_url=settings.http_client.url,
-        event_hooks={"request": [curl_event_hook, log_request_event_hook],
-                     "response": [log_response_event_hook]}
-    )
\ No newline at end of file
+    return build_client()
@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+from typing import Callable
+
+from httpx import Response
+
+
+@dataclass(frozen=True)
+class APICall:
+    """
+    Выполненный вызов метода клиента
+    """
+    func: Callable  # метод клиента без декораторов
+    args: tuple  # позиционные аргументы, включая self
+    kwargs: dict
+    endpoint: str  # шаблон маршрута, например /api/v1/courses/{course_id}
+    response: Response
+
+
+CallRecorder = Callable[[APICall], None]
+
+# Обработчики вызовов клиентов. Плагины регистрируют их в pytest_configure, только если включена их опция
+_recorders: list[CallRecorder] = []
+
+
+def register_recorder(recorder: CallRecorder):
+    if recorder not in _recorders:
+        _recorders.append(recorder)
+
+
+def unregister_recorder(recorder: CallRecorder):
+    if recorder in _recorders:
+        _recorders.remove(recorder)
+
+
+def notify_recorders(call: APICall):
+    """
+    Передает вызов зарегистрированным обработчикам. Вызывается из трекера покрытия после выполнения запроса.
+    """
+    for recorder in _recorders:
+        recorder(call)
@@ -0,0 +1,88 @@
+import importlib
+import inspect
+from typing import Any, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+from config import settings
+
+Schema = TypeVar("Schema", bound=BaseModel)
+
+# Модули со схемами запросов и ответов, которые компилируются в `precompile`
+SCHEMA_MODULES = (
+    "clients.auth.auth_schema",
+    "clients.courses.courses_schema",
+    "clients.exercises.exercises_schema",
+    "clients.files.files_schema",
+    "clients.users.users_schema",
+    "clients.error_schema",
+)
+
+
+class SchemaRegistry:
+    """
+    Реестр схем запросов и ответов.
+
+    Хранит скомпилированные TypeAdapter и JSON-схемы, чтобы они строились один раз за прогон,
+    а также предоставляет доверенный путь создания запросов без валидации.
+    """
+    def __init__(self):
+        self._adapters: dict[Any, TypeAdapter] = {}
+        self._json_schemas: dict[type[BaseModel], dict] = {}
+
+    def adapter(self, schema: Any) -> TypeAdapter:
+        """
+        Возвращает закешированный TypeAdapter для схемы или типа (например, list[CourseSchema]).
+        """
+        adapter = self._adapters.get(schema)
+        if adapter is None:
+            adapter = self._adapters[schema] = TypeAdapter(schema)
+        return adapter
+
+    def json_schema(self, schema: type[BaseModel]) -> dict:
+        """
+        Возвращает закешированную JSON-схему модели.
+        """
+        json_schema = self._json_schemas.get(schema)
+        if json_schema is None:
+            json_schema = self._json_schemas[schema] = schema.model_json_schema()
+        return json_schema
+
+    def validate_response(self, schema: type[Schema], data: str | bytes) -> Schema:
+        """
+        Валидирует JSON ответа сервера.
+        При `settings.schemas.strict_responses` используется строгий режим pydantic без приведения типов.
+
+        :param schema: Схема ответа.
+        :param data: Тело ответа.
+        :return: Объект схемы ответа.
+        """
+        return self.adapter(schema).validate_json(data, strict=settings.schemas.strict_responses)
+
+    def build_request(self, schema: type[Schema], **values: Any) -> Schema:
+        """
+        Создает запрос из данных, сгенерированных самим фреймворком.
+        При `settings.schemas.trusted_requests` валидация пропускается (`model_construct`),
+        незаданные поля заполняются значениями по умолчанию.
+
+        :param schema: Схема запроса.
+        :param values: Значения полей по имени или алиасу.
+        :return: Объект схемы запроса.
+        """
+        if settings.schemas.trusted_requests:
+            return schema.model_construct(**values)
+        return schema(**values)
+
+    def precompile(self):
+        """
+        Компилирует TypeAdapter и JSON-схемы всех схем из `SCHEMA_MODULES`.
+        """
+        for module_name in SCHEMA_MODULES:
+            module = importlib.import_module(module_name)
+            for _, schema in inspect.getmembers(module, inspect.isclass):
+                if issubclass(schema, BaseModel) and schema.__module__ == module_name:
+                    self.adapter(schema)
+                    self.json_schema(schema)
+
+
+schema_registry = SchemaRegistry()
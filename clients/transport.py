@@ -0,0 +1,162 @@
+import importlib.util
+import ssl
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from httpx import BaseTransport, Client, HTTPTransport, Limits, Request, Response, Timeout, create_ssl_context
+from httpx._decoders import SUPPORTED_DECODERS
+
+from clients.event_hooks import (
+    curl_event_hook,
+    log_request_event_hook,
+    log_response_event_hook,
+    metrics_request_event_hook,
+    metrics_response_event_hook,
+)
+from config import settings
+from tools.logger import get_logger
+
+if TYPE_CHECKING:
+    from tools.http.dns import CachingDNSBackend
+
+logger = get_logger("HTTP_TRANSPORT")
+
+
+def is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_timeout() -> Timeout:
+    """
+    Таймауты по фазам запроса. Незаданные фазы используют `settings.http_client.timeout`.
+    """
+    http_client = settings.http_client
+    return Timeout(
+        http_client.timeout,
+        connect=http_client.connect_timeout or http_client.timeout,
+        read=http_client.read_timeout or http_client.timeout,
+        write=http_client.write_timeout or http_client.timeout,
+        pool=http_client.pool_timeout or http_client.timeout
+    )
+
+
+def get_accept_encoding() -> str:
+    """
+    Значение Accept-Encoding из `settings.compression.response_encodings`.
+    Кодировки без установленного декодера (br без brotli, zstd без zstandard) не запрашиваются.
+    """
+    encodings = [
+        encoding for encoding in settings.compression.response_encodings
+        if encoding in SUPPORTED_DECODERS
+    ]
+    return ", ".join(encodings) or "identity"
+
+
+def get_limits() -> Limits:
+    http_client = settings.http_client
+    return Limits(
+        max_connections=http_client.max_connections,
+        max_keepalive_connections=http_client.max_keepalive_connections,
+        keepalive_expiry=http_client.keepalive_expiry
+    )
+
+
+@lru_cache(maxsize=None)
+def get_ssl_context() -> ssl.SSLContext:
+    """
+    Общий SSL контекст: сертификаты загружаются один раз, а не при создании каждого клиента.
+    """
+    return create_ssl_context()
+
+
+@lru_cache(maxsize=None)
+def get_dns_backend(ttl: float) -> "CachingDNSBackend":
+    """
+    Общий для всех клиентов кеш DNS. Модуль бэкенда импортирует httpcore, поэтому загружается
+    только при включенном кеше, а не при импорте клиентов.
+    """
+    from tools.http.dns import CachingDNSBackend
+
+    return CachingDNSBackend(ttl)
+
+
+def build_transport() -> BaseTransport:
+    """
+    Создает транспорт клиента. Если задан `settings.differential.candidate_url`,
+    запросы дублируются в окружение-кандидат, см. DifferentialTransport.
+    """
+    transport = build_http_transport()
+    candidate_url = settings.differential.candidate_url
+    if candidate_url is None:
+        return transport
+
+    # Сравнение ответов тянет за собой проверки и снимки, поэтому модуль загружается только при заданном кандидате
+    from tools.http.differential import DifferentialTransport
+
+    return DifferentialTransport(transport, build_http_transport(), str(candidate_url))
+
+
+def build_http_transport() -> HTTPTransport:
+    """
+    Создает транспорт с настройками пула соединений, HTTP/2 и DNS из `settings.http_client`.
+    Если HTTP/2 включен, но пакет h2 не установлен, используется HTTP/1.1.
+    """
+    http_client = settings.http_client
+
+    http2 = http_client.http2
+    if http2 and not is_http2_available():
+        logger.warning("HTTP/2 включен, но пакет h2 не установлен. Используется HTTP/1.1")
+        http2 = False
+
+    transport = HTTPTransport(
+        verify=get_ssl_context() if http_client.share_ssl_context else True,
+        http2=http2,
+        limits=get_limits()
+    )
+    if http_client.dns_cache_ttl:
+        from tools.http.dns import install_network_backend
+
+        install_network_backend(transport, get_dns_backend(http_client.dns_cache_ttl))
+    return transport
+
+
+class SharedTransport(BaseTransport):
+    """
+    Транспорт, общий для нескольких клиентов. Закрытие одного клиента не закрывает пул соединений остальных:
+    пул закрывается вместе с процессом.
+    """
+    def __init__(self, transport: BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: Request) -> Response:
+        return self.transport.handle_request(request)
+
+    def close(self):
+        pass
+
+
+@lru_cache(maxsize=None)
+def get_shared_transport() -> SharedTransport:
+    """
+    Транспорт клиентов тестов: публичный и приватные клиенты всех пользователей используют один пул соединений,
+    поэтому соединения, открытые прогревом, достаются и клиентам пользователей, созданных в тестах.
+    """
+    return SharedTransport(build_transport())
+
+
+def build_client(headers: dict[str, str] | None = None, transport: BaseTransport | None = None) -> Client:
+    """
+    Создает экземпляр httpx.Client с общими настройками транспорта и хуками логирования
+
+    :param headers: Заголовки, отправляемые с каждым запросом.
+    :param transport: Транспорт клиента. По умолчанию - общий транспорт `get_shared_transport`.
+    :return: Готовый к использованию объект httpx.Client
+    """
+    return Client(
+        timeout=get_timeout(),
+        base_url=settings.http_client.url,
+        headers={"Accept-Encoding": get_accept_encoding(), **(headers or {})},
+        transport=transport or get_shared_transport(),
+        event_hooks={"request": [curl_event_hook, log_request_event_hook, metrics_request_event_hook],
+                     "response": [log_response_event_hook, metrics_response_event_hook]}
+    )
@@ -1,10 +1,11 @@
-import allure
 from httpx import Response
 
 from clients.api_coverage import tracker
 from clients.base_client import BaseAPIClient
 from clients.private_builder import AuthUserSchema, get_private_client
+from clients.schema_registry import schema_registry
 from clients.users.users_schema import GetUserResponseSchema, UpdateUserRequestSchema
+from tools.allure.steps import step
 from tools.routes import APIRoutes
 
 
@@ -12,7 +13,7 @@ class PrivateUserAPIClient(BaseAPIClient):
     """
     Клиент для работы с методами авторизованного пользователя
     """
-    @allure.step("Получение текущего пользователя")
+    @step("Получение текущего пользователя")
     @tracker.track_coverage_httpx(f'{APIRoutes.USERS}/me')
     def get_user_me_api(self) -> Response:
         """
@@ -22,7 +23,7 @@ class PrivateUserAPIClient(BaseAPIClient):
         """
         return self.get(f'{APIRoutes.USERS}/me')
 
-    @allure.step("Получение пользователя по id: {user_id}")
+    @step("Получение пользователя по id: {user_id}")
     @tracker.track_coverage_httpx(APIRoutes.USERS + '/{user_id}')
     def get_user_by_id_api(self, user_id: str) -> Response:
         """
@@ -33,7 +34,7 @@ class PrivateUserAPIClient(BaseAPIClient):
         """
         return self.get(f'{APIRoutes.USERS}/{user_id}')
 
-    @allure.step("Получение пользователя по id: {user_id} и валидация ответа по схеме")
+    @step("Получение пользователя по id: {user_id} и валидация ответа по схеме")
     def get_user_by_id(self, user_id: str) -> GetUserResponseSchema:
         """
         Функция для получения сущности пользователя
@@ -42,9 +43,9 @@ class PrivateUserAPIClient(BaseAPIClient):
         :return: ответ сервера
         """
         response = self.get_user_by_id_api(user_id)
-        return GetUserResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(GetUserResponseSchema, response.content)
 
-    @allure.step("Обновление пользователя с id: {user_id}")
+    @step("Обновление пользователя с id: {user_id}")
     @tracker.track_coverage_httpx(APIRoutes.USERS + '/{user_id}')
     def update_user_api(self, user_id: str, request_body: UpdateUserRequestSchema) -> Response:
         """
@@ -54,9 +55,9 @@ class PrivateUserAPIClient(BaseAPIClient):
         :param request_body: параметры запроса
         :return: ответ сервера
         """
-        return self.patch(f'{APIRoutes.USERS}/{user_id}', json=request_body.model_dump(by_alias=True))
+        return self.patch(f'{APIRoutes.USERS}/{user_id}', json=request_body)
 
-    @allure.step("Удаление пользователя с id: {user_id}")
+    @step("Удаление пользователя с id: {user_id}")
     @tracker.track_coverage_httpx(APIRoutes.USERS + '/{user_id}')
     def delete_user_api(self, user_id: str) -> Response:
         """
@@ -67,7 +68,7 @@ class PrivateUserAPIClient(BaseAPIClient):
         """
         return self.delete(f'{APIRoutes.USERS}/{user_id}')
 
-@allure.step("Получение клиента для работы с приватным API")
+@step("Получение клиента для работы с приватным API")
 def get_private_user_client(user: AuthUserSchema) -> PrivateUserAPIClient:
     """
     Функция получения клиента для работы с приватными методами
@@ -1,10 +1,11 @@
-import allure
 from httpx import Response
 
 from clients.api_coverage import tracker
 from clients.base_client import BaseAPIClient
 from clients.public_builder import get_public_client
+from clients.schema_registry import schema_registry
 from clients.users.users_schema import CreateUserRequestSchema, CreateUserResponseSchema
+from tools.allure.steps import step
 from tools.routes import APIRoutes
 
 
@@ -12,7 +13,7 @@ class PublicUserAPIClient(BaseAPIClient):
     """
     Клиент для работы с публичными методами пользователя
     """
-    @allure.step("Создание пользователя")
+    @step("Создание пользователя")
     @tracker.track_coverage_httpx(APIRoutes.USERS)
     def create_user_api(self, request_body: CreateUserRequestSchema) -> Response:
         """
@@ -21,14 +22,14 @@ class PublicUserAPIClient(BaseAPIClient):
         :param request_body: словарь с данными пользователя
         :return: ответ сервера
         """
-        return self.post(APIRoutes.USERS, json=request_body.model_dump(by_alias=True))
+        return self.post(APIRoutes.USERS, json=request_body)
 
-    @allure.step("Создание пользователя и валидация ответа по схеме")
+    @step("Создание пользователя и валидация ответа по схеме")
     def create_user(self, request_body: CreateUserRequestSchema) -> CreateUserResponseSchema:
         response = self.create_user_api(request_body)
-        return CreateUserResponseSchema.model_validate_json(response.text)
+        return schema_registry.validate_response(CreateUserResponseSchema, response.content)
 
-@allure.step("Получение клиента для работы с публичным API")
+@step("Получение клиента для работы с публичным API")
 def get_public_user_client() -> PublicUserAPIClient:
     """
     Функция получения клиента для работы с публичными методами
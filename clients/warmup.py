@@ -0,0 +1,157 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from httpx import Response
+from pydantic import BaseModel
+
+from clients.auth.auth_client import get_auth_client
+from clients.auth.auth_schema import LoginRequestSchema, LoginResponseSchema
+from clients.courses.courses_client import get_private_courses_client
+from clients.courses.courses_schema import (
+    CreateCourseRequestSchema,
+    GetCourseByIdResponseSchema,
+    GetCourseByUserResponseSchema,
+    GetCoursesQuerySchema,
+)
+from clients.exercises.exercises_client import get_private_exercises_client
+from clients.exercises.exercises_schema import (
+    CreateExerciseRequestSchema,
+    GetExerciseQuerySchema,
+    GetExerciseResponseSchema,
+    GetExercisesQuerySchema,
+    GetExercisesResponseSchema,
+)
+from clients.files.files_client import get_private_files_client
+from clients.files.files_schema import CreateFileRequestSchema, GetFileResponseSchema
+from clients.private_builder import AuthUserSchema, get_private_client
+from clients.schema_registry import schema_registry
+from clients.users.private_user_client import get_private_user_client
+from clients.users.public_user_client import get_public_user_client
+from clients.users.users_schema import CreateUserRequestSchema, GetUserResponseSchema
+from config import ReportingLevel, settings
+from tools.data_generator import fake
+from tools.logger import get_logger
+from tools.warmup import warming_up
+
+logger = get_logger("WARMUP")
+
+# Холостой запрос: вызов метода клиента и схема ответа, по которой он валидируется
+WarmupCall = tuple[Callable[[], Response], type[BaseModel]]
+
+
+def warm_up_schemas():
+    """
+    Компилирует валидаторы и JSON-схемы всех схем и инициализирует Faker: первое создание Faker
+    загружает провайдеры, а первая генерация каждого запроса строит значения по умолчанию.
+    """
+    schema_registry.precompile()
+    with fake.seeded(0):
+        for schema in (CreateUserRequestSchema, CreateFileRequestSchema):
+            schema_registry.build_request(schema)
+
+
+def authenticate(user: AuthUserSchema) -> AuthUserSchema:
+    """
+    Авторизует пользователя заранее: `get_private_client` кеширует клиент с токеном,
+    и тесты с теми же учетными данными не выполняют логин повторно.
+    """
+    get_private_client(user)
+    return user
+
+
+def create_warmup_user() -> AuthUserSchema:
+    request = schema_registry.build_request(CreateUserRequestSchema)
+    get_public_user_client().create_user(request)
+    return AuthUserSchema(email=request.email, password=request.password)
+
+
+def open_connections(user: AuthUserSchema, connections: int):
+    """
+    Открывает соединения общего пула клиентов одновременными запросами логина.
+    """
+    login_request = schema_registry.build_request(LoginRequestSchema, email=user.email, password=user.password)
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="warmup") as executor:
+        responses = list(executor.map(lambda _: get_auth_client().login_api(login_request), range(connections)))
+    for response in responses:
+        schema_registry.validate_response(LoginResponseSchema, response.content)
+
+
+def route_calls(user: AuthUserSchema) -> list[WarmupCall]:
+    """
+    Создает файл, курс и упражнение и возвращает холостые запросы на чтение по всем маршрутам.
+    """
+    users_client = get_private_user_client(user)
+    files_client = get_private_files_client(user)
+    courses_client = get_private_courses_client(user)
+    exercises_client = get_private_exercises_client(user)
+
+    me = users_client.get_user_me_api()
+    user_id = schema_registry.validate_response(GetUserResponseSchema, me.content).user.id
+    file = files_client.create_file(CreateFileRequestSchema()).file
+    course = courses_client.create_course(
+        schema_registry.build_request(CreateCourseRequestSchema, previewFileId=file.id, createdByUserId=user_id)
+    ).course
+    exercise = exercises_client.create_exercise(
+        schema_registry.build_request(CreateExerciseRequestSchema, courseId=course.id)
+    ).exercise
+
+    return [
+        (users_client.get_user_me_api, GetUserResponseSchema),
+        (lambda: files_client.get_file_api(file.id), GetFileResponseSchema),
+        (lambda: courses_client.get_courses_api(GetCoursesQuerySchema(userId=user_id)), GetCourseByUserResponseSchema),
+        (lambda: courses_client.get_course_api(course.id), GetCourseByIdResponseSchema),
+        (lambda: exercises_client.get_exercises_api(GetExercisesQuerySchema(courseId=course.id)), GetExercisesResponseSchema),
+        (lambda: exercises_client.get_exercise_api(GetExerciseQuerySchema(exercise_id=exercise.id)), GetExerciseResponseSchema),
+    ]
+
+
+def run_calls(calls: list[WarmupCall], calls_per_route: int, connections: int):
+    """
+    Выполняет холостые запросы, не более `connections` одновременно. Ответы валидируются по схемам.
+    """
+    def call(warmup_call: WarmupCall):
+        method, schema = warmup_call
+        schema_registry.validate_response(schema, method().content)
+
+    with ThreadPoolExecutor(max_workers=connections, thread_name_prefix="warmup") as executor:
+        list(executor.map(call, calls * calls_per_route))
+
+
+def warm_up():
+    """
+    Прогревает процесс перед тестами, чтобы замеры первых тестов не включали холодный старт:
+
+    - компилирует схемы и инициализирует Faker;
+    - открывает `settings.warmup.connections` соединений в общем пуле клиентов, см. `get_shared_transport`;
+    - авторизует известных пользователей из `settings.warmup.users`;
+    - выполняет `settings.warmup.calls_per_route` холостых запросов на каждый маршрут чтения.
+
+    Запросы прогрева не попадают в покрытие, метрики и длительности, см. `tools.warmup.warming_up`.
+    Шаги Allure на время прогрева отключаются: вне теста их не к чему прикрепить.
+    """
+    warmup = settings.warmup
+    reporting_level = settings.reporting.level
+    settings.reporting.level = ReportingLevel.OFF
+    stages: dict[str, float] = {}
+
+    def stage(name: str, func: Callable, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        stages[name] = time.perf_counter() - start
+        return result
+
+    try:
+        with warming_up():
+            stage("schemas", warm_up_schemas)
+            user = stage("user", create_warmup_user)
+            stage("connections", open_connections, user, warmup.connections)
+            known_users = [AuthUserSchema(email=known.email, password=known.password) for known in warmup.users]
+            with ThreadPoolExecutor(max_workers=warmup.connections, thread_name_prefix="warmup") as executor:
+                stage("authentication", lambda: list(executor.map(authenticate, [user, *known_users])))
+            calls = stage("entities", route_calls, user)
+            stage("routes", run_calls, calls, warmup.calls_per_route, warmup.connections)
+    finally:
+        settings.reporting.level = reporting_level
+
+    logger.info("Прогрев: " + ", ".join(f"{name} {duration * 1000:.0f} мс" for name, duration in stages.items()))
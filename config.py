@@ -1,3 +1,5 @@
+import os
+from enum import Enum
 from typing import Self
 
 from pydantic import BaseModel, FilePath, HttpUrl, DirectoryPath
@@ -6,7 +8,17 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class HTTPClientSettings(BaseModel):
     base_url: HttpUrl
-    timeout: int = 10
+    timeout: int = 10 # таймаут по умолчанию для всех фаз запроса
+    connect_timeout: float | None = None # None - используется timeout
+    read_timeout: float | None = None
+    write_timeout: float | None = None
+    pool_timeout: float | None = None # ожидание свободного соединения в пуле
+    http2: bool = False # требует пакет h2 (pip install httpx[http2])
+    max_connections: int | None = 100
+    max_keepalive_connections: int | None = 20
+    keepalive_expiry: float | None = 5.0 # секунд простоя до закрытия соединения
+    share_ssl_context: bool = True # один SSL контекст на все клиенты
+    dns_cache_ttl: float | None = None # секунд, None - DNS не кешируется
 
     @property
     def url(self) -> str:
@@ -15,6 +27,52 @@ class HTTPClientSettings(BaseModel):
 class TestDataSettings(BaseModel):
     image_png_file: FilePath
 
+class ReportingLevel(str, Enum):
+    FULL = "full" # каждый вызов клиента и каждая проверка - отдельный шаг
+    COMPACT = "compact" # один шаг на верхнеуровневый вызов со сводкой вложенных проверок
+    OFF = "off" # шаги не создаются, заголовки не форматируются
+
+class ReportingSettings(BaseModel):
+    level: ReportingLevel = ReportingLevel.FULL
+
+class OversizePolicy(str, Enum):
+    TRUNCATE = "truncate" # обрезать вложение до max_size
+    COMPRESS = "compress" # сохранить вложение целиком в gzip (application/gzip: в отчете - скачивание, а не просмотр)
+
+class AttachmentsSettings(BaseModel):
+    deduplicate: bool = True
+    max_size: int = 1024 * 1024 # байт
+    oversize_policy: OversizePolicy = OversizePolicy.TRUNCATE
+    batch_size: int = 64
+
+class SchemaSettings(BaseModel):
+    trusted_requests: bool = False # создавать запросы фреймворка без валидации (model_construct)
+    strict_responses: bool = False # валидировать ответы сервера в строгом режиме
+
+class CompressionSettings(BaseModel):
+    # Кодировки ответа в порядке предпочтения. Запрашиваются только те, для которых установлен декодер httpx:
+    # br - пакет brotli, zstd - пакет zstandard
+    response_encodings: list[str] = ["zstd", "br", "gzip", "deflate"]
+    request_compression: bool = False # сжимать JSON тела запросов gzip
+    request_min_size: int = 1024 # байт, меньшие тела отправляются без сжатия
+    request_level: int = 6 # уровень сжатия gzip
+
+class DifferentialSettings(BaseModel):
+    # Второе окружение (кандидат): каждый запрос дублируется туда, ответы и задержки сравниваются
+    candidate_url: HttpUrl | None = None
+    max_examples: int = 5 # примеров расхождений на маршрут в отчете
+
+class WarmupUserSettings(BaseModel):
+    email: str
+    password: str
+
+class WarmupSettings(BaseModel):
+    # Прогрев перед тестами на каждом воркере: соединения, авторизация, схемы, Faker, холостые запросы
+    enabled: bool = False
+    connections: int = 4 # соединений, открываемых в пуле каждого клиента
+    calls_per_route: int = 2 # холостых запросов на маршрут
+    users: list[WarmupUserSettings] = [] # известные пользователи, которые авторизуются заранее
+
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(
         extra="allow", # позволяет создавать другие env переменные
@@ -26,12 +84,38 @@ class Settings(BaseSettings):
     test_data: TestDataSettings
     http_client: HTTPClientSettings
     allure_results_dir: DirectoryPath
+    reporting: ReportingSettings = ReportingSettings()
+    attachments: AttachmentsSettings = AttachmentsSettings()
+    schemas: SchemaSettings = SchemaSettings()
+    compression: CompressionSettings = CompressionSettings()
+    differential: DifferentialSettings = DifferentialSettings()
+    warmup: WarmupSettings = WarmupSettings()
 
     @classmethod
     def initialize(cls) -> Self:
         allure_results_dir = DirectoryPath("./allure-results")
         allure_results_dir.mkdir(exist_ok=True)
-        return Settings(allure_results_dir=allure_results_dir)
+        # Профиль окружения можно выбрать переменной ENV_FILE, например ENV_FILE=.env.staging
+        return Settings(
+            allure_results_dir=allure_results_dir,
+            _env_file=os.environ.get("ENV_FILE", ".env")
+        )
+
+class LazySettings:
+    """
+    Ленивая обертка над Settings.
+    Чтение .env, проверка путей и создание ./allure-results выполняются при первом
+    обращении к настройкам, а не при импорте модуля.
+    """
+    def __init__(self):
+        self._settings: Settings | None = None
+
+    def get(self) -> Settings:
+        if self._settings is None:
+            self._settings = Settings.initialize()
+        return self._settings
 
-settings = Settings.initialize()
+    def __getattr__(self, name: str):
+        return getattr(self.get(), name)
 
+settings: Settings = LazySettings() # type: ignore[assignment]
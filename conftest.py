@@ -4,5 +4,19 @@ pytest_plugins = [
     'fixtures.files',
     'fixtures.courses',
     'fixtures.exercises',
-    'fixtures.allure'
+    'fixtures.allure',
+    'fixtures.route_impact',
+    'fixtures.durations',
+    'fixtures.codec_metrics',
+    'fixtures.load_scenarios',
+    'fixtures.soak',
+    'fixtures.tracing',
+    'fixtures.request_timings',
+    'fixtures.metrics',
+    'fixtures.flaky',
+    'fixtures.data_generator',
+    'fixtures.snapshots',
+    'fixtures.differential',
+    'fixtures.perf_history',
+    'fixtures.warmup'
 ]
\ No newline at end of file
@@ -1,11 +1,42 @@
+import allure_commons
 import pytest
+from allure_commons.logger import AllureFileLogger
 
+from config import settings
+from tools.allure.attachments import AttachmentSink
 from tools.allure.environment import create_allure_environment_file
 
 
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config: pytest.Config):
+    """
+    Заменяет стандартный файловый логгер allure на AttachmentSink,
+    который хранит одинаковые вложения один раз и пишет файлы в фоновом потоке.
+    """
+    report_dir = config.option.allure_report_dir
+    if not settings.attachments.deduplicate or not report_dir:
+        return
+
+    for plugin in allure_commons.plugin_manager.get_plugins():
+        if type(plugin) is AllureFileLogger: # логгер регистрируется allure-pytest только при --alluredir
+            name = allure_commons.plugin_manager.get_name(plugin)
+            sink = AttachmentSink(report_dir)
+            allure_commons.plugin_manager.unregister(plugin)
+            allure_commons.plugin_manager.register(sink, name)
+
+            def restore(original=plugin, sink=sink, name=name):
+                sink.close()
+                # allure-pytest при завершении снимает с регистрации свой логгер, поэтому возвращаем его обратно
+                allure_commons.plugin_manager.unregister(sink)
+                allure_commons.plugin_manager.register(original, name)
+
+            config.add_cleanup(restore)
+            break
+
+
 @pytest.fixture(scope='session', autouse=True)
 def save_allure_environment_file():
     # До начала автотестов ничего не делаем
     yield  # Запукаются автотесты...
     # После завершения автотестов создаем файл environment.properties
-    create_allure_environment_file()
\ No newline at end of file
+    create_allure_environment_file()
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import pytest
+
+from clients.recorders import APICall, register_recorder, unregister_recorder
+from tools.http.codec_metrics import CodecMetrics, codec_metrics
+from tools.xdist import collect_from_workers, send_to_controller
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.getgroup("codec-metrics", "Сжатие запросов и ответов").addoption(
+        "--codec-metrics",
+        default=None,
+        help="Файл, в который записываются счетчики байтов по маршрутам: по сети и после распаковки"
+    )
+
+
+def _record(call: APICall):
+    codec_metrics.record(call.endpoint, call.response)
+
+
+def pytest_configure(config: pytest.Config):
+    if config.getoption("codec_metrics"):
+        register_recorder(_record)
+
+
+def pytest_unconfigure(config: pytest.Config):
+    unregister_recorder(_record)
+
+
+# Счетчики xdist воркеров
+pytest_testnodedown = collect_from_workers("codec_metrics", CodecMetrics.model_validate_json, codec_metrics.merge)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    config = session.config
+    if not config.getoption("codec_metrics"):
+        return
+
+    if send_to_controller(config, "codec_metrics", codec_metrics):
+        return
+
+    codec_metrics.save(Path(config.getoption("codec_metrics")))
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config):
+    if config.getoption("codec_metrics") and codec_metrics.routes:
+        terminalreporter.section("Сжатие запросов и ответов")
+        for line in codec_metrics.summary():
+            terminalreporter.write_line(line)
@@ -1,10 +1,17 @@
+from typing import Callable
+
 import pytest
 from pydantic import BaseModel
 
 from clients.courses.courses_client import CoursesAPIClient, get_private_courses_client
 from clients.courses.courses_schema import CreateCourseRequestSchema, CreateCourseResponseSchema
+from clients.files.files_client import FilesAPIClient
+from clients.files.files_schema import CreateFileRequestSchema, CreateFileResponseSchema
+from clients.schema_registry import schema_registry
+from config import settings
 from fixtures.files import FileFixture
 from fixtures.users import UserFixture
+from tools.setup_graph import SetupGraph
 
 
 class CoursesFixture(BaseModel):
@@ -35,9 +42,48 @@ def function_create_course(
     :param function_create_file: Фикстура для создания файла
     :return: Объект фикстуры CoursesFixture, содержащий данные запроса и ответа
     """
-    request = CreateCourseRequestSchema(
+    request = schema_registry.build_request(
+        CreateCourseRequestSchema,
         preview_file_id=function_create_file.response.file.id,
         created_by_user_id=function_create_user.response.user.id
     )
     response = courses_client.create_course(request)
-    return CoursesFixture(request=request, response=response)
\ No newline at end of file
+    return CoursesFixture(request=request, response=response)
+
+@pytest.fixture
+def create_courses(
+        courses_client: CoursesAPIClient,
+        files_client: FilesAPIClient,
+        function_create_user: UserFixture) -> Callable[[int], list[CoursesFixture]]:
+    """
+    Фикстура-фабрика для создания нескольких курсов одного пользователя
+    Цепочки "загрузка файла -> создание курса" выполняются параллельно, поэтому подготовка
+    занимает время одной цепочки, а не сумму всех запросов
+
+    :param courses_client: Клиент для взаимодействия с API курсов
+    :param files_client: Клиент для взаимодействия с API файлов
+    :param function_create_user: Фикстура для создания пользователя
+    :return: Функция, которая создает указанное количество курсов
+    """
+    def create_course(file: CreateFileResponseSchema) -> CoursesFixture:
+        request = schema_registry.build_request(
+            CreateCourseRequestSchema,
+            preview_file_id=file.file.id,
+            created_by_user_id=function_create_user.response.user.id
+        )
+        return CoursesFixture(request=request, response=courses_client.create_course(request))
+
+    def create(count: int) -> list[CoursesFixture]:
+        graph = SetupGraph()
+        for index in range(count):
+            file_request = schema_registry.build_request(
+                CreateFileRequestSchema,
+                upload_file=settings.test_data.image_png_file
+            )
+            graph.add(f"file_{index}", lambda request=file_request: files_client.create_file(request))
+            graph.add(f"course_{index}", create_course, after=[f"file_{index}"])
+
+        results = graph.run()
+        return [results[f"course_{index}"] for index in range(count)]
+
+    return create
@@ -0,0 +1,79 @@
+import os
+
+import allure
+import pytest
+
+from tools.data_generator import RUN_ID_ENV, RUN_SEED_ENV, derive_seed, fake, get_run_id, get_run_seed
+from tools.xdist import is_worker
+
+data_seed_key = pytest.StashKey[int]()
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("data-generator", "Генерация тестовых данных")
+    group.addoption(
+        "--run-id",
+        default=None,
+        help="Идентификатор прогона для уникальных значений. С тем же идентификатором "
+             "генерируются те же email и UUID. По умолчанию - случайный"
+    )
+    group.addoption(
+        "--data-seed",
+        type=int,
+        default=None,
+        help="Сид прогона. Данные Fake каждого теста генерируются из сида, выведенного из node id теста "
+             "и сида прогона, поэтому с тем же сидом тест получает те же данные. По умолчанию - случайный"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    """
+    Фиксирует идентификатор и сид прогона в окружении до запуска xdist воркеров: воркеры наследуют
+    окружение контроллера и делят пространство уникальных значений без координации.
+    """
+    if is_worker(config):
+        return
+
+    if run_id := config.getoption("run_id"):
+        if not run_id.isascii() or not run_id.isalnum():
+            raise pytest.UsageError("--run-id может содержать только латинские буквы и цифры")
+        os.environ[RUN_ID_ENV] = run_id
+    get_run_id()
+
+    if (seed := config.getoption("data_seed")) is not None:
+        os.environ[RUN_SEED_ENV] = str(seed)
+    get_run_seed()
+
+
+def pytest_report_header(config: pytest.Config) -> str:
+    return f"run id: {get_run_id()}, data seed: {get_run_seed()}"
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    """
+    Генерирует данные теста, включая его фикстуры, из сида теста.
+    """
+    seed = item.stash[data_seed_key] = derive_seed(item.nodeid, get_run_seed())
+    with fake.seeded(seed):
+        return (yield)
+
+
+def pytest_runtest_call(item: pytest.Item):
+    """
+    Записывает в отчет Allure сид теста и команду для повтора теста с теми же данными.
+
+    Уникальные значения (email, UUID) при повторе отличаются только префиксом прогона: с новым run id
+    тест не упирается в записи, созданные исходным прогоном. С --run-id исходного прогона
+    значения совпадают полностью, но на том же стенде такие записи уже существуют.
+    """
+    if (seed := item.stash.get(data_seed_key, None)) is None:
+        return
+    allure.dynamic.parameter("data_seed", seed, excluded=True)
+    allure.dynamic.parameter("run_id", get_run_id(), excluded=True)
+    allure.dynamic.parameter(
+        "replay",
+        f'pytest "{item.nodeid}" --data-seed {get_run_seed()} '
+        f'(email и UUID совпадут с точностью до префикса прогона; для полного совпадения: --run-id {get_run_id()})',
+        excluded=True
+    )
@@ -0,0 +1,64 @@
+from pathlib import Path
+
+import pytest
+from pydantic import HttpUrl
+
+from config import settings
+from tools.http.differential import DifferentialReport, differential_report
+from tools.xdist import collect_from_workers, send_to_controller
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("differential", "Сравнение двух окружений")
+    group.addoption(
+        "--candidate-url",
+        default=None,
+        help="Адрес второго окружения: каждый запрос тестов дублируется туда, ответы и задержки сравниваются"
+    )
+    group.addoption(
+        "--differential-report",
+        default="differential-report.json",
+        help="Файл отчета о совместимости и задержках окружения-кандидата"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    # Опция имеет приоритет над DIFFERENTIAL.CANDIDATE_URL из .env
+    if candidate_url := config.getoption("candidate_url"):
+        settings.differential.candidate_url = HttpUrl(candidate_url)
+    if settings.differential.candidate_url is None:
+        return
+
+    differential_report.primary_url = str(settings.http_client.url)
+    differential_report.candidate_url = str(settings.differential.candidate_url)
+    differential_report.max_examples = settings.differential.max_examples
+
+
+# Сравнения xdist воркеров
+pytest_testnodedown = collect_from_workers("differential", DifferentialReport.model_validate_json, differential_report.merge)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    if settings.differential.candidate_url is None:
+        return
+
+    if send_to_controller(session.config, "differential", differential_report):
+        return
+
+    differential_report.save(Path(session.config.getoption("differential_report")))
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config):
+    if settings.differential.candidate_url is None or not differential_report.routes:
+        return
+
+    terminalreporter.section("Сравнение окружений")
+    terminalreporter.write_line(f"{differential_report.primary_url} -> {differential_report.candidate_url}")
+    for row in differential_report.summary():
+        delta = "н/д" if row["p50_delta_percent"] is None else f"{row['p50_delta_percent']:+.1f}%"
+        terminalreporter.write_line(
+            f"{row['route']:<45} совместимо {row['compatible']}/{row['requests']:<5} "
+            f"p50 {row['primary_p50_ms']:.1f} -> {row['candidate_p50_ms']:.1f} мс ({delta})"
+        )
+        for example in row["examples"]:
+            terminalreporter.write_line(f"    {example}")
@@ -0,0 +1,115 @@
+import time
+
+import pytest
+
+from tools.durations import DurationHistory
+from tools.xdist import is_worker
+
+fixture_durations_key = pytest.StashKey[dict[str, tuple[str, float]]]()
+
+# Длительности фикстур, выполненных во время setup текущего теста
+_current_fixtures: dict[str, float] = {}
+# История длительностей и суммарное время незавершенных тестов (только при --record-durations)
+_history: DurationHistory | None = None
+_in_progress: dict[str, float] = {}
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("durations-history", "История длительностей и планирование xdist")
+    group.addoption(
+        "--durations-db",
+        default=".test-durations.sqlite",
+        help="Файл SQLite с историей длительностей тестов и фикстур"
+    )
+    group.addoption(
+        "--record-durations",
+        action="store_true",
+        help="Записать длительности тестов и фикстур текущего прогона в историю"
+    )
+    group.addoption(
+        "--schedule-by-duration",
+        action="store_true",
+        help="Распределять тесты по xdist воркерам по истории длительностей"
+    )
+    group.addoption(
+        "--shared-fixture-threshold",
+        type=float,
+        default=1.0,
+        help="Длительность (с) общей фикстуры, начиная с которой ее тесты выполняются на одном воркере"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    global _history
+    # Историю пишет только контроллер (или обычный прогон без xdist)
+    if config.getoption("record_durations") and not is_worker(config):
+        _history = DurationHistory(config.getoption("durations_db"))
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_xdist_make_scheduler(config: pytest.Config, log):
+    if not config.getoption("schedule_by_duration"):
+        return None
+
+    from tools.scheduling import DurationScheduling
+
+    history = DurationHistory(config.getoption("durations_db"))
+    try:
+        return DurationScheduling(
+            config,
+            log,
+            history=history,
+            threshold=config.getoption("shared_fixture_threshold")
+        )
+    finally:
+        history.close()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_fixture_setup(fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest):
+    start = time.perf_counter()
+    try:
+        return (yield)
+    finally:
+        _current_fixtures[fixturedef.argname] = time.perf_counter() - start
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_setup(item: pytest.Item):
+    _current_fixtures.clear()
+    try:
+        return (yield)
+    finally:
+        fixtures = {}
+        for name, definitions in item._fixtureinfo.name2fixturedefs.items():
+            fixtures[name] = (definitions[-1].scope, _current_fixtures.get(name, 0.0))
+        item.stash[fixture_durations_key] = fixtures
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    report = yield
+    if report.when == "teardown":
+        # Атрибут отчета сериализуется xdist и доходит до контроллера
+        report.fixture_durations = item.stash.get(fixture_durations_key, {})
+    return report
+
+
+def pytest_runtest_logreport(report: pytest.TestReport):
+    if _history is None:
+        return
+
+    _in_progress[report.nodeid] = _in_progress.get(report.nodeid, 0.0) + report.duration
+    if report.when == "teardown":
+        _history.record(
+            report.nodeid,
+            _in_progress.pop(report.nodeid),
+            getattr(report, "fixture_durations", {})
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    global _history
+    if _history is not None:
+        _history.close()
+        _history = None
@@ -3,6 +3,7 @@ from pydantic import BaseModel
 
 from clients.exercises.exercises_client import ExercisesAPIClient, get_private_exercises_client
 from clients.exercises.exercises_schema import CreateExerciseRequestSchema, CreateExerciseResponseSchema
+from clients.schema_registry import schema_registry
 from fixtures.courses import CoursesFixture
 from fixtures.users import UserFixture
 
@@ -32,6 +33,6 @@ def function_create_exercise(exercises_client: ExercisesAPIClient,
     :param function_create_course: Фикстура для создания курса
     :return: Объект фикстуры ExercisesFixture, содержащий данные запроса и ответа
     """
-    request = CreateExerciseRequestSchema(course_id=function_create_course.response.course.id)
+    request = schema_registry.build_request(CreateExerciseRequestSchema, course_id=function_create_course.response.course.id)
     response = exercises_client.create_exercise(request)
     return ExercisesFixture(request=request, response=response)
\ No newline at end of file
@@ -3,6 +3,8 @@ from pydantic import BaseModel
 
 from clients.files.files_client import FilesAPIClient, get_private_files_client
 from clients.files.files_schema import CreateFileRequestSchema, CreateFileResponseSchema
+from clients.schema_registry import schema_registry
+from config import settings
 from fixtures.users import UserFixture
 
 
@@ -29,6 +31,6 @@ def function_create_file(files_client: FilesAPIClient) -> FileFixture:
     :param files_client: Клиент для взаимодействия с API файлов
     :return: Объект фикстуры FileFixture, содержащий данные запроса и ответа
     """
-    request = CreateFileRequestSchema(upload_file='./test_data/image.png')
+    request = schema_registry.build_request(CreateFileRequestSchema, upload_file=settings.test_data.image_png_file)
     response = files_client.create_file(request)
     return FileFixture(request=request, response=response)
\ No newline at end of file
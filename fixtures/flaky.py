@@ -0,0 +1,174 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from tools.flaky import FlakyHistory, FlakyScore
+from tools.xdist import is_worker
+
+ranking_key = pytest.StashKey[list[dict]]()
+
+# История попыток (только при --record-flaky) и длительность незавершенных попыток
+_history: FlakyHistory | None = None
+_in_progress: dict[str, tuple[float, bool, bool]] = {}  # nodeid -> (длительность, попытка упала, тест пропущен)
+# Перезапуски текущего прогона: nodeid -> (количество, суммарная длительность)
+_reruns: dict[str, tuple[int, float]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("flaky", "Поиск нестабильных тестов")
+    group.addoption(
+        "--flaky-db",
+        default=".test-flakiness.sqlite",
+        help="Файл SQLite с историей результатов попыток выполнения тестов"
+    )
+    group.addoption(
+        "--record-flaky",
+        action="store_true",
+        help="Записать результаты попыток текущего прогона в историю"
+    )
+    group.addoption(
+        "--rerun-flaky",
+        type=int,
+        default=0,
+        help="Перезапускать упавшие тесты указанное количество раз, но только нестабильные по истории. "
+             "Остальным тестам перезапуски отключаются, даже если задан --reruns"
+    )
+    group.addoption(
+        "--flaky-threshold",
+        type=float,
+        default=0.05,
+        help="Оценка нестабильности, начиная с которой тест считается нестабильным"
+    )
+    group.addoption(
+        "--flaky-report",
+        default=None,
+        help="Файл JSON с рейтингом нестабильных тестов"
+    )
+
+
+def _is_flaky(score: FlakyScore | None, threshold: float) -> bool:
+    return score is not None and score.flips > 0 and score.score >= threshold
+
+
+def pytest_configure(config: pytest.Config):
+    global _history
+    if config.getoption("rerun_flaky") and not config.pluginmanager.hasplugin("rerunfailures"):
+        raise pytest.UsageError("--rerun-flaky требует установленный pytest-rerunfailures")
+
+    # Историю пишет только контроллер (или обычный прогон без xdist)
+    if config.getoption("record_flaky") and not is_worker(config):
+        _history = FlakyHistory(config.getoption("flaky_db"))
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    """
+    Помечает маркером flaky pytest-rerunfailures тесты с нестабильной историей, а остальным
+    запрещает перезапуски: повторный запуск стабильно падающего теста только тратит время.
+    Маркер flaky, поставленный на сам тест, имеет приоритет.
+    """
+    reruns = config.getoption("rerun_flaky")
+    if not reruns or not Path(config.getoption("flaky_db")).exists():
+        return
+
+    history = FlakyHistory(config.getoption("flaky_db"))
+    try:
+        scores = history.scores()
+    finally:
+        history.close()
+
+    threshold = config.getoption("flaky_threshold")
+    for item in items:
+        if _is_flaky(scores.get(item.nodeid), threshold):
+            item.add_marker(pytest.mark.flaky(reruns=reruns))
+        else:
+            item.add_marker(pytest.mark.flaky(reruns=0))
+
+
+def pytest_runtest_logreport(report: pytest.TestReport):
+    """
+    Собирает попытки выполнения теста. Попытка, после которой pytest-rerunfailures перезапускает тест,
+    заканчивается отчетом с outcome rerun, последняя попытка - отчетом teardown.
+    Пропущенный тест (в том числе в setup, когда фазы call нет) не записывается: он не проходил и не падал.
+    """
+    rerun = getattr(report, "rerun", 0)
+    duration, failed, skipped = _in_progress.pop(report.nodeid, (0.0, False, False))
+    duration += report.duration
+    failed = failed or report.failed or report.outcome == "rerun"
+    skipped = skipped or report.skipped
+
+    if rerun:
+        count, total = _reruns.get(report.nodeid, (0, 0.0))
+        _reruns[report.nodeid] = (count + (report.when == "setup"), total + report.duration)
+
+    if report.outcome != "rerun" and report.when != "teardown":
+        _in_progress[report.nodeid] = (duration, failed, skipped)
+        return
+
+    if _history is not None and not skipped:
+        _history.record(report.nodeid, rerun, not failed, duration)
+
+
+def _ranking(scores: dict[str, FlakyScore], threshold: float) -> list[dict]:
+    """
+    Нестабильные тесты и тесты, которые перезапускались в текущем прогоне, по убыванию оценки.
+    """
+    node_ids = {node_id for node_id, score in scores.items() if _is_flaky(score, threshold)} | set(_reruns)
+    ranking = []
+    for node_id in node_ids:
+        score = scores.get(node_id)
+        reruns, rerun_duration = _reruns.get(node_id, (0, 0.0))
+        ranking.append({
+            "node_id": node_id,
+            "score": round(score.score, 3) if score else None,
+            "flips": score.flips if score else None,
+            "attempts": score.attempts if score else None,
+            "reruns": reruns,
+            "rerun_duration": round(rerun_duration, 3),
+            "history_rerun_duration": round(score.rerun_duration, 3) if score else None,
+        })
+    ranking.sort(key=lambda entry: (entry["score"] or 0.0, entry["rerun_duration"]), reverse=True)
+    return ranking
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    global _history
+    config = session.config
+    enabled = config.getoption("record_flaky") or config.getoption("rerun_flaky") or config.getoption("flaky_report")
+    if not enabled or is_worker(config):
+        return
+
+    scores: dict[str, FlakyScore] = {}
+    if _history is not None:
+        scores = _history.scores()
+        _history.close()
+        _history = None
+    elif Path(config.getoption("flaky_db")).exists():
+        history = FlakyHistory(config.getoption("flaky_db"))
+        try:
+            scores = history.scores()
+        finally:
+            history.close()
+
+    config.stash[ranking_key] = _ranking(scores, config.getoption("flaky_threshold"))
+    if config.getoption("flaky_report"):
+        Path(config.getoption("flaky_report")).write_text(
+            json.dumps(config.stash[ranking_key], ensure_ascii=False, indent=2),
+            encoding="utf-8"
+        )
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config):
+    ranking = config.stash.get(ranking_key, [])
+    if not ranking:
+        return
+
+    terminalreporter.section("Нестабильные тесты")
+    total = sum(entry["rerun_duration"] for entry in ranking)
+    terminalreporter.write_line(f"Перезапуски в этом прогоне заняли {total:.1f} с")
+    for entry in ranking[:20]:
+        score = "н/д" if entry["score"] is None else f"{entry['score']:.2f}"
+        terminalreporter.write_line(
+            f"{score:>5}  перезапусков: {entry['reruns']:<2} ({entry['rerun_duration']:.1f} с)  {entry['node_id']}"
+        )
@@ -0,0 +1,45 @@
+from pathlib import Path
+
+import pytest
+
+from clients.recorders import APICall, register_recorder, unregister_recorder
+from tools.load.scenario import record_call, start_recording, stop_recording
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.getgroup("load-scenarios", "Нагрузочные сценарии").addoption(
+        "--record-scenarios",
+        default=None,
+        help="Каталог, в который записываются сценарии тестов для tools.load.replay"
+    )
+
+
+def _record(call: APICall):
+    record_call(call.func, call.args, call.kwargs, call.endpoint, call.response)
+
+
+def pytest_configure(config: pytest.Config):
+    if config.getoption("record_scenarios"):
+        register_recorder(_record)
+
+
+def pytest_unconfigure(config: pytest.Config):
+    unregister_recorder(_record)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    """
+    Записывает вызовы клиентов теста и его фикстур в сценарий.
+    """
+    directory = item.config.getoption("record_scenarios")
+    if not directory:
+        return (yield)
+
+    start_recording(item.nodeid)
+    try:
+        return (yield)
+    finally:
+        scenario = stop_recording()
+        if scenario is not None and scenario.steps:
+            scenario.save(Path(directory))
@@ -0,0 +1,106 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from tools.metrics import MetricsServer, MetricsSnapshot, fixture_setup_duration, registry, test_duration, tests
+from tools.xdist import collect_from_workers, send_to_controller, worker_id
+
+_server: MetricsServer | None = None
+_worker_snapshots: list[MetricsSnapshot] = []
+_durations: dict[str, float] = {}  # nodeid -> сумма длительностей setup, call и teardown
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("metrics", "Метрики прогона в формате OpenMetrics")
+    group.addoption(
+        "--metrics-dir",
+        default=None,
+        help="Каталог для файлов метрик: metrics-<воркер>.prom и объединенный metrics.prom"
+    )
+    group.addoption(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Порт локального /metrics во время прогона. xdist воркер gwN слушает порт + N + 1"
+    )
+
+
+def _worker_id(config: pytest.Config) -> str:
+    return worker_id(config) or "main"
+
+
+def pytest_configure(config: pytest.Config):
+    global _server
+    port = config.getoption("metrics_port")
+    if port is None:
+        return
+
+    worker_id = _worker_id(config)
+    if worker_id != "main":
+        port += int(worker_id.removeprefix("gw")) + 1
+    _server = MetricsServer(registry, port)
+    _server.start()
+
+
+def pytest_unconfigure(config: pytest.Config):
+    global _server
+    if _server is not None:
+        _server.stop()
+        _server = None
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_fixture_setup(fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest):
+    started_at = time.perf_counter()
+    try:
+        return (yield)
+    finally:
+        fixture_setup_duration.observe(
+            time.perf_counter() - started_at,
+            fixture=fixturedef.argname,
+            scope=fixturedef.scope
+        )
+
+
+def pytest_runtest_logreport(report: pytest.TestReport):
+    """
+    Считает тесты по результату. Перезапуск pytest-rerunfailures приходит отдельным отчетом с outcome rerun.
+    """
+    if getattr(report, "node", None) is not None:
+        # Отчет xdist воркера на контроллере: тест уже посчитан воркером
+        return
+
+    if report.outcome == "rerun":
+        tests.inc(outcome="rerun")
+        return
+
+    if report.when == "call" or (report.when == "setup" and not report.passed):
+        tests.inc(outcome=report.outcome)
+    duration = _durations.pop(report.nodeid, 0.0) + report.duration
+    if report.when == "teardown":
+        test_duration.observe(duration)
+    else:
+        _durations[report.nodeid] = duration
+
+
+# Метрики xdist воркеров
+pytest_testnodedown = collect_from_workers("metrics", MetricsSnapshot.model_validate_json, _worker_snapshots.append)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    config = session.config
+    if not config.getoption("metrics_dir"):
+        return
+
+    directory = Path(config.getoption("metrics_dir"))
+    directory.mkdir(parents=True, exist_ok=True)
+    snapshot = registry.snapshot()
+    (directory / f"metrics-{_worker_id(config)}.prom").write_text(registry.render(snapshot), encoding="utf-8")
+
+    if send_to_controller(config, "metrics", snapshot):
+        return
+
+    for worker_snapshot in _worker_snapshots:
+        snapshot = snapshot.merge(worker_snapshot)
+    (directory / "metrics.prom").write_text(registry.render(snapshot), encoding="utf-8")
@@ -0,0 +1,170 @@
+import pytest
+
+from config import settings
+from tools.allure.session_result import report_session_result
+from tools.data_generator import get_run_id
+from tools.http.timings import timing_stats
+from tools.xdist import collect_from_workers, is_worker, send_to_controller
+from tools.perf_history import Comparison, PerfHistory, PerfSamples, compare_samples, current_git_sha, format_comparisons, perf_samples
+
+comparisons_key = pytest.StashKey[list[Comparison]]()
+baseline_key = pytest.StashKey[tuple[str, str]]()
+test_windows_key = pytest.StashKey[tuple[int, int]]()  # прогонов в текущем и базовом окнах тестов
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("perf-history", "Регрессии производительности между прогонами")
+    group.addoption(
+        "--perf-db",
+        default=".test-perf.sqlite",
+        help="Файл SQLite с длительностями запросов по прогонам"
+    )
+    group.addoption(
+        "--record-perf",
+        action="store_true",
+        help="Записать длительности запросов текущего прогона в историю"
+    )
+    group.addoption(
+        "--perf-compare",
+        action="store_true",
+        help="Сравнить длительности запросов с базовым прогоном и отметить замедления"
+    )
+    group.addoption(
+        "--perf-env",
+        default=None,
+        help="Окружение прогона в истории. По умолчанию - адрес API из настроек"
+    )
+    group.addoption(
+        "--perf-baseline",
+        default=None,
+        help="run_id или начало SHA коммита базового прогона. По умолчанию - последний прогон того же окружения"
+    )
+    group.addoption(
+        "--perf-test-runs",
+        type=int,
+        default=5,
+        help="Прогонов в окне сравнения тестов: у теста одно значение за прогон, поэтому текущий прогон "
+             "с предыдущими сравнивается с таким же числом прогонов перед ними. "
+             "При --perf-alpha 0.01 окно должно быть не меньше 5 прогонов"
+    )
+    group.addoption(
+        "--perf-alpha",
+        type=float,
+        default=0.01,
+        help="Уровень значимости критерия Манна-Уитни"
+    )
+    group.addoption(
+        "--perf-min-shift",
+        type=float,
+        default=0.1,
+        help="Минимальный относительный рост медианы, который считается замедлением"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    # Длительности берутся из замеров фаз запросов: TimingStats сохраняет каждый замер, а не только сумму
+    timing_stats.keep_samples = config.getoption("record_perf") or config.getoption("perf_compare")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    try:
+        return (yield)
+    finally:
+        # Запросы теста очищаются в начале следующего теста, см. fixtures.request_timings
+        if timing_stats.keep_samples:
+            perf_samples.add_test(item.nodeid, timing_stats.current_test)
+
+
+# Длительности xdist воркеров
+pytest_testnodedown = collect_from_workers("perf_samples", PerfSamples.model_validate_json, perf_samples.merge)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    config = session.config
+    if not timing_stats.keep_samples:
+        return
+
+    # Замеры маршрутов воркеров xdist приходят в perf_samples, в timing_stats контроллера их нет
+    perf_samples.add_routes(timing_stats)
+    if send_to_controller(config, "perf_samples", perf_samples):
+        # историю пишет контроллер
+        return
+
+    run_id = get_run_id()
+    environment = config.getoption("perf_env") or settings.http_client.url
+    history = PerfHistory(config.getoption("perf_db"))
+    try:
+        if config.getoption("perf_compare"):
+            alpha, min_shift = config.getoption("perf_alpha"), config.getoption("perf_min_shift")
+            comparisons = []
+
+            # Маршруты сравниваются с одним базовым прогоном: запросов к маршруту за прогон много
+            reference = config.getoption("perf_baseline")
+            baseline = history.find_baseline(environment, run_id, reference)
+            if baseline is not None:
+                config.stash[baseline_key] = baseline
+                routes = {key: values for key, values in history.samples(baseline[0]).items() if key[0] == "route"}
+                current_routes = {("route", route): values for route, values in perf_samples.routes.items()}
+                comparisons += compare_samples(routes, current_routes, alpha=alpha, min_shift=min_shift)
+
+            # Тесты - окнами прогонов: у теста одно значение за прогон
+            runs = config.getoption("perf_test_runs")
+            recent, baseline_runs = history.test_windows(
+                environment, run_id, runs, baseline[0] if reference and baseline is not None else None
+            )
+            if len(baseline_runs) == runs:
+                config.stash[test_windows_key] = (len(recent) + 1, len(baseline_runs))
+                current_tests = history.test_samples(recent)
+                for test, values in perf_samples.tests.items():
+                    current_tests.setdefault(("test", test), []).extend(values)
+                comparisons += compare_samples(
+                    history.test_samples(baseline_runs), current_tests, alpha=alpha, min_shift=min_shift, min_samples=runs
+                )
+
+            if baseline is not None or test_windows_key in config.stash:
+                config.stash[comparisons_key] = comparisons
+        if config.getoption("record_perf"):
+            history.record(run_id, current_git_sha(), environment, perf_samples)
+    finally:
+        history.close()
+
+    comparisons = config.stash.get(comparisons_key, None)
+    report_dir = getattr(config.option, "allure_report_dir", None)
+    if comparisons is not None and report_dir:
+        parameters = {"run_id": run_id}
+        if baseline_key in config.stash:
+            parameters["baseline_run_id"], parameters["baseline_sha"] = config.stash[baseline_key]
+        if test_windows_key in config.stash:
+            parameters["test_runs"] = "{} / {}".format(*config.stash[test_windows_key])
+        report_session_result(
+            report_dir,
+            "Регрессии производительности",
+            passed=not any(comparison.regressed for comparison in comparisons),
+            attachments={"Сравнение с базовым прогоном": format_comparisons(comparisons)},
+            parameters=parameters
+        )
+
+
+def pytest_terminal_summary(terminalreporter, config: pytest.Config):
+    if not config.getoption("perf_compare") or is_worker(config):
+        return
+
+    terminalreporter.section("Регрессии производительности")
+    if baseline_key in config.stash:
+        baseline_run_id, baseline_sha = config.stash[baseline_key]
+        terminalreporter.write_line(f"Маршруты: базовый прогон {baseline_run_id} ({baseline_sha[:10]})")
+    else:
+        terminalreporter.write_line("Маршруты: базовый прогон не найден, запустите прогон с --record-perf")
+    if test_windows_key in config.stash:
+        recent_runs, baseline_runs = config.stash[test_windows_key]
+        terminalreporter.write_line(f"Тесты: {recent_runs} последних прогонов против {baseline_runs} предыдущих")
+    else:
+        runs = config.getoption("perf_test_runs")
+        terminalreporter.write_line(f"Тесты: для сравнения нужно {2 * runs - 1} прогонов окружения, записанных с --record-perf")
+
+    comparisons = config.stash.get(comparisons_key, [])
+    regressions = [comparison for comparison in comparisons if comparison.regressed]
+    terminalreporter.write_line(f"Сравнено {len(comparisons)}, замедлений {len(regressions)}")
+    if regressions:
+        terminalreporter.write_line(format_comparisons(regressions))
@@ -0,0 +1,65 @@
+from pathlib import Path
+
+import allure
+import pytest
+
+from clients.recorders import APICall, register_recorder, unregister_recorder
+from tools.http.timings import TimingStats, timing_stats
+from tools.xdist import collect_from_workers, send_to_controller
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.getgroup("request-timings", "Фазы HTTP запросов").addoption(
+        "--request-timings",
+        default=None,
+        help="Файл, в который записываются средние и максимальные длительности фаз запросов по маршрутам"
+    )
+
+
+def _record(call: APICall):
+    timing_stats.record(call.endpoint, call.response)
+
+
+def pytest_configure(config: pytest.Config):
+    # Без опции: длительности фаз прикрепляются к каждому упавшему тесту и нужны истории производительности
+    register_recorder(_record)
+
+
+def pytest_unconfigure(config: pytest.Config):
+    unregister_recorder(_record)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    timing_stats.current_test.clear()
+    return (yield)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_makereport(item: pytest.Item, call: pytest.CallInfo):
+    """
+    Прикрепляет к упавшему тесту длительности фаз всех его запросов.
+    """
+    report: pytest.TestReport = yield
+    if report.failed and report.when in ("setup", "call") and timing_stats.current_test:
+        allure.attach(
+            timing_stats.format_current_test(),
+            "Длительности фаз запросов, мс",
+            allure.attachment_type.TEXT
+        )
+    return report
+
+
+# Длительности xdist воркеров
+pytest_testnodedown = collect_from_workers("request_timings", TimingStats.model_validate_json, timing_stats.merge)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    config = session.config
+    if not config.getoption("request_timings"):
+        return
+
+    if send_to_controller(config, "request_timings", timing_stats):
+        return
+
+    timing_stats.save(Path(config.getoption("request_timings")))
@@ -0,0 +1,119 @@
+from pathlib import Path
+
+import pytest
+
+from clients.recorders import APICall, register_recorder, unregister_recorder
+from tools.route_impact import (
+    RouteImpactMap,
+    expand_changed_modules,
+    start_recording,
+    stop_recording,
+    record_route,
+    to_module_name,
+)
+from tools.xdist import collect_from_workers, send_to_controller
+
+# Карта маршрутов, записанная текущим прогоном
+_recorded_map = RouteImpactMap()
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("route-impact", "Выбор тестов по затронутым маршрутам API")
+    group.addoption(
+        "--route-map",
+        default="route-map.json",
+        help="Файл карты 'тест -> маршруты API'"
+    )
+    group.addoption(
+        "--record-route-map",
+        action="store_true",
+        help="Записать карту маршрутов по результатам текущего прогона"
+    )
+    group.addoption(
+        "--changed-routes",
+        action="append",
+        default=[],
+        help="Измененные маршруты через запятую, например /api/v1/courses/{course_id}"
+    )
+    group.addoption(
+        "--changed-modules",
+        action="append",
+        default=[],
+        help="Измененные модули clients через запятую, например clients/courses/courses_schema.py"
+    )
+
+
+def _record(call: APICall):
+    record_route(call.endpoint, call.func.__module__)
+
+
+def pytest_configure(config: pytest.Config):
+    if config.getoption("record_route_map"):
+        register_recorder(_record)
+
+
+def pytest_unconfigure(config: pytest.Config):
+    unregister_recorder(_record)
+
+
+def _split(values: list[str]) -> set[str]:
+    return {item.strip() for value in values for item in value.split(",") if item.strip()}
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]):
+    """
+    Оставляет только тесты, которые по карте маршрутов затрагивают измененные маршруты или модули.
+    """
+    routes = _split(config.getoption("changed_routes"))
+    modules = {to_module_name(module) for module in _split(config.getoption("changed_modules"))}
+    if not routes and not modules:
+        return
+
+    route_map = RouteImpactMap.load(Path(config.getoption("route_map")))
+    affected_modules = expand_changed_modules(modules) if modules else set()
+
+    selected, deselected = [], []
+    for item in items:
+        if route_map.is_affected(item.nodeid, routes, affected_modules):
+            selected.append(item)
+        else:
+            deselected.append(item)
+
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    """
+    Записывает маршруты, вызванные тестом и его фикстурами.
+    """
+    if not item.config.getoption("record_route_map"):
+        return (yield)
+
+    start_recording()
+    try:
+        return (yield)
+    finally:
+        if usage := stop_recording():
+            _recorded_map.tests[item.nodeid] = usage
+
+
+# Карты маршрутов xdist воркеров
+pytest_testnodedown = collect_from_workers("route_impact_map", RouteImpactMap.model_validate_json, _recorded_map.merge)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    config = session.config
+    if not config.getoption("record_route_map"):
+        return
+
+    if send_to_controller(config, "route_impact_map", _recorded_map):
+        return
+
+    path = Path(config.getoption("route_map"))
+    route_map = RouteImpactMap.load(path)
+    route_map.merge(_recorded_map)
+    route_map.save(path)
@@ -0,0 +1,36 @@
+import json
+
+import pytest
+
+from tools.assertions.snapshot import snapshots
+from tools.xdist import collect_from_workers, send_to_controller
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.getgroup("snapshots", "Снимки ответов").addoption(
+        "--snapshot-update",
+        action="store_true",
+        help="Перезаписать снимки, с которыми сравнивает assert_snapshot, фактическими ответами"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    snapshots.update = config.getoption("snapshot_update")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    snapshots.start_test(item.path, item.nodeid.split("::", 1)[-1])
+    return (yield)
+
+
+# Обновленные снимки xdist воркеров: тесты одного модуля могут выполняться на разных воркерах,
+# поэтому файлы снимков пишет только контроллер
+pytest_testnodedown = collect_from_workers("snapshots", json.loads, snapshots.merge)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    if send_to_controller(session.config, "snapshots", json.dumps(snapshots.updated, ensure_ascii=False)):
+        return
+
+    snapshots.save()
@@ -0,0 +1,124 @@
+import time
+from pathlib import Path
+
+import pytest
+
+from tools.soak import SoakMonitor, SoakReport
+
+_report: SoakReport | None = None
+_violations: list[str] = []
+
+
+def pytest_addoption(parser: pytest.Parser):
+    group = parser.getgroup("soak", "Длительный прогон с поиском утечек памяти и сокетов")
+    group.addoption(
+        "--soak-duration",
+        type=float,
+        default=0,
+        help="Повторять выбранные тесты указанное количество секунд. 0 - обычный прогон"
+    )
+    group.addoption(
+        "--soak-iterations",
+        type=int,
+        default=None,
+        help="Максимальное количество итераций soak-прогона"
+    )
+    group.addoption(
+        "--soak-rss-budget-mb",
+        type=float,
+        default=64,
+        help="Допустимый рост RSS после первой итерации, МиБ"
+    )
+    group.addoption(
+        "--soak-fd-budget",
+        type=int,
+        default=16,
+        help="Допустимый рост числа открытых дескрипторов (включая сокеты) после первой итерации"
+    )
+    group.addoption(
+        "--soak-report",
+        default="soak-report.json",
+        help="Файл отчета soak-прогона"
+    )
+    group.addoption(
+        "--soak-top",
+        type=int,
+        default=10,
+        help="Сколько мест выделения памяти с наибольшим ростом вывести"
+    )
+
+
+def _is_soak(config: pytest.Config) -> bool:
+    return bool(config.getoption("soak_duration") or config.getoption("soak_iterations"))
+
+
+def pytest_configure(config: pytest.Config):
+    # Тесты xdist воркерам раздает контроллер, поэтому повторять их по кругу может только обычный прогон
+    if _is_soak(config) and config.getoption("numprocesses", None):
+        raise pytest.UsageError("--soak-duration и --soak-iterations требуют запуска без xdist: -n 0")
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtestloop(session: pytest.Session):
+    """
+    Выполняет выбранные тесты по кругу, пока не истечет --soak-duration или не будет
+    выполнено --soak-iterations итераций, и снимает замеры ресурсов после каждой итерации.
+    """
+    global _report
+    config = session.config
+    if not _is_soak(config) or config.option.collectonly or session.testsfailed or not session.items:
+        return None
+
+    duration = config.getoption("soak_duration")
+    max_iterations = config.getoption("soak_iterations")
+    deadline = time.monotonic() + duration if duration else None
+
+    monitor = SoakMonitor()
+    monitor.start()
+
+    iteration = 0
+    items = session.items
+    while True:
+        iteration += 1
+        last = (
+            (max_iterations is not None and iteration >= max_iterations)
+            or (deadline is not None and time.monotonic() >= deadline)
+        )
+        for index, item in enumerate(items):
+            # Между итерациями фикстуры уровня сессии не разрушаются, кроме самой последней итерации
+            nextitem = items[index + 1] if index + 1 < len(items) else (None if last else items[0])
+            item.config.hook.pytest_runtest_protocol(item=item, nextitem=nextitem)
+            if session.shouldfail:
+                raise session.Failed(session.shouldfail)
+            if session.shouldstop:
+                raise session.Interrupted(session.shouldstop)
+
+        monitor.sample(iteration)
+        if last:
+            break
+
+    _report = monitor.report(config.getoption("soak_top"))
+    _violations.extend(
+        _report.violations(
+            int(config.getoption("soak_rss_budget_mb") * 2 ** 20),
+            config.getoption("soak_fd_budget")
+        )
+    )
+    Path(config.getoption("soak_report")).write_text(_report.model_dump_json(indent=2), encoding="utf-8")
+    return True
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    if _violations and session.exitstatus == pytest.ExitCode.OK:
+        session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter):
+    if _report is None:
+        return
+
+    terminalreporter.section("Soak-прогон")
+    for line in _report.summary():
+        terminalreporter.write_line(line)
+    for violation in _violations:
+        terminalreporter.write_line(f"Превышен бюджет: {violation}", red=True)
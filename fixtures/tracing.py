@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import allure
+import pytest
+
+from tools.tracing import current_span, tracer
+from tools.xdist import worker_id
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.getgroup("tracing", "Трассировка").addoption(
+        "--trace-file",
+        default=None,
+        help="Файл OTLP/JSON, в который записываются спаны тестов, фикстур, шагов и HTTP запросов. "
+             "Каждый xdist воркер пишет в свой файл с суффиксом -gwN"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    path = config.getoption("trace_file")
+    if not path:
+        return
+
+    path = Path(path)
+    if worker := worker_id(config):
+        path = path.with_name(f"{path.stem}-{worker}{path.suffix}")
+    tracer.enable(path)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_protocol(item: pytest.Item, nextitem: pytest.Item | None):
+    """
+    Каждый тест - отдельная трасса: корневой спан теста, внутри спаны фикстур, шагов и запросов.
+    """
+    if not tracer.enabled:
+        return (yield)
+
+    try:
+        with tracer.span(item.nodeid, attributes={"test.nodeid": item.nodeid}, new_trace=True):
+            return (yield)
+    finally:
+        tracer.flush()
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_fixture_setup(fixturedef: pytest.FixtureDef, request: pytest.FixtureRequest):
+    attributes = {"fixture.name": fixturedef.argname, "fixture.scope": fixturedef.scope}
+    with tracer.span(f"fixture {fixturedef.argname}", attributes=attributes):
+        return (yield)
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item: pytest.Item):
+    # trace_id в отчете Allure позволяет найти серверные спаны теста
+    if (span := current_span()) is not None:
+        allure.dynamic.label("trace_id", span.trace_id)
+    return (yield)
+
+
+def pytest_sessionfinish(session: pytest.Session):
+    tracer.flush()
@@ -2,6 +2,7 @@ import pytest
 from pydantic import BaseModel, EmailStr
 
 from clients.private_builder import AuthUserSchema
+from clients.schema_registry import schema_registry
 from clients.users.private_user_client import PrivateUserAPIClient, get_private_user_client
 from clients.users.public_user_client import PublicUserAPIClient, get_public_user_client
 from clients.users.users_schema import CreateUserRequestSchema, CreateUserResponseSchema
@@ -53,6 +54,6 @@ def function_create_user(public_user_client: PublicUserAPIClient) -> UserFixture
     :param public_user_client: Клиент для взаимодействия с публичным API пользователей
     :return: Объект фикстуры UserFixture, содержащий данные запроса и ответа
     """
-    request = CreateUserRequestSchema()
+    request = schema_registry.build_request(CreateUserRequestSchema)
     response = public_user_client.create_user(request)
     return UserFixture(request=request, response=response)
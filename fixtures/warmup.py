@@ -0,0 +1,38 @@
+import pytest
+
+from config import settings
+from tools.logger import get_logger
+from tools.xdist import is_controller
+
+logger = get_logger("WARMUP")
+
+
+def pytest_addoption(parser: pytest.Parser):
+    parser.getgroup("warmup", "Прогрев").addoption(
+        "--warmup",
+        action="store_true",
+        help="Перед тестами прогреть соединения, авторизацию, схемы и маршруты (см. settings.warmup)"
+    )
+
+
+def pytest_configure(config: pytest.Config):
+    if config.getoption("warmup"):
+        settings.warmup.enabled = True
+
+
+def pytest_sessionstart(session: pytest.Session):
+    """
+    Прогрев выполняется в каждом процессе, где выполняются тесты: на xdist воркерах, но не на контроллере.
+    Время прогрева не относится ни к одному тесту. Ошибка прогрева не прерывает прогон: если API недоступен,
+    об этом сообщат сами тесты.
+    """
+    config = session.config
+    if not settings.warmup.enabled or config.option.collectonly or is_controller(config):
+        return
+
+    from clients.warmup import warm_up
+
+    try:
+        warm_up()
+    except Exception as error:
+        logger.warning(f"Прогрев не выполнен: {type(error).__name__}: {error}")
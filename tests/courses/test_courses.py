@@ -1,4 +1,5 @@
 from http import HTTPStatus
+from typing import Callable
 
 import allure
 import pytest
@@ -75,11 +76,17 @@ class TestCoursesPositive:
     @allure.story(AllureStory.GET_ENTITIES)
     @allure.sub_suite(AllureSubSuite.GET_ENTITY)
     @allure.title("Получение списка курсов")
-    def test_get_courses(self, courses_client: CoursesAPIClient, function_create_user: UserFixture, function_create_course: CoursesFixture):
+    def test_get_courses(
+            self,
+            courses_client: CoursesAPIClient,
+            function_create_user: UserFixture,
+            create_courses: Callable[[int], list[CoursesFixture]]
+    ):
+        courses = create_courses(3)
         query = GetCoursesQuerySchema(user_id=function_create_user.response.user.id)
         response = courses_client.get_courses_api(query)
         response_data = GetCourseByUserResponseSchema.model_validate_json(response.text)
 
         assert_status_code(response.status_code, HTTPStatus.OK)
-        assert_get_courses_response(response_data, [function_create_course.response])
+        assert_get_courses_response(response_data, [course.response for course in courses])
         validate_json_schema(instance=response.json(), schema=response_data.model_json_schema())
\ No newline at end of file
@@ -20,9 +20,9 @@ from tools.assertions.files import (
     assert_create_file_with_empty_filename_response,
     assert_file_not_found_response,
     assert_get_file_response,
-    assert_get_file_with_incorrect_file_id_response,
 )
 from tools.assertions.schema import validate_json_schema
+from tools.assertions.snapshot import assert_snapshot
 from tools.assertions.base_assertions import assert_status_code
 
 
@@ -122,5 +122,5 @@ class TestFilesNegative:
         response_data = ValidationErrorResponseSchema.model_validate_json(response.text)
 
         assert_status_code(response.status_code, HTTPStatus.UNPROCESSABLE_ENTITY)
-        assert_get_file_with_incorrect_file_id_response(response_data)
+        assert_snapshot(response_data)
         validate_json_schema(instance=response.json(), schema=response_data.model_json_schema())
\ No newline at end of file
@@ -0,0 +1,112 @@
+import pytest
+from pydantic import BaseModel
+
+from tools.assertions.diff import Mismatch, diff_collections, diff_values
+
+
+class File(BaseModel):
+    id: str
+    filename: str
+
+
+class Course(BaseModel):
+    id: str
+    title: str
+    preview_file: File | None = None
+
+
+class CreateCourseRequest(BaseModel):
+    title: str
+    preview_file_id: str
+
+
+class Exercise(BaseModel):
+    id: str
+    order_index: int
+
+
+def kinds(mismatches: list[Mismatch]) -> list[tuple[str, str]]:
+    return [(mismatch.kind, mismatch.path) for mismatch in mismatches]
+
+
+@pytest.mark.unit
+class TestDiffValues:
+    def test_equal_models(self):
+        assert diff_values(Course(id="1", title="a"), Course(id="1", title="a")) == []
+
+    def test_changed_field(self):
+        [mismatch] = diff_values(Course(id="1", title="a"), Course(id="1", title="b"), path="course")
+
+        assert (mismatch.path, mismatch.actual, mismatch.expected) == ("course.title", "a", "b")
+
+    def test_missing_and_extra_fields(self):
+        mismatches = diff_values({"id": "1", "extra": 1}, {"id": "1", "missing": 2}, path="course")
+
+        assert sorted(kinds(mismatches)) == [("extra", "course.extra"), ("missing", "course.missing")]
+
+    def test_list_length(self):
+        mismatches = diff_values([1, 2], [1, 2, 3], path="items")
+
+        assert kinds(mismatches) == [("changed", "items.length")]
+
+    def test_alias(self):
+        course = Course(id="1", title="a", preview_file=File(id="f1", filename="a.png"))
+        request = CreateCourseRequest(title="a", preview_file_id="f2")
+
+        [mismatch] = diff_values(course, request, aliases={"preview_file.id": "preview_file_id"})
+
+        assert (mismatch.path, mismatch.actual, mismatch.expected) == ("preview_file.id", "f1", "f2")
+
+    def test_alias_through_none(self):
+        request = CreateCourseRequest(title="a", preview_file_id="f2")
+
+        [mismatch] = diff_values(Course(id="1", title="a"), request, aliases={"preview_file.id": "preview_file_id"})
+
+        assert (mismatch.actual, mismatch.expected) == (None, "f2")
+
+    @pytest.mark.parametrize("aliases", [{"preview_file.uuid": "preview_file_id"}, {"preview_file.id": "preview_id"}])
+    def test_bad_alias(self, aliases: dict[str, str]):
+        course = Course(id="1", title="a", preview_file=File(id="f1", filename="a.png"))
+
+        with pytest.raises(ValueError):
+            diff_values(course, CreateCourseRequest(title="a", preview_file_id="f1"), aliases=aliases)
+
+    def test_models_without_common_fields(self):
+        with pytest.raises(ValueError):
+            diff_values(File(id="1", filename="a"), CreateCourseRequest(title="a", preview_file_id="1"), ignore=["id"])
+
+
+@pytest.mark.unit
+class TestDiffCollections:
+    def test_equal_in_any_order(self):
+        actual = [Exercise(id="1", order_index=1), Exercise(id="2", order_index=2)]
+
+        assert diff_collections(actual[::-1], actual, key=lambda item: item.id, name="exercises") == []
+
+    def test_missing_extra_and_changed(self):
+        actual = [Exercise(id="1", order_index=1), Exercise(id="3", order_index=3)]
+        expected = [Exercise(id="1", order_index=5), Exercise(id="2", order_index=2)]
+
+        mismatches = diff_collections(actual, expected, key=lambda item: item.id, name="exercises")
+
+        assert kinds(mismatches) == [
+            ("changed", "exercises[1].order_index"),
+            ("missing", "exercises[2]"),
+            ("extra", "exercises[3]"),
+        ]
+
+    def test_duplicate_key(self):
+        actual = [Exercise(id="1", order_index=1), Exercise(id="1", order_index=1)]
+
+        mismatches = diff_collections(actual, [Exercise(id="1", order_index=1)], key=lambda item: item.id, name="exercises")
+
+        assert kinds(mismatches) == [("duplicate", "exercises[1]")]
+
+    def test_order(self):
+        actual = [Exercise(id="2", order_index=2), Exercise(id="1", order_index=1)]
+
+        mismatches = diff_collections(
+            actual, actual, key=lambda item: item.id, name="exercises", order_by=lambda item: item.order_index
+        )
+
+        assert [(mismatch.kind, mismatch.actual, mismatch.expected) for mismatch in mismatches] == [("order", 1, 2)]
@@ -0,0 +1,65 @@
+import pytest
+
+from clients.users.users_schema import CreateUserRequestSchema, UpdateUserRequestSchema
+from tools.fuzzing.cases import FuzzCase, generate_cases
+
+
+def cases_of(cases: list[FuzzCase], field: str | None) -> dict[str, bool | None]:
+    """
+    Мутации поля и ожидание отказа: {"length:51": True, ...}
+    """
+    return {case.mutation: case.expect_rejection for case in cases if case.field == field}
+
+
+@pytest.mark.unit
+class TestGenerateCases:
+    def test_body_cases(self):
+        cases = generate_cases(CreateUserRequestSchema)
+
+        assert cases_of(cases, None) == {
+            "empty_object": True,
+            "null": True,
+            "array": True,
+            "string": True,
+            "extra_field": None,
+        }
+
+    def test_constrained_string_cases(self):
+        cases = generate_cases(CreateUserRequestSchema)
+
+        # lastName: constr(min_length=1, max_length=50)
+        assert cases_of(cases, "lastName") == {
+            "missing": True,
+            "name_instead_of_alias:last_name": True,
+            "null": True,
+            "length:0": True,
+            "length:1": False,
+            "length:50": False,
+            "length:51": True,
+            "oversized:10000": True,
+            "oversized:100000": True,
+            "wrong_type:int": True,
+            "wrong_type:bool": True,
+            "wrong_type:list": True,
+            "wrong_type:dict": True,
+        }
+
+    def test_email_format_case(self):
+        cases = generate_cases(CreateUserRequestSchema)
+
+        assert cases_of(cases, "email")["format:email"] is True
+
+    def test_case_payloads(self):
+        cases = {case.name: case for case in generate_cases(CreateUserRequestSchema, email="user@example.com")}
+
+        assert cases["lastName: length:51"].payload["lastName"] == "a" * 51
+        assert "lastName" not in cases["lastName: missing"].payload
+        assert cases["lastName: name_instead_of_alias:last_name"].payload.keys() >= {"last_name", "email"}
+        # остальные поля кейса остаются корректными
+        assert cases["lastName: null"].payload["email"] == "user@example.com"
+
+    def test_partial_schema_accepts_missing_fields(self):
+        cases = generate_cases(UpdateUserRequestSchema, partial=True)
+
+        assert cases_of(cases, None)["empty_object"] is False
+        assert all(case.expect_rejection is False for case in cases if case.mutation == "missing")
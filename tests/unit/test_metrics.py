@@ -0,0 +1,36 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tools.metrics import MetricsRegistry
+
+
+@pytest.mark.unit
+class TestMetricsRegistry:
+    def test_finished_threads_are_folded(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests", "Запросы")
+        duration = registry.histogram("duration", "Длительность", buckets=(1.0,))
+
+        def record(_):
+            requests.inc(route="GET /api/v1/courses")
+            duration.observe(0.5)
+
+        for _ in range(20):
+            # новый пул потоков на каждый запуск, как в SetupGraph
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(record, range(8)))
+
+        snapshot = registry.snapshot()
+
+        assert registry._shards == []  # потоки пулов завершились, их шарды объединены
+        assert snapshot.counters == [("requests", (("route", "GET /api/v1/courses"),), 160.0)]
+        assert snapshot.histograms == [("duration", (), [160.0, 0.0, 80.0, 160.0])]
+
+    def test_snapshot_does_not_change_values(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests", "Запросы")
+        requests.inc()
+
+        assert registry.snapshot() == registry.snapshot()
+        assert registry.snapshot().counters == [("requests", (), 1.0)]
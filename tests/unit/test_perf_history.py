@@ -0,0 +1,133 @@
+import itertools
+
+import pytest
+from httpx import Request, Response
+
+from tools.http.timings import RequestTimings, TimingStats
+from tools.perf_history import PerfHistory, PerfSamples, compare_samples, mann_whitney_p_value
+
+BASELINE = [10.0, 11.0, 12.0, 13.0, 14.0, 15.0, 16.0, 17.0, 18.0, 19.0]
+SHIFTED = [value * 1.5 for value in BASELINE]  # медиана выросла на 50%
+
+
+@pytest.mark.unit
+class TestMannWhitney:
+    def test_shifted_sample(self):
+        assert mann_whitney_p_value(BASELINE, SHIFTED) < 0.01
+
+    def test_one_sided(self):
+        # ускорение - не замедление
+        assert mann_whitney_p_value(SHIFTED, BASELINE) > 0.999
+
+    def test_same_sample(self):
+        assert mann_whitney_p_value(BASELINE, BASELINE) == pytest.approx(0.5, abs=0.05)
+
+    def test_all_ties(self):
+        assert mann_whitney_p_value([5.0] * 10, [5.0] * 10) == 1.0
+
+    def test_empty_sample(self):
+        assert mann_whitney_p_value([], SHIFTED) == 1.0
+
+
+@pytest.mark.unit
+class TestCompareSamples:
+    def test_regression(self):
+        [comparison] = compare_samples({("route", "GET /api/v1/courses"): BASELINE}, {("route", "GET /api/v1/courses"): SHIFTED})
+
+        assert comparison.regressed
+        assert comparison.shift == pytest.approx(0.5)
+        assert comparison.baseline_median == 14.5
+        assert comparison.current_median == 21.75
+
+    def test_small_shift_is_not_regression(self):
+        # сдвиг значим, но медиана выросла меньше чем на min_shift
+        current = [value + 1.0 for value in BASELINE]
+        baseline = BASELINE * 10
+
+        [comparison] = compare_samples({("route", "route"): baseline}, {("route", "route"): current * 10})
+
+        assert comparison.p_value < 0.01
+        assert not comparison.regressed
+
+    def test_all_ties(self):
+        [comparison] = compare_samples({("test", "test"): [5.0] * 10}, {("test", "test"): [5.0] * 10})
+
+        assert comparison.p_value == 1.0
+        assert comparison.shift == 0.0
+        assert not comparison.regressed
+
+    def test_below_min_samples(self):
+        baseline = {("route", "a"): BASELINE[:4], ("route", "b"): BASELINE}
+        current = {("route", "a"): SHIFTED, ("route", "b"): SHIFTED[:4]}
+
+        assert compare_samples(baseline, current, min_samples=5) == []
+
+    def test_sorted_by_shift(self):
+        baseline = {("route", "a"): BASELINE, ("route", "b"): BASELINE}
+        current = {("route", "a"): BASELINE, ("route", "b"): SHIFTED}
+
+        assert [comparison.name for comparison in compare_samples(baseline, current)] == ["b", "a"]
+
+
+def timed_response(total: float) -> Response:
+    return Response(200, request=Request("GET", "http://localhost/api/v1/courses"), extensions={"timings": RequestTimings(total=total)})
+
+
+@pytest.mark.unit
+class TestPerfSamples:
+    def test_built_from_timing_stats(self):
+        stats = TimingStats(keep_samples=True)
+        for total in (10.0, 20.0):
+            stats.record("/api/v1/courses", timed_response(total))
+
+        samples = PerfSamples()
+        samples.add_routes(stats)
+        samples.add_test("tests/test_courses.py::test_get_courses", stats.current_test)
+
+        assert samples.routes == {"GET /api/v1/courses": [10.0, 20.0]}
+        # у теста одно значение за прогон - сумма длительностей его запросов
+        assert samples.tests == {"tests/test_courses.py::test_get_courses": [30.0]}
+
+    def test_samples_are_not_kept_by_default(self):
+        stats = TimingStats()
+        stats.record("/api/v1/courses", timed_response(10.0))
+
+        samples = PerfSamples()
+        samples.add_routes(stats)
+
+        assert samples.routes == {}
+
+
+@pytest.mark.unit
+class TestPerfHistory:
+    @pytest.fixture
+    def history(self, tmp_path, monkeypatch):
+        # прогоны записываются раз в секунду: порядок не зависит от точности часов
+        clock = itertools.count(1000)
+        monkeypatch.setattr("tools.perf_history.time.time", lambda: float(next(clock)))
+        history = PerfHistory(tmp_path / "perf.sqlite")
+        for run in range(10):
+            samples = PerfSamples(tests={"test_a": [float(run)]})
+            history.record(f"run-{run}", "sha", "dev" if run != 5 else "stage", samples)
+        yield history
+        history.close()
+
+    def test_windows(self, history):
+        recent, baseline = history.test_windows("dev", "current", runs=3)
+
+        assert recent == ["run-9", "run-8"]
+        assert baseline == ["run-7", "run-6", "run-4"]  # run-5 - другое окружение
+
+    def test_windows_from_reference(self, history):
+        recent, baseline = history.test_windows("dev", "current", runs=3, reference="run-3")
+
+        assert recent == ["run-9", "run-8"]
+        assert baseline == ["run-3", "run-2", "run-1"]
+
+    def test_not_enough_runs(self, history):
+        _, baseline = history.test_windows("dev", "current", runs=6)
+
+        assert len(baseline) == 4
+
+    def test_samples(self, history):
+        assert history.test_samples(["run-9", "run-8"]) == {("test", "test_a"): [8.0, 9.0]}
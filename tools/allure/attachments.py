@@ -0,0 +1,174 @@
+import gzip
+import hashlib
+import json
+import os
+import queue
+import threading
+import uuid
+from pathlib import Path
+
+from allure_commons import hookimpl
+from allure_commons.logger import INDENT, AllureFileLogger
+from allure_commons.model2 import ATTACHMENT_PATTERN
+from attr import asdict
+
+from config import OversizePolicy, settings
+from tools.logger import get_logger
+
+logger = get_logger("ALLURE_ATTACHMENTS")
+
+_STOP = object()  # маркер остановки фонового потока записи
+
+# Расширения вложений, которые можно безопасно обрезать. Бинарные вложения (картинки и т.п.) не обрезаются
+TEXT_EXTENSIONS = {"txt", "json", "xml", "html", "csv", "tsv", "yaml", "uri"}
+
+# MIME тип вложений, сжатых политикой compress
+GZIP_MIME_TYPE = "application/gzip"
+
+
+class AttachmentSink(AllureFileLogger):
+    """
+    Замена стандартного AllureFileLogger, которая хранит вложения по хешу содержимого.
+
+    - одинаковые вложения записываются на диск один раз, а результаты тестов ссылаются на общий файл;
+    - вложения больше `settings.attachments.max_size` обрезаются или сжимаются;
+    - запись вложений и результатов выполняется пачками в фоновом потоке.
+    """
+
+    def __init__(self, report_dir, clean=False):
+        super().__init__(report_dir, clean)
+        self._sources: dict[str, str] = {}  # исходное имя вложения -> имя файла по хешу
+        self._written: set[str] = set()  # уже поставленные в очередь файлы по хешу
+        self._file_digests: dict[tuple[str, int, int], str] = {}  # (путь, размер, mtime) -> хеш
+        self._lock = threading.Lock()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread = threading.Thread(target=self._writer, name="allure-attachment-sink", daemon=True)
+        self._thread.start()
+
+    def _writer(self):
+        """
+        Фоновый поток: забирает из очереди до `settings.attachments.batch_size` файлов и записывает их на диск.
+        """
+        batch_size = settings.attachments.batch_size
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is _STOP:
+                    return
+                file_name, body = item
+                try:
+                    with open(self._report_dir / file_name, 'wb') as file:
+                        file.write(body)
+                except OSError as error:
+                    logger.error(f"Не удалось записать файл {file_name}: {error}")
+
+    @staticmethod
+    def _prepare(body: bytes, file_name: str) -> tuple[bytes, str]:
+        """
+        Применяет к слишком большому вложению политику `settings.attachments.oversize_policy`.
+        Обрезаются только текстовые вложения, бинарные при политике truncate сохраняются как есть.
+
+        :param body: Содержимое вложения.
+        :param file_name: Имя файла вложения.
+        :return: Итоговое содержимое и расширение файла.
+        """
+        extension = file_name.split("-attachment.", 1)[-1]
+        max_size = settings.attachments.max_size
+        if len(body) <= max_size:
+            return body, extension
+
+        if settings.attachments.oversize_policy is OversizePolicy.COMPRESS:
+            return gzip.compress(body, mtime=0), f"{extension}.gz"
+
+        if extension not in TEXT_EXTENSIONS:
+            return body, extension
+
+        note = f"\n... обрезано {len(body) - max_size} байт из {len(body)}".encode("utf-8")
+        return body[:max_size] + note, extension
+
+    def _store(self, file_name: str, body: bytes) -> str:
+        """
+        Сохраняет вложение под именем, построенным по хешу его содержимого.
+
+        :param file_name: Имя файла, под которым вложение записано в результатах теста.
+        :param body: Содержимое вложения.
+        :return: Хеш сохраненного содержимого.
+        """
+        body, extension = self._prepare(body, file_name)
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        stored_name = ATTACHMENT_PATTERN.format(prefix=digest, ext=extension)
+        if self._link(file_name, stored_name):
+            self._queue.put((stored_name, body))
+        return digest
+
+    def _link(self, file_name: str, stored_name: str) -> bool:
+        """
+        Запоминает, что вложение `file_name` хранится в файле `stored_name`.
+
+        :return: True, если файл `stored_name` еще не был поставлен на запись.
+        """
+        with self._lock:
+            self._sources[file_name] = stored_name
+            if stored_name in self._written:
+                return False
+            self._written.add(stored_name)
+            return True
+
+    def _replace_sources(self, item):
+        """
+        Рекурсивно заменяет ссылки на вложения в результатах, шагах и фикстурах.
+
+        :param item: Объект модели Allure (результат теста, контейнер, шаг).
+        """
+        for attachment in getattr(item, "attachments", ()):
+            attachment.source = self._sources.pop(attachment.source, attachment.source)
+            if attachment.source.endswith(".gz"):
+                # Сжатое вложение нельзя показать как текст: Allure предложит скачать архив
+                attachment.type = GZIP_MIME_TYPE
+        for child in (*getattr(item, "steps", ()), *getattr(item, "befores", ()), *getattr(item, "afters", ())):
+            self._replace_sources(child)
+
+    def _report_item(self, item):
+        self._replace_sources(item)
+        indent = INDENT if os.environ.get("ALLURE_INDENT_OUTPUT") else None
+        file_name = item.file_pattern.format(prefix=uuid.uuid4())
+        data = asdict(item, filter=lambda _, value: value or value is False)
+        self._queue.put((file_name, json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8")))
+
+    @hookimpl
+    def report_attached_file(self, source, file_name):
+        stat = os.stat(source)
+        key = (os.fspath(source), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            digest = self._file_digests.get(key)
+
+        if digest is not None:
+            # Файл уже сохранялся: не читаем и не хешируем его повторно
+            extension = file_name.split("-attachment.", 1)[-1]
+            self._link(file_name, ATTACHMENT_PATTERN.format(prefix=digest, ext=extension))
+            return
+
+        digest = self._store(file_name, Path(source).read_bytes())
+        if stat.st_size <= settings.attachments.max_size:
+            with self._lock:
+                self._file_digests[key] = digest
+
+    @hookimpl
+    def report_attached_data(self, body, file_name):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self._store(file_name, body)
+
+    def close(self):
+        """
+        Дожидается записи всех поставленных в очередь вложений.
+        """
+        self._queue.put(_STOP)
+        self._thread.join()
+
@@ -0,0 +1,46 @@
+import time
+import uuid
+from pathlib import Path
+
+from allure_commons.logger import AllureFileLogger
+from allure_commons.model2 import ATTACHMENT_PATTERN, Attachment, Label, Parameter, Status, TestResult
+from allure_commons.types import AttachmentType, LabelType
+
+from tools.allure.parent_suite import AllureParentSuite
+
+
+def report_session_result(
+        report_dir: str | Path,
+        name: str,
+        passed: bool,
+        attachments: dict[str, str],
+        parameters: dict[str, str] | None = None
+):
+    """
+    Записывает в результаты Allure отдельный результат с итогами всего прогона, например таблицей
+    регрессий производительности: у Allure нет вложений уровня сессии, а к тестам они не относятся.
+
+    :param report_dir: Каталог результатов (--alluredir).
+    :param name: Название результата в отчете.
+    :param passed: Статус результата: passed или failed.
+    :param attachments: Текстовые вложения "название -> содержимое".
+    :param parameters: Параметры результата, например SHA базового прогона.
+    """
+    logger = AllureFileLogger(report_dir)
+    now = int(time.time() * 1000)
+    result = TestResult(
+        uuid=str(uuid.uuid4()),
+        historyId=name,
+        fullName=name,
+        name=name,
+        status=Status.PASSED if passed else Status.FAILED,
+        start=now,
+        stop=now,
+        labels=[Label(name=LabelType.PARENT_SUITE, value=AllureParentSuite.LMS), Label(name=LabelType.SUITE, value="Session")],
+        parameters=[Parameter(name=key, value=value) for key, value in (parameters or {}).items()],
+    )
+    for title, body in attachments.items():
+        file_name = ATTACHMENT_PATTERN.format(prefix=uuid.uuid4(), ext=AttachmentType.TEXT.extension)
+        logger.report_attached_data(body, file_name)
+        result.attachments.append(Attachment(name=title, source=file_name, type=AttachmentType.TEXT.mime_type))
+    logger.report_result(result)
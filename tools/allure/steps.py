@@ -0,0 +1,106 @@
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Iterator, TypeVar
+
+import allure
+
+from config import ReportingLevel, settings
+from tools.tracing import tracer
+
+Func = TypeVar("Func", bound=Callable)
+
+# Список вложенных вызовов, собранных внутри шага в режиме compact.
+# None означает, что мы находимся вне компактного шага
+_compact_scope: ContextVar[list[str] | None] = ContextVar("compact_scope", default=None)
+
+
+def _attach_summary(calls: list[str]):
+    """
+    Прикрепляет к текущему шагу сводку по свернутым вложенным шагам.
+
+    :param calls: Имена функций, шаги которых были свернуты.
+    """
+    counter = Counter(calls)
+    lines = [f"Свернуто вложенных шагов: {len(calls)}"]
+    lines.extend(f"{name}: {count}" for name, count in counter.most_common())
+    allure.attach("\n".join(lines), "Сводка шага", allure.attachment_type.TEXT)
+
+
+def step(title: str) -> Callable[[Func], Func]:
+    """
+    Аналог `allure.step`, учитывающий уровень отчетности `settings.reporting.level`.
+
+    - full: поведение полностью совпадает с `allure.step`;
+    - compact: шаг создается только для внешнего вызова, вложенные шаги сворачиваются
+      в одно вложение со сводкой;
+    - off: шаг не создается, заголовок не форматируется.
+
+    :param title: Шаблон заголовка шага, как у `allure.step`.
+    :return: Декоратор функции.
+    """
+    def decorator(func: Func) -> Func:
+        @wraps(func)
+        def collect(*args, **kwargs):
+            calls: list[str] = []
+            token = _compact_scope.set(calls)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _compact_scope.reset(token)
+                if calls:
+                    _attach_summary(calls)
+
+        full_func = allure.step(title)(func)
+        compact_func = allure.step(title)(collect)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if tracer.enabled:
+                with tracer.span(func.__qualname__, attributes={"code.function": func.__qualname__}):
+                    return dispatch(*args, **kwargs)
+            return dispatch(*args, **kwargs)
+
+        def dispatch(*args, **kwargs):
+            level = settings.reporting.level
+            if level is ReportingLevel.FULL:
+                return full_func(*args, **kwargs)
+            if level is ReportingLevel.OFF:
+                return func(*args, **kwargs)
+
+            calls = _compact_scope.get()
+            if calls is None:
+                return compact_func(*args, **kwargs)
+
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def dynamic_step(name: str, make_title: Callable[[], str]) -> Iterator[None]:
+    """
+    Аналог `with allure.step(...)` для шагов с вычисляемым заголовком.
+    Заголовок строится только тогда, когда шаг действительно будет создан.
+
+    :param name: Имя шага для сводки в режиме compact.
+    :param make_title: Функция, возвращающая заголовок шага.
+    """
+    with tracer.span(name):
+        level = settings.reporting.level
+        if level is ReportingLevel.OFF:
+            yield
+            return
+
+        calls = _compact_scope.get()
+        if level is ReportingLevel.COMPACT and calls is not None:
+            calls.append(name)
+            yield
+            return
+
+        with allure.step(make_title()):
+            yield
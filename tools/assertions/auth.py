@@ -1,12 +1,11 @@
-import allure
-
 from clients.auth.auth_schema import LoginResponseSchema
+from tools.allure.steps import step
 from tools.assertions.base_assertions import assert_is_true, assert_value
 from tools.logger import get_logger
 
 logger = get_logger("AUTHENTICATION_ASSERTIONS")
 
-@allure.step("Проверка ответа на логин")
+@step("Проверка ответа на логин")
 def assert_login_response(response: LoginResponseSchema):
     """
     Функция для проверки ответа на запрос авторизации
@@ -1,12 +1,13 @@
 from typing import Any, Sized
 
-import allure
-
+from tools.allure.steps import dynamic_step, step
 from tools.logger import get_logger
+from tools.metrics import count_assertion
 
 logger = get_logger("BASE_ASSERTIONS")
 
-@allure.step("Проверка соответствия статус кода ответа. Ожидается {expected}, получен {actual}")
+@count_assertion
+@step("Проверка соответствия статус кода ответа. Ожидается {expected}, получен {actual}")
 def assert_status_code(actual: int, expected: int):
     """
     Функция для проверки статус кода
@@ -19,7 +20,8 @@ def assert_status_code(actual: int, expected: int):
         f'Некорректный код ответа. Получен: {actual}, ожидался: {expected}'
     )
 
-@allure.step("Проверка соответствия значения в поле {field_name}. Ожидается {expected}, получен {actual}")
+@count_assertion
+@step("Проверка соответствия значения в поле {field_name}. Ожидается {expected}, получен {actual}")
 def assert_value(actual: Any, expected: Any, field_name: str):
     """
     Функция для проверки значения поле ответа
@@ -33,7 +35,8 @@ def assert_value(actual: Any, expected: Any, field_name: str):
         f'Некорректное значение в поле {field_name}. Получено: {actual}, ожидалось: {expected}'
     )
 
-@allure.step("Проверка наличия поля {field_name} в ответе")
+@count_assertion
+@step("Проверка наличия поля {field_name} в ответе")
 def assert_is_true(actual: Any, field_name: str):
     """
     Проверяет, что фактическое значение является истинным.
@@ -48,6 +51,7 @@ def assert_is_true(actual: Any, field_name: str):
         f'Expected true value but got: {actual}'
     )
 
+@count_assertion
 def assert_length(actual: Sized, expected: Sized, name: str):
     """
     Проверяет, что длины двух объектов совпадают.
@@ -57,7 +61,7 @@ def assert_length(actual: Sized, expected: Sized, name: str):
     :param expected: Ожидаемый объект.
     :raises AssertionError: Если длины не совпадают.
     """
-    with allure.step(f"Проверка длины {name}. Ожидается {len(expected)}, фактически {len(actual)}"):
+    with dynamic_step("assert_length", lambda: f"Проверка длины {name}. Ожидается {len(expected)}, фактически {len(actual)}"):
         logger.info(f'Проверка что длина "{name}" соответствует {len(expected)}')
         assert len(actual) == len(expected), (
             f'Incorrect object length: "{name}". '
@@ -0,0 +1,235 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Iterable, Mapping
+
+import allure
+from pydantic import BaseModel
+
+from tools.allure.steps import dynamic_step
+from tools.logger import get_logger
+from tools.metrics import count_assertion
+
+logger = get_logger("DIFF_ASSERTIONS")
+
+_MISSING = object()  # маркер отсутствующего атрибута
+
+
+@dataclass
+class Mismatch:
+    """
+    Расхождение значения по пути `path` (например, course.preview_file.id)
+    """
+    path: str
+    actual: Any = None
+    expected: Any = None
+    kind: str = "changed" # changed, missing, extra, duplicate, order
+
+    def __str__(self) -> str:
+        match self.kind:
+            case "missing":
+                return f'Отсутствует элемент {self.path}'
+            case "extra":
+                return f'Лишний элемент {self.path}'
+            case "duplicate":
+                return f'Дублируется элемент {self.path}'
+            case "order":
+                return f'Нарушен порядок элемента {self.path}: {self.actual} идет после {self.expected}'
+        return f'Некорректное значение в поле {self.path}. Получено: {self.actual}, ожидалось: {self.expected}'
+
+
+def _resolve(value: Any, path: str) -> Any:
+    """
+    Значение по пути вида preview_file.id. Если промежуточное значение None, возвращается None.
+
+    :raises ValueError: Если в пути есть поле, которого нет у модели.
+    """
+    for name in path.split("."):
+        if value is None:
+            return None
+        resolved = getattr(value, name, _MISSING)
+        if resolved is _MISSING:
+            raise ValueError(f'Поле "{name}" пути "{path}" не найдено в {type(value).__name__}')
+        value = resolved
+    return value
+
+
+def _field_pairs(actual: BaseModel, expected: BaseModel, aliases: Mapping[str, str], ignore: set[str]) -> dict[str, str]:
+    """
+    Сопоставляет поля фактической и ожидаемой модели: одинаковые по имени поля плюс явные алиасы.
+
+    :return: Словарь "путь в actual -> путь в expected".
+    :raises ValueError: Если сравнивать нечего: у моделей нет общих полей и алиасов.
+    """
+    expected_fields = type(expected).model_fields
+    pairs = {name: name for name in type(actual).model_fields if name in expected_fields}
+    pairs.update(aliases)
+    pairs = {actual_path: expected_path for actual_path, expected_path in pairs.items() if actual_path not in ignore}
+    if not pairs:
+        # иначе сравнение несовместимых моделей всегда проходило бы
+        raise ValueError(f"У моделей {type(actual).__name__} и {type(expected).__name__} нет общих полей для сравнения")
+    return pairs
+
+
+def diff_values(
+        actual: Any,
+        expected: Any,
+        path: str = "",
+        aliases: Mapping[str, str] | None = None,
+        ignore: Iterable[str] = (),
+        mismatches: list[Mismatch] | None = None
+) -> list[Mismatch]:
+    """
+    Сравнивает значения за один проход и собирает все расхождения.
+
+    - модели сравниваются по общим полям и алиасам `aliases` (путь в actual -> путь в expected).
+      Модели без общих полей и алиасы с несуществующими полями - ошибка теста (ValueError), а не расхождение;
+    - словари сравниваются по ключам, ключи только одного из словарей - лишние или отсутствующие;
+    - вложенные модели, словари и списки сравниваются рекурсивно;
+    - остальные значения сравниваются через ==.
+
+    :param actual: Фактическое значение.
+    :param expected: Ожидаемое значение (модель того же типа или, например, схема запроса).
+    :param path: Путь к значению для сообщений об ошибках.
+    :param aliases: Соответствие полей верхнего уровня с разными именами, например {"preview_file.id": "preview_file_id"}.
+    :param ignore: Поля actual, которые не сравниваются.
+    :param mismatches: Список, в который добавляются расхождения.
+    :return: Список расхождений.
+    :raises ValueError: Если у моделей нет общих полей или путь алиаса не существует.
+    """
+    mismatches = [] if mismatches is None else mismatches
+
+    if isinstance(actual, BaseModel) and isinstance(expected, BaseModel):
+        for actual_path, expected_path in _field_pairs(actual, expected, aliases or {}, set(ignore)).items():
+            diff_values(
+                _resolve(actual, actual_path),
+                _resolve(expected, expected_path),
+                f"{path}.{actual_path}" if path else actual_path,
+                mismatches=mismatches
+            )
+    elif isinstance(actual, dict) and isinstance(expected, dict):
+        for key, actual_item in actual.items():
+            item_path = f"{path}.{key}" if path else str(key)
+            if key not in expected:
+                mismatches.append(Mismatch(item_path, kind="extra"))
+            else:
+                diff_values(actual_item, expected[key], item_path, mismatches=mismatches)
+        for key in expected.keys() - actual.keys():
+            mismatches.append(Mismatch(f"{path}.{key}" if path else str(key), kind="missing"))
+    elif isinstance(actual, list) and isinstance(expected, list):
+        if len(actual) != len(expected):
+            mismatches.append(Mismatch(f"{path}.length" if path else "length", len(actual), len(expected)))
+        for index, (actual_item, expected_item) in enumerate(zip(actual, expected)):
+            diff_values(actual_item, expected_item, f"{path}[{index}]", mismatches=mismatches)
+    elif actual != expected:
+        mismatches.append(Mismatch(path, actual, expected))
+
+    return mismatches
+
+
+def diff_collections(
+        actual: list,
+        expected: list,
+        key: Callable[[Any], Hashable],
+        name: str,
+        order_by: Callable[[Any], Any] | None = None
+) -> list[Mismatch]:
+    """
+    Сравнивает коллекции без учета порядка элементов за линейное время:
+    фактические элементы индексируются по ключу, после чего каждый ожидаемый элемент ищется в индексе.
+
+    :param actual: Фактические элементы.
+    :param expected: Ожидаемые элементы.
+    :param key: Функция, возвращающая ключ элемента (например, id).
+    :param name: Название коллекции для сообщений об ошибках.
+    :param order_by: Если задана, дополнительно проверяется, что фактические элементы
+        упорядочены по возрастанию этого значения (например, order_index).
+    :return: Отсутствующие, лишние, дублирующиеся и измененные элементы.
+    """
+    mismatches: list[Mismatch] = []
+
+    actual_index: dict[Hashable, Any] = {}
+    for item in actual:
+        item_key = key(item)
+        if item_key in actual_index:
+            mismatches.append(Mismatch(f"{name}[{item_key}]", kind="duplicate"))
+        actual_index[item_key] = item
+
+    for expected_item in expected:
+        item_key = key(expected_item)
+        actual_item = actual_index.pop(item_key, _MISSING)
+        if actual_item is _MISSING:
+            mismatches.append(Mismatch(f"{name}[{item_key}]", kind="missing"))
+            continue
+        diff_values(actual_item, expected_item, f"{name}[{item_key}]", mismatches=mismatches)
+
+    for item_key in actual_index:
+        mismatches.append(Mismatch(f"{name}[{item_key}]", kind="extra"))
+
+    if order_by is not None:
+        for previous, current in zip(actual, actual[1:]):
+            if order_by(previous) > order_by(current):
+                mismatches.append(
+                    Mismatch(f"{name}[{key(current)}]", order_by(current), order_by(previous), kind="order")
+                )
+
+    return mismatches
+
+
+def format_mismatches(mismatches: list[Mismatch]) -> str:
+    return "\n".join([f"Найдено расхождений: {len(mismatches)}", *map(str, mismatches)])
+
+
+@count_assertion
+def assert_no_diff(
+        actual: Any,
+        expected: Any,
+        name: str,
+        aliases: Mapping[str, str] | None = None,
+        ignore: Iterable[str] = ()
+):
+    """
+    Проверяет, что значения совпадают, одним шагом Allure.
+    В отличие от серии `assert_value`, сообщает обо всех расхождениях сразу.
+
+    :param actual: Фактическое значение.
+    :param expected: Ожидаемое значение.
+    :param name: Название проверяемого объекта.
+    :param aliases: Соответствие полей с разными именами, см. `diff_values`.
+    :param ignore: Поля, которые не сравниваются.
+    :raises AssertionError: Если найдено хотя бы одно расхождение.
+    """
+    with dynamic_step("assert_no_diff", lambda: f"Сравнение {name}"):
+        logger.info(f'Сравнение "{name}"')
+        mismatches = diff_values(actual, expected, aliases=aliases, ignore=ignore)
+
+        if mismatches:
+            report = format_mismatches(mismatches)
+            allure.attach(report, f"Расхождения: {name}", allure.attachment_type.TEXT)
+            raise AssertionError(f'Объект "{name}" не соответствует ожидаемому.\n{report}')
+
+
+@count_assertion
+def assert_collection(
+        actual: list,
+        expected: list,
+        name: str,
+        key: Callable[[Any], Hashable],
+        order_by: Callable[[Any], Any] | None = None
+):
+    """
+    Проверяет, что коллекции совпадают без учета порядка, одним шагом Allure.
+
+    :param actual: Фактические элементы.
+    :param expected: Ожидаемые элементы.
+    :param name: Название коллекции.
+    :param key: Функция, возвращающая ключ элемента.
+    :param order_by: Значение, по возрастанию которого должны идти фактические элементы, см. `diff_collections`.
+    :raises AssertionError: Если найдены отсутствующие, лишние или измененные элементы.
+    """
+    with dynamic_step("assert_collection", lambda: f"Сравнение коллекции {name}"):
+        logger.info(f'Сравнение коллекции "{name}"')
+        mismatches = diff_collections(actual, expected, key, name, order_by)
+
+        if mismatches:
+            report = format_mismatches(mismatches)
+            allure.attach(report, f"Расхождения: {name}", allure.attachment_type.TEXT)
+            raise AssertionError(f'Коллекция "{name}" не соответствует ожидаемой.\n{report}')
@@ -1,28 +1,18 @@
-import allure
-
 from clients.error_schema import InternalErrorResponseSchema, ValidationErrorResponseSchema, ValidationErrorSchema
-from tools.assertions.base_assertions import assert_length, assert_value
+from tools.allure.steps import step
+from tools.assertions.base_assertions import assert_value
+from tools.assertions.diff import assert_collection
 from tools.logger import get_logger
 
 logger = get_logger("ERRORS_ASSERTIONS")
 
-@allure.step("Проверка ошибки валидации")
-def assert_validation_error(actual: ValidationErrorSchema, expected: ValidationErrorSchema):
+def validation_error_key(error: ValidationErrorSchema) -> tuple:
     """
-    Проверяет, что объект ошибки валидации соответствует ожидаемому значению.
-
-    :param actual: Фактическая ошибка.
-    :param expected: Ожидаемая ошибка.
-    :raises AssertionError: Если значения полей не совпадают.
+    Ключ ошибки валидации для сопоставления ошибок в списке: место и тип ошибки.
     """
-    logger.info("Проверка ошибки валидации")
-    assert_value(actual.type, expected.type, "type")
-    assert_value(actual.input, expected.input, "input")
-    assert_value(actual.context, expected.context, "context")
-    assert_value(actual.message, expected.message, "message")
-    assert_value(actual.location, expected.location, "location")
+    return tuple(error.location), error.type
 
-@allure.step("Проверка ответа с ошибкой валидации")
+@step("Проверка ответа с ошибкой валидации")
 def assert_validation_error_response(
         actual: ValidationErrorResponseSchema,
         expected: ValidationErrorResponseSchema
@@ -36,12 +26,10 @@ def assert_validation_error_response(
     :raises AssertionError: Если значения полей не совпадают.
     """
     logger.info("Проверка ответа с ошибкой валидации")
-    assert_length(actual.details, expected.details, "details")
-
-    for index, detail in enumerate(expected.details): # цикл сравнивает ожидаемые и актуальные ошибки в ValidationErrorResponseSchema
-        assert_validation_error(actual.details[index], detail)
+    # ошибки сопоставляются по месту и типу ошибки, порядок в ответе не учитывается
+    assert_collection(actual.details, expected.details, "details", key=validation_error_key)
 
-@allure.step("Проверка ответа с ошибкой internal error")
+@step("Проверка ответа с ошибкой internal error")
 def assert_internal_error_response(
         actual: InternalErrorResponseSchema,
         expected: InternalErrorResponseSchema
@@ -1,4 +1,4 @@
-import allure
+from operator import attrgetter
 
 from clients.error_schema import InternalErrorResponseSchema
 from clients.exercises.exercises_schema import (
@@ -10,13 +10,15 @@ from clients.exercises.exercises_schema import (
     UpdateExerciseRequestSchema,
     UpdateExerciseResponseSchema,
 )
+from tools.allure.steps import step
 from tools.assertions.errors import assert_internal_error_response
-from tools.assertions.base_assertions import assert_is_true, assert_value
+from tools.assertions.base_assertions import assert_is_true
+from tools.assertions.diff import assert_collection, assert_no_diff
 from tools.logger import get_logger
 
 logger = get_logger("EXERCISES_ASSERTIONS")
 
-@allure.step("Проверка ответа на запрос создания упражнения")
+@step("Проверка ответа на запрос создания упражнения")
 def assert_create_exercise_response(response: CreateExerciseResponseSchema, request: CreateExerciseRequestSchema):
     """
     Проверяет, что ответ на создание упражнения соответствует запросу
@@ -27,15 +29,9 @@ def assert_create_exercise_response(response: CreateExerciseResponseSchema, requ
     """
     logger.info("Проверка ответа на запрос создания упражнения")
     assert_is_true(response.exercise.id, "id")
-    assert_value(response.exercise.title, request.title, "title")
-    assert_value(response.exercise.course_id, request.course_id, "course_id")
-    assert_value(response.exercise.max_score, request.max_score, "max_score")
-    assert_value(response.exercise.min_score, request.min_score, "min_score")
-    assert_value(response.exercise.order_index, request.order_index, "order_index")
-    assert_value(response.exercise.description, request.description, "description")
-    assert_value(response.exercise.estimated_time, request.estimated_time, "estimated_time")
+    assert_no_diff(response.exercise, request, "exercise")
 
-@allure.step("Проверка упражнения")
+@step("Проверка упражнения")
 def assert_exercise(actual: ExerciseSchema, expected: ExerciseSchema):
     """
     Проверяет, что фактические данные упражнения соответствуют ожидаемым
@@ -45,16 +41,9 @@ def assert_exercise(actual: ExerciseSchema, expected: ExerciseSchema):
     :return AssertionError: Если данные не совпадают
     """
     logger.info("Проверка упражнения")
-    assert_value(actual.id, expected.id, "id")
-    assert_value(actual.title, expected.title, "title")
-    assert_value(actual.course_id, expected.course_id, "course_id")
-    assert_value(actual.max_score, expected.max_score, "max_score")
-    assert_value(actual.min_score, expected.min_score, "min_score")
-    assert_value(actual.order_index, expected.order_index, "order_index")
-    assert_value(actual.description, expected.description, "description")
-    assert_value(actual.estimated_time, expected.estimated_time, "estimated_time")
+    assert_no_diff(actual, expected, "exercise")
 
-@allure.step("Проверка ответа на запрос упражнения")
+@step("Проверка ответа на запрос упражнения")
 def assert_get_exercise_response(actual: GetExerciseResponseSchema, expected: CreateExerciseResponseSchema):
     """
     Проверяет соответствие ответа на получение упражнения и ответа на создание упражнения
@@ -66,7 +55,7 @@ def assert_get_exercise_response(actual: GetExerciseResponseSchema, expected: Cr
     logger.info("Проверка ответа на запрос упражнения")
     assert_exercise(actual.exercise, expected.exercise)
 
-@allure.step("Проверка ответа на запрос обновления упражнения")
+@step("Проверка ответа на запрос обновления упражнения")
 def assert_update_exercise_response(response: UpdateExerciseResponseSchema, request: UpdateExerciseRequestSchema):
     """
     Проверяет соответствие запроса и ответа на обновление упражнения
@@ -77,15 +66,10 @@ def assert_update_exercise_response(response: UpdateExerciseResponseSchema, requ
     """
     logger.info("Проверка ответа на запрос обновления упражнения")
     assert_is_true(response.exercise.id, "id")
-    assert_value(response.exercise.title, request.title, "title")
     assert_is_true(response.exercise.course_id, "course_id")
-    assert_value(response.exercise.max_score, request.max_score, "max_score")
-    assert_value(response.exercise.min_score, request.min_score, "min_score")
-    assert_value(response.exercise.order_index, request.order_index, "order_index")
-    assert_value(response.exercise.description, request.description, "description")
-    assert_value(response.exercise.estimated_time, request.estimated_time, "estimated_time")
+    assert_no_diff(response.exercise, request, "exercise")
 
-@allure.step("Проверка ответа на запрос ненайденного упражнения")
+@step("Проверка ответа на запрос ненайденного упражнения")
 def assert_exercise_not_found_response(actual: InternalErrorResponseSchema):
     """
     Функция для проверки ошибки, если упражнение не найдено на сервере.
@@ -97,20 +81,26 @@ def assert_exercise_not_found_response(actual: InternalErrorResponseSchema):
     expected = InternalErrorResponseSchema(details="Exercise not found")
     assert_internal_error_response(actual, expected)
 
-@allure.step("Проверка ответа на запрос списка упражнений")
+@step("Проверка ответа на запрос списка упражнений")
 def assert_get_exercises_response(
         get_exercises_response: GetExercisesResponseSchema,
-        create_exercises_response: list[CreateExerciseResponseSchema]
+        create_exercises_response: list[CreateExerciseResponseSchema],
+        check_order: bool = False
 ):
     """
-    Проверяет, что ответ на получение упражнений соответствует списку созданных упражнений
+    Проверяет, что ответ на получение упражнений соответствует списку созданных упражнений.
+    Упражнения сопоставляются по id без учета порядка.
 
     :param get_exercises_response: Схема ответа на получение упражнений
     :param create_exercises_response: Схема ответа на создание упражнений
-    :raises AssertionError: Если хотя бы одно поле не совпадает
+    :param check_order: Проверять, что упражнения в ответе упорядочены по order_index
+    :raises AssertionError: Если упражнения отсутствуют, лишние или хотя бы одно поле не совпадает
     """
     logger.info("Проверка ответа на запрос списка упражнений")
-    assert_value(len(get_exercises_response.exercises), len(create_exercises_response), "courses")
-
-    for index, create_course_response in enumerate(create_exercises_response):
-        assert_exercise(get_exercises_response.exercises[index], create_course_response.exercise)
\ No newline at end of file
+    assert_collection(
+        get_exercises_response.exercises,
+        [create_exercise_response.exercise for create_exercise_response in create_exercises_response],
+        "exercises",
+        key=attrgetter("id"),
+        order_by=attrgetter("order_index") if check_order else None
+    )
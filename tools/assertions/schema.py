@@ -1,14 +1,16 @@
 from typing import Any
 
-import allure
 from jsonschema import validate
 from jsonschema.validators import Draft202012Validator
 
+from tools.allure.steps import step
 from tools.logger import get_logger
+from tools.metrics import count_assertion
 
 logger = get_logger("SCHEMA_ASSERTIONS")
 
-@allure.step("Валидация JSON схемы")
+@count_assertion
+@step("Валидация JSON схемы")
 def validate_json_schema(instance: Any, schema: dict) -> None:
     """
     Проверяет, соответствует ли JSON-объект (instance) заданной JSON-схеме (schema).
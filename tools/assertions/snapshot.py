@@ -0,0 +1,198 @@
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterable
+
+import allure
+from httpx import Response
+from pydantic import BaseModel
+
+from tools.allure.steps import dynamic_step
+from tools.assertions.diff import diff_values, format_mismatches
+from tools.logger import get_logger
+from tools.metrics import count_assertion
+
+logger = get_logger("SNAPSHOT_ASSERTIONS")
+
+_MISSING = object()  # маркер отсутствующего снимка
+
+# Значения, которые меняются от прогона к прогону. Они заменяются на пронумерованные заглушки:
+# одинаковые значения получают одну и ту же заглушку, поэтому связи между полями остаются в снимке
+VOLATILE_PATTERNS = {
+    "uuid": re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$"),
+    "datetime": re.compile(r"^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}:?\d{2})?$"),
+    "url": re.compile(r"^https?://"),
+    "email": re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$"),
+}
+
+
+def to_jsonable(value: Response | BaseModel | Any) -> Any:
+    """
+    Приводит ответ или модель к JSON-совместимому значению. Модели выгружаются по алиасам, как в API.
+    """
+    if isinstance(value, Response):
+        return value.json()
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    return value
+
+
+class Normalizer:
+    """
+    Нормализует JSON значение для снимка: заменяет изменчивые значения на заглушки вида <uuid:1>,
+    а значения по путям `mask` - на <masked>. Ключи словарей обходятся по порядку сортировки,
+    поэтому нумерация заглушек не зависит от порядка полей в ответе.
+    """
+    def __init__(self, mask: Iterable[str] = ()):
+        """
+        :param mask: Пути значений, которые не сравниваются, например "user.firstName" или "courses[*].title".
+        """
+        self.mask = set(mask)
+        self._placeholders: dict[tuple[str, str], str] = {}
+        self._counters: dict[str, int] = {}
+
+    def _placeholder(self, kind: str, value: str) -> str:
+        placeholder = self._placeholders.get((kind, value))
+        if placeholder is None:
+            self._counters[kind] = self._counters.get(kind, 0) + 1
+            placeholder = self._placeholders[(kind, value)] = f"<{kind}:{self._counters[kind]}>"
+        return placeholder
+
+    def normalize(self, value: Any, path: str = "", pattern: str = "") -> Any:
+        """
+        :param path: Путь к значению, например courses[0].title.
+        :param pattern: Тот же путь с [*] вместо индексов, например courses[*].title.
+        """
+        if path in self.mask or pattern in self.mask:
+            return "<masked>"
+
+        if isinstance(value, dict):
+            return {
+                key: self.normalize(
+                    value[key],
+                    f"{path}.{key}" if path else key,
+                    f"{pattern}.{key}" if pattern else key
+                )
+                for key in sorted(value)
+            }
+        if isinstance(value, list):
+            return [self.normalize(item, f"{path}[{index}]", f"{pattern}[*]") for index, item in enumerate(value)]
+        if isinstance(value, str):
+            for kind, regex in VOLATILE_PATTERNS.items():
+                if regex.match(value):
+                    return self._placeholder(kind, value)
+        return value
+
+
+def canonical_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+
+
+def snapshot_file(test_path: Path) -> Path:
+    """
+    Файл снимков модуля тестов: tests/users/test_users.py -> tests/users/__snapshots__/test_users.json
+    """
+    return test_path.parent / "__snapshots__" / f"{test_path.stem}.json"
+
+
+class SnapshotStore:
+    """
+    Снимки ответов, по одному файлу на модуль тестов. Файлы читаются при первом обращении,
+    а новые и измененные снимки записываются один раз в конце сессии.
+    """
+    def __init__(self):
+        self.update = False
+        self._test_path: Path | None = None
+        self._test_name = ""
+        self._test_keys: dict[str, int] = {}
+        self._files: dict[Path, dict[str, Any]] = {}
+        self.updated: dict[str, dict[str, Any]] = {}  # путь файла -> {ключ снимка: значение}
+
+    def start_test(self, test_path: Path, test_name: str):
+        """
+        :param test_path: Файл модуля теста.
+        :param test_name: Имя теста без пути к файлу, например TestUser::test_create_user[mail.ru].
+        """
+        self._test_path = test_path
+        self._test_name = test_name
+        self._test_keys = {}
+
+    def next_key(self, name: str | None = None) -> str:
+        """
+        Ключ следующего снимка теста. Снимки без имени нумеруются по порядку: test, test#2, test#3...
+        """
+        if self._test_path is None:
+            raise RuntimeError("Снимки доступны только внутри теста: подключите плагин fixtures.snapshots")
+
+        key = f"{self._test_name}:{name}" if name else self._test_name
+        count = self._test_keys[key] = self._test_keys.get(key, 0) + 1
+        return key if count == 1 else f"{key}#{count}"
+
+    def _entries(self, file: Path) -> dict[str, Any]:
+        entries = self._files.get(file)
+        if entries is None:
+            entries = self._files[file] = json.loads(file.read_text(encoding="utf-8")) if file.exists() else {}
+        return entries
+
+    def read(self, key: str) -> Any:
+        return self._entries(snapshot_file(self._test_path)).get(key, _MISSING)
+
+    def write(self, key: str, value: Any):
+        file = snapshot_file(self._test_path)
+        self._entries(file)[key] = value
+        self.updated.setdefault(str(file), {})[key] = value
+
+    def merge(self, updated: dict[str, dict[str, Any]]):
+        for file, entries in updated.items():
+            self.updated.setdefault(file, {}).update(entries)
+
+    def save(self):
+        """
+        Дописывает обновленные снимки в файлы. Каждый снимок занимает одну строку,
+        поэтому изменения снимков хорошо читаются в diff системы контроля версий.
+        """
+        for file, updated in self.updated.items():
+            path = Path(file)
+            entries = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+            entries.update(updated)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            lines = [f"{json.dumps(key, ensure_ascii=False)}: {canonical_json(value)}" for key, value in sorted(entries.items())]
+            path.write_text("{\n" + ",\n".join(lines) + "\n}\n", encoding="utf-8")
+        self.updated.clear()
+
+
+snapshots = SnapshotStore()
+
+
+@count_assertion
+def assert_snapshot(actual: Response | BaseModel | Any, name: str | None = None, mask: Iterable[str] = ()):
+    """
+    Сравнивает нормализованный ответ или модель с сохраненным снимком одним шагом Allure.
+    Одно сравнение заменяет серию `assert_value` по всем полям ответа.
+
+    Изменчивые значения (UUID, даты, URL, email) заменяются на заглушки, см. `Normalizer`.
+    Данные Fake меняются от прогона к прогону, если не задан --data-seed: такие поля нужно передать в `mask`.
+    При запуске с --snapshot-update снимок перезаписывается вместо сравнения.
+
+    :param actual: Ответ сервера, модель или JSON-совместимое значение.
+    :param name: Имя снимка, если в тесте их несколько.
+    :param mask: Пути значений, которые не сравниваются, например "user.firstName" или "courses[*].title".
+    :raises AssertionError: Если снимка нет или он не совпадает с фактическим значением.
+    """
+    key = snapshots.next_key(name)
+    with dynamic_step("assert_snapshot", lambda: f"Сравнение со снимком {key}"):
+        logger.info(f'Сравнение со снимком "{key}"')
+        normalized = Normalizer(mask).normalize(to_jsonable(actual))
+
+        if snapshots.update:
+            snapshots.write(key, normalized)
+            return
+
+        expected = snapshots.read(key)
+        if expected is _MISSING:
+            raise AssertionError(f'Снимок "{key}" не найден. Запустите тест с --snapshot-update, чтобы сохранить его')
+
+        if normalized != expected:
+            report = format_mismatches(diff_values(normalized, expected))
+            allure.attach(report, f"Расхождения со снимком: {key}", allure.attachment_type.TEXT)
+            raise AssertionError(f'Ответ не соответствует снимку "{key}".\n{report}')
@@ -1,17 +1,16 @@
-import allure
-
 from clients.users.users_schema import (
     CreateUserRequestSchema,
     CreateUserResponseSchema,
     GetUserResponseSchema,
     UserSchema,
 )
-from tools.assertions.base_assertions import assert_value
+from tools.allure.steps import step
+from tools.assertions.diff import assert_no_diff
 from tools.logger import get_logger
 
 logger = get_logger("USERS_ASSERTIONS")
 
-@allure.step("Проверка ответа на запрос создания пользователя")
+@step("Проверка ответа на запрос создания пользователя")
 def assert_create_user_response(request: CreateUserRequestSchema, response: CreateUserResponseSchema):
     """
     Проверяет, что ответ на создание пользователя соответствует запросу.
@@ -21,12 +20,9 @@ def assert_create_user_response(request: CreateUserRequestSchema, response: Crea
     :raises AssertionError: Если хотя бы одно поле не совпадает.
     """
     logger.info("Проверка ответа на запрос создания пользователя")
-    assert_value(response.user.email, request.email, "email")
-    assert_value(response.user.last_name, request.last_name, "last_name")
-    assert_value(response.user.first_name, request.first_name, "first_name")
-    assert_value(response.user.middle_name, request.middle_name, "middle_name")
+    assert_no_diff(response.user, request, "user")
 
-@allure.step("Проверка пользователя")
+@step("Проверка пользователя")
 def assert_user(actual: UserSchema, expected: UserSchema):
     """
     Проверяет, что ответ на получение пользователя соответствует ответу на создание пользователя.
@@ -35,13 +31,9 @@ def assert_user(actual: UserSchema, expected: UserSchema):
     :param expected: Схема ответа на получение пользователя
     """
     logger.info("Проверка пользователя")
-    assert_value(expected.id, actual.id, "id")
-    assert_value(expected.email, actual.email, "email")
-    assert_value(expected.last_name, actual.last_name, "last_name")
-    assert_value(expected.first_name, actual.first_name, "first_name")
-    assert_value(expected.middle_name, actual.middle_name, "middle_name")
+    assert_no_diff(actual, expected, "user")
 
-@allure.step("Проверка ответа на запрос пользователя")
+@step("Проверка ответа на запрос пользователя")
 def assert_get_user_response(create_user_response: CreateUserResponseSchema,
                              get_user_response: GetUserResponseSchema):
     """
@@ -0,0 +1,144 @@
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+# Код, который импортирует conftest.py и все подключаемые им плагины с фикстурами,
+# то есть ровно то, что pytest загружает при старте сбора тестов и в каждом xdist воркере.
+# pytest импортируется заранее: замеряется только то, что conftest добавляет к голому `import pytest`
+IMPORT_CONFTEST = (
+    "import pytest\n"
+    "import importlib, conftest\n"
+    "for module in conftest.pytest_plugins:\n"
+    "    importlib.import_module(module)\n"
+)
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    level: int
+
+
+def measure_import_time(cwd: Path | None = None) -> list[ImportTiming]:
+    """
+    Запускает отдельный интерпретатор с `-X importtime` и разбирает его вывод.
+
+    :param cwd: Каталог проекта, по умолчанию - текущий.
+    :return: Список замеров импорта по модулям.
+    """
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", IMPORT_CONFTEST],
+        capture_output=True,
+        text=True,
+        check=True,
+        cwd=cwd
+    )
+    timings: list[ImportTiming] = []
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line.split(":", 1)[1].split("|")
+        stripped = name.lstrip(" ")
+        timings.append(
+            ImportTiming(
+                module=stripped,
+                self_us=int(self_us),
+                cumulative_us=int(cumulative_us),
+                level=(len(name) - len(stripped) - 1) // 2
+            )
+        )
+    return timings
+
+
+def conftest_timings(timings: list[ImportTiming]) -> list[ImportTiming]:
+    """
+    Замеры модулей, импортированных conftest.py и плагинами. Модули, импортированные до conftest,
+    относятся к старту интерпретатора и pytest.
+    """
+    start = next(index for index, timing in enumerate(timings) if timing.module == "conftest" and timing.level == 0)
+    return timings[start:]
+
+
+def conftest_import_ms(timings: list[ImportTiming]) -> float:
+    """
+    Время импорта conftest.py и плагинов сверх `import pytest`, мс.
+    """
+    return sum(timing.cumulative_us for timing in conftest_timings(timings) if timing.level == 0) / 1000
+
+
+@contextmanager
+def git_worktree(ref: str) -> Iterator[Path]:
+    """
+    Временная рабочая копия коммита `ref` для замера базовой версии.
+    """
+    with tempfile.TemporaryDirectory(prefix="import-time-") as directory:
+        path = Path(directory) / "baseline"
+        subprocess.run(["git", "worktree", "add", "--detach", str(path), ref], capture_output=True, check=True)
+        try:
+            yield path
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", str(path)], capture_output=True)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Проверка времени импорта conftest.py")
+    parser.add_argument("--runs", type=int, default=7, help="Число замеров: сравниваются медианы")
+    parser.add_argument("--baseline", default=None, help="Git ref базовой версии, например origin/main")
+    parser.add_argument(
+        "--max-regression-ms",
+        type=float,
+        default=50,
+        help="Допустимый рост медианы относительно базовой версии, мс"
+    )
+    parser.add_argument("--top", type=int, default=15, help="Сколько самых тяжелых модулей вывести")
+    args = parser.parse_args()
+
+    current: list[float] = []
+    baseline: list[float] = []
+    with git_worktree(args.baseline) if args.baseline else nullcontext() as baseline_path:
+        # Байт-код компилируется заранее: при PYTHONDONTWRITEBYTECODE свежая рабочая копия компилировала бы
+        # модули при каждом замере. Первый импорт прогревает файловый кеш и не учитывается
+        for path in (Path.cwd(), baseline_path):
+            if path is not None:
+                subprocess.run([sys.executable, "-m", "compileall", "-q", str(path)], capture_output=True)
+                measure_import_time(path)
+        # Замеры чередуются, чтобы фоновая нагрузка машины одинаково влияла на обе версии
+        for _ in range(args.runs):
+            timings = measure_import_time()
+            current.append(conftest_import_ms(timings))
+            if baseline_path is not None:
+                baseline.append(conftest_import_ms(measure_import_time(baseline_path)))
+
+    median = statistics.median(current)
+    print(
+        f"Время импорта conftest.py сверх import pytest: медиана {median:.1f} мс, "
+        f"минимум {min(current):.1f} мс ({args.runs} замеров)"
+    )
+    for timing in sorted(conftest_timings(timings), key=lambda item: item.cumulative_us, reverse=True)[:args.top]:
+        print(f"{timing.cumulative_us / 1000:10.1f} мс  {timing.module}")
+
+    if not baseline:
+        return 0
+
+    baseline_median = statistics.median(baseline)
+    difference = median - baseline_median
+    print(
+        f"Базовая версия {args.baseline}: медиана {baseline_median:.1f} мс, минимум {min(baseline):.1f} мс. "
+        f"Разница {difference:+.1f} мс ({difference / baseline_median:+.1%})"
+    )
+    if difference > args.max_regression_ms:
+        print(f"Время импорта выросло больше чем на {args.max_regression_ms:.0f} мс")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
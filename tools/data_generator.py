@@ -1,31 +1,205 @@
-from faker import Faker
+import hashlib
+import itertools
+import os
+import secrets
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+# Переменная окружения с идентификатором прогона. Контроллер xdist задает ее до запуска воркеров,
+# поэтому у всех воркеров прогона общий идентификатор
+RUN_ID_ENV = "TEST_RUN_ID"
+# Переменная окружения с сидом прогона, из которого выводятся сиды тестов
+RUN_SEED_ENV = "TEST_RUN_SEED"
+
+# Пространство имен для UUID, построенных из уникальных значений
+UNIQUE_NAMESPACE = uuid.UUID("3b8c2f4e-6a1d-4c1b-9f52-0d6e7a9c1e21")
+
+_RUN_ID_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+def generate_run_id() -> str:
+    return "".join(secrets.choice(_RUN_ID_ALPHABET) for _ in range(6))
+
+
+def get_run_id() -> str:
+    """
+    Идентификатор текущего прогона. Если он не задан в окружении, генерируется и сохраняется в окружение.
+    """
+    return os.environ.setdefault(RUN_ID_ENV, generate_run_id())
+
+
+def get_run_seed() -> int:
+    """
+    Сид текущего прогона. Если он не задан в окружении, генерируется и сохраняется в окружение.
+    """
+    return int(os.environ.setdefault(RUN_SEED_ENV, str(secrets.randbelow(2 ** 32))))
+
+
+def derive_seed(key: str, run_seed: int) -> int:
+    """
+    Сид для ключа, например node id теста. Зависит только от ключа и сида прогона,
+    поэтому не меняется от порядка тестов, фильтра -k и распределения по воркерам.
+    """
+    digest = hashlib.sha256(f"{run_seed}:{key}".encode()).digest()
+    return int.from_bytes(digest[:8], "big")
+
+
+def seed_tag(seed: int) -> str:
+    """
+    Короткая метка сида для уникальных значений: 8 символов base36.
+    """
+    value = seed % len(_RUN_ID_ALPHABET) ** 8
+    chars = []
+    for _ in range(8):
+        value, index = divmod(value, len(_RUN_ID_ALPHABET))
+        chars.append(_RUN_ID_ALPHABET[index])
+    return "".join(reversed(chars))
+
+
+def get_worker_id() -> str:
+    """
+    Идентификатор xdist воркера (gw0, gw1, ...) или main, если тесты выполняются без xdist.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "main")
+
+
+class UniqueSequence:
+    """
+    Генератор уникальных значений без координации между процессами и без повторных попыток.
+
+    Пространство значений делится на непересекающиеся части: по прогону (run id) и по xdist воркеру,
+    а внутри части значения нумеруются монотонным счетчиком. Поэтому значения разных воркеров и разных
+    прогонов не совпадают, а при тех же run id и воркере последовательность повторяется.
+
+    Внутри `scoped(seed)` (тест или виртуальный пользователь) значения нумеруются заново под меткой сида:
+    они зависят только от префикса и сида, а не от того, какие тесты воркер выполнил раньше.
+    """
+    def __init__(self, run_id: str | None = None, worker_id: str | None = None):
+        self._run_id = run_id
+        self._worker_id = worker_id
+        self._counter = itertools.count(1)
+
+    @property
+    def prefix(self) -> str:
+        """
+        Префикс части пространства, например "k3f9a2w1" для воркера gw1 и "k3f9a2m" без xdist.
+        """
+        run_id = self._run_id or get_run_id()
+        worker_id = self._worker_id or get_worker_id()
+        worker = "m" if worker_id == "main" else f"w{worker_id.removeprefix('gw')}"
+        return f"{run_id}{worker}"
+
+    def next(self) -> str:
+        # next() у itertools.count атомарен, поэтому генератор можно вызывать из потоков SetupGraph
+        if (scope := _unique_scope.get()) is not None:
+            tag, counter = scope
+            return f"{self.prefix}-{tag}-{next(counter)}"
+        return f"{self.prefix}-{next(self._counter)}"
+
+    @contextmanager
+    def scoped(self, seed: int) -> Iterator[None]:
+        """
+        Нумерует значения внутри блока отдельно, под меткой сида, например "k3f9a2w1-0a8k2m1x-1".
+        Сиды разных тестов различаются, поэтому значения разных блоков не совпадают.
+        """
+        token = _unique_scope.set((seed_tag(seed), itertools.count(1)))
+        try:
+            yield
+        finally:
+            _unique_scope.reset(token)
+
+    def reset(self):
+        self._counter = itertools.count(1)
+
+
+# Метка сида и счетчик уникальных значений текущего блока `UniqueSequence.scoped`
+_unique_scope: ContextVar[tuple[str, itertools.count] | None] = ContextVar("unique_scope", default=None)
+
+unique = UniqueSequence()
+
+# Экземпляр Faker с собственным сидом для текущего теста или виртуального пользователя
+_seeded_faker: ContextVar["Faker | None"] = ContextVar("seeded_faker", default=None)
 
 
 class Fake:
     """
     Класс с функциями генерации тестовых данных
     """
-    def __init__(self, faker: Faker):
-        self.faker = faker
+    def __init__(self, faker: "Faker | None" = None, sequence: UniqueSequence = unique):
+        self._faker = faker
+        self.sequence = sequence
+
+    @property
+    def faker(self) -> "Faker":
+        """
+        Экземпляр Faker создается при первой генерации данных:
+        импорт faker и сборка провайдеров локали занимают заметное время.
+        Внутри `seeded` используется экземпляр с заданным сидом.
+        """
+        if (seeded := _seeded_faker.get()) is not None:
+            return seeded
+        if self._faker is None:
+            from faker import Faker
+
+            self._faker = Faker()
+        return self._faker
+
+    @contextmanager
+    def seeded(self, seed: int) -> Iterator["Faker"]:
+        """
+        Генерирует данные внутри блока из отдельного экземпляра Faker с заданным сидом:
+        при том же сиде получается та же последовательность данных.
+
+        Уникальные значения (`unique`, `email`, `uuid`) нумеруются внутри блока под меткой сида
+        (см. `UniqueSequence.scoped`): при повторе отличается только префикс прогона, поэтому
+        повтор на том же стенде не упирается в уже созданные записи.
+        Потоки SetupGraph делят экземпляр блока, поэтому порядок данных в параллельной подготовке не фиксирован.
+
+        :param seed: Сид, например derive_seed(node id теста, сид прогона).
+        """
+        from faker import Faker
+
+        faker = Faker()
+        faker.seed_instance(seed)
+        token = _seeded_faker.set(faker)
+        try:
+            with self.sequence.scoped(seed):
+                yield faker
+        finally:
+            _seeded_faker.reset(token)
 
     def description(self) -> str:
         return self.faker.text()
 
     def email(self, domain: str | None = None) -> str:
         """
-        Генерирует случайный email.
+        Генерирует email, уникальный в пределах прогона и между прогонами.
 
         :param domain: Домен электронной почты (например, "example.com").
         Если не указан, будет использован случайный домен.
-        :return: Случайный email.
+        :return: Уникальный email.
         """
-        return self.faker.email(domain=domain)
+        return f"{self.faker.user_name()}.{self.unique()}@{domain or self.faker.free_email_domain()}"
+
+    def unique(self) -> str:
+        """
+        Уникальное значение из UniqueSequence, например "k3f9a2w1-17".
+        """
+        return self.sequence.next()
 
     def password(self) -> str:
         return self.faker.password()
 
     def uuid(self) -> str:
-        return self.faker.uuid4()
+        """
+        UUID, построенный из уникального значения: не совпадает с UUID других воркеров и прогонов.
+        """
+        return str(uuid.uuid5(UNIQUE_NAMESPACE, self.unique()))
 
     def sentence(self) -> str:
         return self.faker.sentence()
@@ -51,4 +225,4 @@ class Fake:
     def min_score(self) -> int:
         return self.integer(start=1, end=49)
 
-fake = Fake(faker=Faker())
+fake = Fake()
@@ -0,0 +1,105 @@
+import sqlite3
+import time
+from pathlib import Path
+
+
+class DurationHistory:
+    """
+    Локальная история длительностей тестов и фикстур в SQLite
+    """
+    def __init__(self, path: str | Path, last_runs: int = 10):
+        """
+        :param path: Путь к файлу базы данных.
+        :param last_runs: Сколько последних замеров теста учитывать при оценке длительности.
+        """
+        self.last_runs = last_runs
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS test_durations (
+                node_id TEXT NOT NULL,
+                duration REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS fixture_durations (
+                node_id TEXT NOT NULL,
+                fixture TEXT NOT NULL,
+                scope TEXT NOT NULL,
+                duration REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS test_durations_node_id ON test_durations (node_id);
+            CREATE INDEX IF NOT EXISTS fixture_durations_node_id ON fixture_durations (node_id);
+            """
+        )
+
+    def record(self, node_id: str, duration: float, fixtures: dict[str, tuple[str, float]]):
+        """
+        Записывает длительность теста и его фикстур. Фиксация транзакции выполняется в `close`.
+
+        :param node_id: Идентификатор теста.
+        :param duration: Суммарная длительность setup, call и teardown.
+        :param fixtures: Словарь "фикстура -> (scope, длительность setup)" по всем фикстурам теста.
+            Для фикстур, взятых из кеша, длительность равна 0.
+        """
+        recorded_at = time.time()
+        self.connection.execute(
+            "INSERT INTO test_durations VALUES (?, ?, ?)",
+            (node_id, duration, recorded_at)
+        )
+        self.connection.executemany(
+            "INSERT INTO fixture_durations VALUES (?, ?, ?, ?, ?)",
+            [(node_id, name, scope, value, recorded_at) for name, (scope, value) in fixtures.items()]
+        )
+
+    def test_estimates(self) -> dict[str, float]:
+        """
+        Оценивает длительность каждого теста как среднее по последним `last_runs` замерам.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT node_id, AVG(duration) FROM (
+                SELECT node_id, duration,
+                       ROW_NUMBER() OVER (PARTITION BY node_id ORDER BY recorded_at DESC) AS run
+                FROM test_durations
+            )
+            WHERE run <= ?
+            GROUP BY node_id
+            """,
+            (self.last_runs,)
+        )
+        return dict(rows.fetchall())
+
+    def shared_fixture_groups(self, threshold: float) -> dict[str, str]:
+        """
+        Находит для тестов самую дорогую общую фикстуру уровня class/module/package.
+        Тесты с одной и той же такой фикстурой выгодно выполнять на одном воркере.
+        Фикстуры уровня session не учитываются: они все равно выполняются один раз на каждом воркере.
+
+        Длительность фикстуры оценивается по максимальному замеру: в остальных тестах она берется из кеша.
+
+        :param threshold: Минимальная длительность setup фикстуры в секундах.
+        :return: Словарь "тест -> имя дорогой фикстуры".
+        """
+        rows = self.connection.execute(
+            """
+            WITH expensive AS (
+                SELECT fixture, MAX(duration) AS cost
+                FROM fixture_durations
+                WHERE scope IN ('class', 'module', 'package')
+                GROUP BY fixture
+                HAVING MAX(duration) >= ?
+            )
+            SELECT usage.node_id, usage.fixture
+            FROM (SELECT DISTINCT node_id, fixture FROM fixture_durations) AS usage
+            JOIN expensive ON expensive.fixture = usage.fixture
+            ORDER BY expensive.cost
+            """,
+            (threshold,)
+        )
+        # Строки отсортированы по возрастанию стоимости, поэтому самая дорогая фикстура записывается последней
+        return dict(rows.fetchall())
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
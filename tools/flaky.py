@@ -0,0 +1,99 @@
+import sqlite3
+import time
+from pathlib import Path
+
+from pydantic import BaseModel
+
+
+class FlakyScore(BaseModel):
+    """
+    Оценка нестабильности теста по последним попыткам его выполнения
+    """
+    node_id: str
+    attempts: int
+    failures: int
+    flips: int  # сколько раз результат попытки отличался от предыдущей
+    score: float  # flips / (attempts - 1): 0 - стабильный тест, 1 - результат меняется каждый раз
+    rerun_duration: float  # суммарное время перезапусков среди этих попыток, с
+
+
+class FlakyHistory:
+    """
+    Локальная история результатов попыток выполнения тестов в SQLite.
+
+    Попыткой считается каждое выполнение теста, включая перезапуски pytest-rerunfailures.
+    Тест, который всегда падает, так же стабилен, как тест, который всегда проходит:
+    нестабильность - это смена результата между попытками.
+    """
+    def __init__(self, path: str | Path, last_attempts: int = 20):
+        """
+        :param path: Путь к файлу базы данных.
+        :param last_attempts: Сколько последних попыток теста учитывать при оценке.
+        """
+        self.last_attempts = last_attempts
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS test_attempts (
+                node_id TEXT NOT NULL,
+                rerun INTEGER NOT NULL,
+                passed INTEGER NOT NULL,
+                duration REAL NOT NULL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS test_attempts_node_id ON test_attempts (node_id);
+            """
+        )
+
+    def record(self, node_id: str, rerun: int, passed: bool, duration: float):
+        """
+        Записывает результат попытки. Фиксация транзакции выполняется в `close`.
+
+        :param node_id: Идентификатор теста.
+        :param rerun: Номер перезапуска, 0 - первая попытка.
+        :param passed: Прошла ли попытка.
+        :param duration: Суммарная длительность setup, call и teardown попытки.
+        """
+        self.connection.execute(
+            "INSERT INTO test_attempts VALUES (?, ?, ?, ?, ?)",
+            (node_id, rerun, int(passed), duration, time.time())
+        )
+
+    def scores(self) -> dict[str, FlakyScore]:
+        """
+        Оценивает нестабильность каждого теста по последним `last_attempts` попыткам.
+        """
+        rows = self.connection.execute(
+            """
+            SELECT node_id, passed, rerun, duration FROM (
+                SELECT node_id, passed, rerun, duration, recorded_at,
+                       ROW_NUMBER() OVER (PARTITION BY node_id ORDER BY recorded_at DESC) AS attempt
+                FROM test_attempts
+            )
+            WHERE attempt <= ?
+            ORDER BY node_id, recorded_at
+            """,
+            (self.last_attempts,)
+        )
+        outcomes: dict[str, list[bool]] = {}
+        rerun_durations: dict[str, float] = {}
+        for node_id, passed, rerun, duration in rows.fetchall():
+            outcomes.setdefault(node_id, []).append(bool(passed))
+            rerun_durations[node_id] = rerun_durations.get(node_id, 0.0) + (duration if rerun else 0.0)
+
+        scores = {}
+        for node_id, results in outcomes.items():
+            flips = sum(previous != current for previous, current in zip(results, results[1:]))
+            scores[node_id] = FlakyScore(
+                node_id=node_id,
+                attempts=len(results),
+                failures=results.count(False),
+                flips=flips,
+                score=flips / (len(results) - 1) if len(results) > 1 else 0.0,
+                rerun_duration=rerun_durations[node_id]
+            )
+        return scores
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
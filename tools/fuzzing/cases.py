@@ -0,0 +1,122 @@
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+
+from clients.schema_registry import schema_registry
+
+# Длины заведомо слишком длинных строк
+OVERSIZED_LENGTHS = (10_000, 100_000)
+
+# Значения другого типа. Только такие, которые pydantic не приводит к типу поля даже в нестрогом режиме:
+# например, "1" для int и True для int сервер принял бы
+WRONG_TYPE_VALUES: dict[str, tuple[Any, ...]] = {
+    "string": (123, True, [], {}),
+    "integer": ("abc", 1.5, [], {}),
+    "number": ("abc", [], {}),
+    "boolean": ("abc", [], {}),
+}
+
+# Граничные значения целых чисел: ожидаемый ответ схема не задает, кейсы нужны для поиска 5xx
+INTEGER_BOUNDARIES = (0, -1, 2 ** 31, 2 ** 63)
+
+
+@dataclass
+class FuzzCase:
+    """
+    Некорректный (или граничный) вариант тела запроса
+    """
+    field: str | None  # алиас поля, None - изменено тело запроса целиком
+    mutation: str  # например missing, null, wrong_type:int, length:51
+    payload: Any
+    # True - сервер должен отклонить запрос, False - принять, None - ожидание по схеме не определено
+    expect_rejection: bool | None = True
+
+    @property
+    def name(self) -> str:
+        return f"{self.field or 'body'}: {self.mutation}"
+
+
+def _variants(property_schema: dict) -> tuple[list[dict], bool]:
+    """
+    Варианты типа свойства JSON-схемы и допускает ли свойство null (str | None -> anyOf).
+    """
+    variants = property_schema.get("anyOf", [property_schema])
+    types = [variant for variant in variants if variant.get("type") != "null"]
+    return types, len(types) != len(variants)
+
+
+def _string_cases(variant: dict) -> Iterator[tuple[str, Any, bool | None]]:
+    min_length = variant.get("minLength")
+    max_length = variant.get("maxLength")
+    if min_length:
+        yield f"length:{min_length - 1}", "a" * (min_length - 1), True
+        yield f"length:{min_length}", "a" * min_length, False
+    elif min_length is None:
+        yield "empty", "", None
+    if max_length is not None:
+        yield f"length:{max_length}", "a" * max_length, False
+        yield f"length:{max_length + 1}", "a" * (max_length + 1), True
+    for length in OVERSIZED_LENGTHS:
+        yield f"oversized:{length}", "a" * length, True if max_length is not None else None
+    if variant.get("format") == "email":
+        yield "format:email", "not-an-email", True
+
+
+def generate_cases(schema: type[BaseModel], partial: bool = False, **values: Any) -> list[FuzzCase]:
+    """
+    Строит некорректные тела запроса по JSON-схеме модели запроса: отсутствующие поля, поля под именем
+    вместо алиаса, null, значения другого типа, граничные длины constr, слишком длинные строки и граничные числа.
+
+    Каждый кейс строится из нового корректного запроса: уникальные значения (например, email) не повторяются,
+    поэтому принятые сервером кейсы не мешают друг другу.
+
+    :param schema: Схема запроса.
+    :param partial: Все поля необязательны (запросы обновления): отсутствие поля не ошибка.
+    :param values: Значения полей корректного запроса, например существующий courseId.
+    :return: Список кейсов.
+    """
+    def base() -> dict[str, Any]:
+        return schema_registry.build_request(schema, **values).model_dump(mode="json", by_alias=True)
+
+    def replaced(alias: str, value: Any) -> dict[str, Any]:
+        payload = base()
+        payload[alias] = value
+        return payload
+
+    cases = [
+        FuzzCase(None, "empty_object", {}, not partial),
+        FuzzCase(None, "null", None),
+        FuzzCase(None, "array", [base()]),
+        FuzzCase(None, "string", "payload"),
+        FuzzCase(None, "extra_field", {**base(), "unexpectedField": "value"}, None),
+    ]
+
+    names = {field.alias or name: name for name, field in schema.model_fields.items()}
+    for alias, property_schema in schema_registry.json_schema(schema).get("properties", {}).items():
+        variants, nullable = _variants(property_schema)
+
+        payload = base()
+        payload.pop(alias, None)
+        cases.append(FuzzCase(alias, "missing", payload, not partial))
+        if names.get(alias, alias) != alias:
+            payload = base()
+            payload[names[alias]] = payload.pop(alias, None)
+            cases.append(FuzzCase(alias, f"name_instead_of_alias:{names[alias]}", payload, not partial))
+
+        cases.append(FuzzCase(alias, "null", replaced(alias, None), not nullable))
+
+        types = {variant.get("type") for variant in variants}
+        for variant in variants:
+            kind = variant.get("type")
+            if kind == "string":
+                cases.extend(FuzzCase(alias, mutation, replaced(alias, value), expect) for mutation, value, expect in _string_cases(variant))
+            elif kind == "integer":
+                cases.extend(FuzzCase(alias, f"boundary:{value}", replaced(alias, value), None) for value in INTEGER_BOUNDARIES)
+
+            for value in WRONG_TYPE_VALUES.get(kind, ()):
+                # Значение другого типа может подходить другому варианту anyOf
+                if len(types) == 1:
+                    cases.append(FuzzCase(alias, f"wrong_type:{type(value).__name__}", replaced(alias, value)))
+
+    return cases
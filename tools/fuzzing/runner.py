@@ -0,0 +1,219 @@
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from httpx import Client, Response
+from pydantic import BaseModel
+
+from clients.courses.courses_client import get_private_courses_client
+from clients.courses.courses_schema import CreateCourseRequestSchema, UpdateCourseRequestSchema
+from clients.exercises.exercises_client import get_private_exercises_client
+from clients.exercises.exercises_schema import CreateExerciseRequestSchema, UpdateExerciseRequestSchema
+from clients.files.files_client import get_private_files_client
+from clients.files.files_schema import CreateFileRequestSchema
+from clients.private_builder import AuthUserSchema
+from clients.schema_registry import schema_registry
+from clients.transport import build_client
+from clients.users.public_user_client import get_public_user_client
+from clients.users.users_schema import CreateUserRequestSchema, UpdateUserRequestSchema
+from config import ReportingLevel, settings
+from tools.fuzzing.cases import FuzzCase, generate_cases
+from tools.routes import APIRoutes
+
+
+@dataclass
+class FuzzTarget:
+    """
+    Метод API, который получает некорректные тела запросов
+    """
+    method: str
+    path: str
+    route: str  # шаблон маршрута для отчета, например PATCH /api/v1/users/{user_id}
+    cases: list[FuzzCase]
+    client: Client
+
+
+@dataclass
+class FuzzResult:
+    route: str
+    case: FuzzCase
+    status: int | None
+    shape: tuple[str, ...]
+    duration: float
+    error: str | None = None
+
+    @property
+    def anomaly(self) -> str | None:
+        """
+        Причина, по которой ответ подозрителен: 5xx, принятый некорректный запрос или отклоненный корректный.
+        """
+        if self.status is None:
+            return self.error
+        if self.status >= 500:
+            return f"статус {self.status}"
+        if self.case.expect_rejection is True and self.status < 400:
+            return f"некорректный запрос принят со статусом {self.status}"
+        if self.case.expect_rejection is False and self.status >= 400:
+            return f"корректный запрос отклонен со статусом {self.status}"
+        return None
+
+
+@dataclass
+class Cluster:
+    route: str
+    status: int | None
+    shape: tuple[str, ...]
+    results: list[FuzzResult] = field(default_factory=list)
+
+
+def response_shape(response: Response) -> tuple[str, ...]:
+    """
+    Форма ответа с ошибкой валидации: отсортированные пары "место:тип" из detail, как в ValidationErrorResponseSchema.
+    Значения input, ctx и msg не учитываются: они разные у каждого кейса. Ответ разбирается без схемы,
+    потому что у части ошибок (например, missing) нет ctx.
+    """
+    try:
+        body = response.json()
+    except ValueError:
+        return ("<не JSON>",)
+
+    details = body.get("detail") if isinstance(body, dict) else None
+    if isinstance(details, str):
+        return ("<detail: строка>",)
+    if not isinstance(details, list):
+        return ()
+    return tuple(sorted({
+        f"{'.'.join(map(str, detail.get('loc', [])))}:{detail.get('type')}"
+        for detail in details if isinstance(detail, dict)
+    }))
+
+
+def send_case(target: FuzzTarget, case: FuzzCase) -> FuzzResult:
+    start = time.perf_counter()
+    try:
+        response = target.client.request(
+            target.method,
+            target.path,
+            content=json.dumps(case.payload),
+            headers={"Content-Type": "application/json"}
+        )
+    except Exception as error:
+        return FuzzResult(target.route, case, None, (), time.perf_counter() - start, f"{type(error).__name__}: {error}")
+    return FuzzResult(target.route, case, response.status_code, response_shape(response), time.perf_counter() - start)
+
+
+def run_fuzzing(targets: list[FuzzTarget], concurrency: int) -> list[FuzzResult]:
+    """
+    Отправляет все кейсы всех методов, не более `concurrency` запросов одновременно.
+    """
+    jobs = [(target, case) for target in targets for case in target.cases]
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fuzz") as executor:
+        return list(executor.map(lambda job: send_case(*job), jobs))
+
+
+def cluster_results(results: list[FuzzResult]) -> list[Cluster]:
+    """
+    Группирует ответы по маршруту, статусу и форме ошибки валидации, самые большие группы - первыми.
+    """
+    clusters: dict[tuple, Cluster] = {}
+    for result in results:
+        key = (result.route, result.status, result.shape)
+        cluster = clusters.get(key)
+        if cluster is None:
+            cluster = clusters[key] = Cluster(result.route, result.status, result.shape)
+        cluster.results.append(result)
+    return sorted(clusters.values(), key=lambda cluster: (cluster.route, -len(cluster.results)))
+
+
+def prepare_targets(select: str | None = None) -> list[FuzzTarget]:
+    """
+    Создает пользователя, файл, курс и упражнение, на которых проверяются методы создания и обновления.
+
+    :param select: Подстрока маршрута, например "courses": проверяются только подходящие методы.
+    """
+    user_request = CreateUserRequestSchema()
+    user = get_public_user_client().create_user(user_request).user
+    auth_user = AuthUserSchema(email=user_request.email, password=user_request.password)
+
+    file = get_private_files_client(auth_user).create_file(CreateFileRequestSchema()).file
+    course_values = {"previewFileId": file.id, "createdByUserId": user.id}
+    course = get_private_courses_client(auth_user).create_course(
+        schema_registry.build_request(CreateCourseRequestSchema, **course_values)
+    ).course
+    exercise = get_private_exercises_client(auth_user).create_exercise(
+        schema_registry.build_request(CreateExerciseRequestSchema, courseId=course.id)
+    ).exercise
+
+    # Запросы отправляются без BaseAPIClient: некорректные тела не проходят через модели запросов
+    public_client = build_client()
+    private_client = get_private_courses_client(auth_user).client
+
+    specs: list[tuple[str, str, str, type[BaseModel], bool, dict[str, Any], Client]] = [
+        ("POST", str(APIRoutes.USERS), str(APIRoutes.USERS), CreateUserRequestSchema, False, {}, public_client),
+        ("PATCH", f"{APIRoutes.USERS}/{user.id}", f"{APIRoutes.USERS}/{{user_id}}", UpdateUserRequestSchema, True, {}, private_client),
+        ("POST", str(APIRoutes.COURSES), str(APIRoutes.COURSES), CreateCourseRequestSchema, False, course_values, private_client),
+        ("PATCH", f"{APIRoutes.COURSES}/{course.id}", f"{APIRoutes.COURSES}/{{course_id}}", UpdateCourseRequestSchema, True, {}, private_client),
+        ("POST", str(APIRoutes.EXERCISES), str(APIRoutes.EXERCISES), CreateExerciseRequestSchema, False, {"courseId": course.id}, private_client),
+        ("PATCH", f"{APIRoutes.EXERCISES}/{exercise.id}", f"{APIRoutes.EXERCISES}/{{exercise_id}}", UpdateExerciseRequestSchema, True, {}, private_client),
+    ]
+    return [
+        FuzzTarget(method, path, f"{method} {route}", generate_cases(schema, partial, **values), client)
+        for method, path, route, schema, partial, values, client in specs
+        if select is None or select in route
+    ]
+
+
+def save_report(path: Path, clusters: list[Cluster]):
+    data = [
+        {
+            "route": cluster.route,
+            "status": cluster.status,
+            "shape": list(cluster.shape),
+            "count": len(cluster.results),
+            "cases": [result.case.name for result in cluster.results],
+            "anomalies": [
+                {"case": result.case.name, "reason": result.anomaly}
+                for result in cluster.results if result.anomaly
+            ],
+        }
+        for cluster in clusters
+    ]
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Проверка методов создания и обновления некорректными телами запросов")
+    parser.add_argument("--concurrency", type=int, default=32, help="Одновременно отправляемых запросов")
+    parser.add_argument("--select", default=None, help="Подстрока маршрута, например courses")
+    parser.add_argument("--report", type=Path, default=None, help="Файл JSON с группами ответов")
+    args = parser.parse_args()
+
+    # Шаги Allure вне тестов не нужны и только тратят время
+    settings.reporting.level = ReportingLevel.OFF
+    targets = prepare_targets(args.select)
+
+    start = time.perf_counter()
+    results = run_fuzzing(targets, args.concurrency)
+    elapsed = time.perf_counter() - start
+
+    clusters = cluster_results(results)
+    print(f"Кейсов: {len(results)} за {elapsed:.1f} с, групп ответов: {len(clusters)}")
+    for cluster in clusters:
+        shape = ", ".join(cluster.shape) or "-"
+        print(f"{cluster.route:<40} {cluster.status or 'ошибка':>6} {len(cluster.results):>5}  {shape}")
+
+    anomalies = [result for result in results if result.anomaly]
+    for result in anomalies[:20]:
+        print(f"Подозрительный ответ: {result.route} [{result.case.name}]: {result.anomaly}")
+    if args.report is not None:
+        save_report(args.report, clusters)
+    return 1 if anomalies else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
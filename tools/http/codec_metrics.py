@@ -0,0 +1,94 @@
+import json
+from pathlib import Path
+
+from httpx import RequestNotRead, Response
+from pydantic import BaseModel, Field
+
+
+class CodecStats(BaseModel):
+    """
+    Счетчики байтов одного маршрута: переданные по сети и после распаковки
+    """
+    requests: int = 0
+    request_wire_bytes: int = 0
+    request_decoded_bytes: int = 0
+    response_wire_bytes: int = 0
+    response_decoded_bytes: int = 0
+
+    def merge(self, other: "CodecStats"):
+        self.requests += other.requests
+        self.request_wire_bytes += other.request_wire_bytes
+        self.request_decoded_bytes += other.request_decoded_bytes
+        self.response_wire_bytes += other.response_wire_bytes
+        self.response_decoded_bytes += other.response_decoded_bytes
+
+    @property
+    def ratio(self) -> float:
+        """
+        Доля трафика, сэкономленная сжатием запросов и ответов.
+        """
+        decoded = self.request_decoded_bytes + self.response_decoded_bytes
+        wire = self.request_wire_bytes + self.response_wire_bytes
+        return 1 - wire / decoded if decoded else 0.0
+
+
+class CodecMetrics(BaseModel):
+    """
+    Счетчики сжатия по маршрутам вида "POST /api/v1/courses"
+    """
+    routes: dict[str, CodecStats] = Field(default_factory=dict)
+
+    def record(self, endpoint: str, response: Response):
+        """
+        Учитывает запрос и ответ. Вызывается плагином fixtures.codec_metrics, см. `clients.recorders`.
+
+        :param endpoint: Шаблон маршрута, например /api/v1/courses/{course_id}
+        :param response: Прочитанный ответ сервера.
+        """
+        request = response.request
+        route = f"{request.method} {endpoint}"
+        stats = self.routes.get(route)
+        if stats is None:
+            stats = self.routes[route] = CodecStats()
+
+        request_wire = request_decoded = int(request.headers.get("Content-Length", 0))
+        if request.headers.get("Content-Encoding") == "gzip":
+            try:
+                # Размер исходных данных хранится в последних 4 байтах gzip (ISIZE)
+                request_decoded = int.from_bytes(request.content[-4:], "little")
+            except RequestNotRead:
+                pass
+
+        stats.requests += 1
+        stats.request_wire_bytes += request_wire
+        stats.request_decoded_bytes += request_decoded
+        stats.response_wire_bytes += response.num_bytes_downloaded
+        stats.response_decoded_bytes += len(response.content)
+
+    def merge(self, other: "CodecMetrics"):
+        """
+        Добавляет счетчики другого прогона (например, xdist воркера).
+        """
+        for route, stats in other.routes.items():
+            self.routes.setdefault(route, CodecStats()).merge(stats)
+
+    def save(self, path: Path):
+        data = {
+            route: {**stats.model_dump(), "ratio": round(stats.ratio, 4)}
+            for route, stats in sorted(self.routes.items())
+        }
+        path.write_text(json.dumps({"routes": data}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def summary(self) -> list[str]:
+        """
+        Строки отчета, отсортированные по объему распакованных ответов.
+        """
+        lines = [f"{'маршрут':<50} {'запросов':>8} {'сеть, байт':>12} {'данные, байт':>12} {'экономия':>8}"]
+        for route, stats in sorted(self.routes.items(), key=lambda item: -item[1].response_decoded_bytes):
+            wire = stats.request_wire_bytes + stats.response_wire_bytes
+            decoded = stats.request_decoded_bytes + stats.response_decoded_bytes
+            lines.append(f"{route:<50} {stats.requests:>8} {wire:>12} {decoded:>12} {stats.ratio:>8.1%}")
+        return lines
+
+
+codec_metrics = CodecMetrics()
@@ -1,3 +1,5 @@
+import gzip
+
 from httpx import Request, RequestNotRead
 
 
@@ -18,7 +20,12 @@ def make_curl_from_request(request: Request) -> str:
     # Добавляем тело запроса, если оно есть (например, для POST, PUT)
     try:
         if body := request.content:
-            result.append(f"-d '{body.decode('utf-8')}'")
+            if request.headers.get("Content-Encoding") == "gzip":
+                # Сжатое тело показываем в исходном виде и сжимаем при отправке
+                result[0] = f"printf '%s' '{gzip.decompress(body).decode('utf-8')}' | gzip | {result[0]}"
+                result.append("--data-binary @-")
+            else:
+                result.append(f"-d '{body.decode('utf-8')}'")
     except RequestNotRead:
         pass
 
@@ -0,0 +1,284 @@
+import json
+import re
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from httpx import URL, BaseTransport, ByteStream, Request, Response
+from pydantic import BaseModel, Field
+
+from tools.assertions.diff import diff_values
+from tools.assertions.snapshot import Normalizer
+from tools.metrics import normalize_path
+from tools.warmup import is_warming_up
+
+# Строки короче не считаются идентификаторами: иначе совпадения вроде "1" давали бы ложные замены
+MIN_ID_LENGTH = 6
+
+# Сколько соответствий хранит IdMap. Давно не использованные вытесняются первыми
+MAX_IDS = 10_000
+
+# Токены в URL, теле и заголовке Authorization, которые могут быть идентификаторами из ответов
+_TOKEN = re.compile(r"[A-Za-z0-9._~-]{%d,}" % MIN_ID_LENGTH)
+
+
+class IdMap:
+    """
+    Соответствие значений, сгенерированных основным окружением, значениям кандидата: id сущностей, токены.
+
+    Оба окружения получают одинаковые запросы, поэтому строки, которые различаются по одному и тому же
+    пути в ответах и не пришли из запроса, сгенерированы серверами. Перед отправкой кандидату они заменяются в запросе,
+    иначе, например, GET /courses/{id} запрашивал бы у кандидата курс основного окружения.
+
+    Хранится не больше `max_size` соответствий. Очищать их после каждого теста нельзя: токены и сущности
+    session-фикстур используются всеми тестами, поэтому вытесняются давно не использованные значения.
+    """
+    def __init__(self, max_size: int = MAX_IDS):
+        self.max_size = max_size
+        self._values: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def learn(self, primary: Any, candidate: Any, request_text: str = ""):
+        """
+        :param request_text: URL и тело запроса. Значения из запроса не сгенерированы сервером:
+            их расхождение - несовместимость кандидата, а не другой id.
+        """
+        if isinstance(primary, dict) and isinstance(candidate, dict):
+            for key in primary.keys() & candidate.keys():
+                self.learn(primary[key], candidate[key], request_text)
+        elif isinstance(primary, list) and isinstance(candidate, list):
+            for primary_item, candidate_item in zip(primary, candidate):
+                self.learn(primary_item, candidate_item, request_text)
+        elif (
+                isinstance(primary, str) and isinstance(candidate, str)
+                and primary != candidate and len(primary) >= MIN_ID_LENGTH
+                and primary not in request_text
+        ):
+            with self._lock:
+                self._values[primary] = candidate
+                self._values.move_to_end(primary)
+                if len(self._values) > self.max_size:
+                    self._values.popitem(last=False)
+
+    def _replace(self, match: re.Match) -> str:
+        value = match.group(0)
+        with self._lock:
+            replacement = self._values.get(value)
+            if replacement is None:
+                return value
+            self._values.move_to_end(value)
+        return replacement
+
+    def rewrite(self, text: str) -> str:
+        if not self._values:
+            return text
+        return _TOKEN.sub(self._replace, text)
+
+
+class RouteComparison(BaseModel):
+    """
+    Сравнение ответов двух окружений по маршруту
+    """
+    requests: int = 0
+    status_mismatches: int = 0
+    body_mismatches: int = 0
+    errors: int = 0  # запросы, на которые кандидат не ответил
+    primary_ms: list[float] = Field(default_factory=list)
+    candidate_ms: list[float] = Field(default_factory=list)
+    examples: list[str] = Field(default_factory=list)
+
+    def merge(self, other: "RouteComparison", max_examples: int):
+        self.requests += other.requests
+        self.status_mismatches += other.status_mismatches
+        self.body_mismatches += other.body_mismatches
+        self.errors += other.errors
+        self.primary_ms.extend(other.primary_ms)
+        self.candidate_ms.extend(other.candidate_ms)
+        self.examples.extend(other.examples[:max_examples - len(self.examples)])
+
+
+def _percentile(values: list[float], percent: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else 0.0
+    return statistics.quantiles(values, n=100)[percent - 1]
+
+
+class DifferentialReport(BaseModel):
+    """
+    Совместимость ответов и задержки кандидата относительно основного окружения по маршрутам
+    """
+    primary_url: str = ""
+    candidate_url: str = ""
+    max_examples: int = 5
+    routes: dict[str, RouteComparison] = Field(default_factory=dict)
+
+    def _route(self, route: str) -> RouteComparison:
+        comparison = self.routes.get(route)
+        if comparison is None:
+            comparison = self.routes[route] = RouteComparison()
+        return comparison
+
+    def record(self, route: str, primary: Response, primary_ms: float, candidate: Response | None, candidate_ms: float, error: str | None):
+        comparison = self._route(route)
+        comparison.requests += 1
+        comparison.primary_ms.append(primary_ms)
+        if candidate is None:
+            comparison.errors += 1
+            self._example(comparison, f"{route}: кандидат не ответил: {error}")
+            return
+
+        comparison.candidate_ms.append(candidate_ms)
+        if primary.status_code != candidate.status_code:
+            comparison.status_mismatches += 1
+            self._example(comparison, f"{route}: статус {primary.status_code} -> {candidate.status_code}")
+            return
+
+        mismatches = compare_bodies(primary, candidate)
+        if mismatches:
+            comparison.body_mismatches += 1
+            self._example(comparison, f"{route}: " + "; ".join(mismatches[:5]))
+
+    def _example(self, comparison: RouteComparison, text: str):
+        if len(comparison.examples) < self.max_examples:
+            comparison.examples.append(text)
+
+    def merge(self, other: "DifferentialReport"):
+        self.primary_url = self.primary_url or other.primary_url
+        self.candidate_url = self.candidate_url or other.candidate_url
+        for route, comparison in other.routes.items():
+            self._route(route).merge(comparison, self.max_examples)
+
+    def summary(self) -> list[dict[str, Any]]:
+        rows = []
+        for route, comparison in sorted(self.routes.items()):
+            primary_p50 = _percentile(comparison.primary_ms, 50)
+            candidate_p50 = _percentile(comparison.candidate_ms, 50)
+            rows.append({
+                "route": route,
+                "requests": comparison.requests,
+                "compatible": comparison.requests - comparison.status_mismatches - comparison.body_mismatches - comparison.errors,
+                "status_mismatches": comparison.status_mismatches,
+                "body_mismatches": comparison.body_mismatches,
+                "errors": comparison.errors,
+                "primary_p50_ms": round(primary_p50, 2),
+                "candidate_p50_ms": round(candidate_p50, 2),
+                "primary_p95_ms": round(_percentile(comparison.primary_ms, 95), 2),
+                "candidate_p95_ms": round(_percentile(comparison.candidate_ms, 95), 2),
+                "p50_delta_percent": round((candidate_p50 - primary_p50) / primary_p50 * 100, 1) if primary_p50 else None,
+                "examples": comparison.examples,
+            })
+        return rows
+
+    def save(self, path: Path):
+        data = {"primary_url": self.primary_url, "candidate_url": self.candidate_url, "routes": self.summary()}
+        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def compare_bodies(primary: Response, candidate: Response) -> list[str]:
+    """
+    Сравнивает тела ответов. JSON нормализуется так же, как в снимках: id, даты и URL заменяются на заглушки.
+    """
+    try:
+        primary_body, candidate_body = primary.json(), candidate.json()
+    except ValueError:
+        return [] if primary.content == candidate.content else ["тело ответа отличается"]
+    mismatches = diff_values(Normalizer().normalize(candidate_body), Normalizer().normalize(primary_body))
+    return [str(mismatch) for mismatch in mismatches]
+
+
+id_map = IdMap()
+differential_report = DifferentialReport()
+_report_lock = threading.Lock()  # запросы выполняются и из потоков SetupGraph
+
+# Общий пул потоков для запросов к кандидату: запросы к двум окружениям выполняются одновременно
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="candidate")
+
+
+def _read_raw(response: Response) -> bytes:
+    """
+    Читает тело ответа транспорта без распаковки.
+    """
+    if response.is_stream_consumed:
+        # Ответ уже прочитан, например созданный в памяти ответ MockTransport: тело не сжималось
+        return response.content
+    try:
+        return b"".join(response.iter_raw())
+    finally:
+        response.close()
+
+
+class DifferentialTransport(BaseTransport):
+    """
+    Транспорт, который отправляет каждый запрос одновременно в основное окружение и в кандидата.
+
+    Тест получает ответ основного окружения, ответ кандидата сравнивается с ним и попадает
+    в `differential_report` вместе с длительностями обоих запросов.
+
+    Запросы прогрева тоже дублируются: иначе у кандидата не было бы пользователей и токенов, созданных прогревом.
+    В отчет они не попадают.
+    """
+    def __init__(self, primary: BaseTransport, candidate: BaseTransport, candidate_url: str):
+        self.primary = primary
+        self.candidate = candidate
+        self.candidate_url = URL(candidate_url)
+
+    def _candidate_request(self, request: Request) -> Request:
+        url = request.url.copy_with(scheme=self.candidate_url.scheme, host=self.candidate_url.host, port=self.candidate_url.port)
+        url = URL(id_map.rewrite(str(url)))
+
+        headers = [(name, value) for name, value in request.headers.multi_items() if name.lower() != "host"]
+        headers = [(name, id_map.rewrite(value) if name.lower() == "authorization" else value) for name, value in headers]
+
+        content = request.content
+        if content and "content-encoding" not in request.headers:
+            try:
+                content = id_map.rewrite(content.decode("utf-8")).encode("utf-8")
+            except UnicodeDecodeError:
+                pass  # бинарное тело, например загрузка файла
+        headers = [(name, str(len(content)) if name.lower() == "content-length" else value) for name, value in headers]
+        extensions = {name: value for name, value in request.extensions.items() if name == "timeout"}
+        return Request(request.method, url, headers=headers, content=content, extensions=extensions)
+
+    def _send_candidate(self, request: Request) -> tuple[Response, float]:
+        start = time.perf_counter()
+        response = self.candidate.handle_request(request)
+        raw = _read_raw(response)
+        duration = (time.perf_counter() - start) * 1000
+        return Response(response.status_code, headers=response.headers, content=raw), duration
+
+    def handle_request(self, request: Request) -> Response:
+        request.read()
+        future = _executor.submit(self._send_candidate, self._candidate_request(request))
+
+        start = time.perf_counter()
+        primary = self.primary.handle_request(request)
+        raw = _read_raw(primary)
+        primary_ms = (time.perf_counter() - start) * 1000
+        # Ответ с распакованным телом для сравнения; клиенту возвращается ответ с исходным потоком байтов
+        response = Response(primary.status_code, headers=primary.headers, content=raw)
+
+        candidate, candidate_ms, error = None, 0.0, None
+        try:
+            candidate, candidate_ms = future.result()
+        except Exception as exception:
+            error = f"{type(exception).__name__}: {exception}"
+
+        route = f"{request.method} {normalize_path(request.url.path)}"
+        if candidate is not None:
+            try:
+                request_text = str(request.url) + request.content.decode("utf-8", errors="replace")
+                id_map.learn(response.json(), candidate.json(), request_text)
+            except ValueError:
+                pass
+        if not is_warming_up():
+            with _report_lock:
+                differential_report.record(route, response, primary_ms, candidate, candidate_ms, error)
+        return Response(primary.status_code, headers=primary.headers, stream=ByteStream(raw), extensions=primary.extensions)
+
+    def close(self):
+        self.primary.close()
+        self.candidate.close()
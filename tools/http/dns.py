@@ -0,0 +1,72 @@
+import socket
+import threading
+import time
+
+import httpcore
+import httpx
+
+from tools.http.timings import report_dns_duration
+from tools.logger import get_logger
+
+logger = get_logger("HTTP_TRANSPORT")
+
+# Версии, в которых пул соединений HTTPTransport устроен так, как ожидает `install_network_backend`
+SUPPORTED_VERSIONS = {"httpx": ("0.28",), "httpcore": ("1.",)}
+
+
+class CachingDNSBackend(httpcore.SyncBackend):
+    """
+    Сетевой бэкенд httpcore, который кеширует результат DNS-запроса на `ttl` секунд.
+    Соединение открывается по IP-адресу, а проверка сертификата и SNI по-прежнему
+    выполняются по имени хоста из URL.
+
+    Модуль импортирует httpcore, поэтому загружается только при включенном кеше DNS.
+    """
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._cache: dict[tuple[str, int], tuple[float, str]] = {}  # (хост, порт) -> (истекает, адрес)
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> str:
+        key = (host, port)
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        try:
+            address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0][4][0]
+        except socket.gaierror:
+            # Ошибку разрешения имени вернет сам httpcore в виде ConnectError
+            return host
+
+        with self._lock:
+            self._cache[key] = (now + self.ttl, address)
+        return address
+
+    def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        start = time.perf_counter()
+        address = self.resolve(host, port)
+        report_dns_duration(time.perf_counter() - start)
+        return super().connect_tcp(address, port, timeout, local_address, socket_options)
+
+
+def install_network_backend(transport: httpx.HTTPTransport, backend: httpcore.NetworkBackend) -> bool:
+    """
+    Подключает сетевой бэкенд к пулу соединений транспорта.
+
+    httpx не позволяет передать бэкенд в HTTPTransport, а пул - внутренний объект httpx. Поэтому бэкенд
+    подключается только в проверенных версиях httpx и httpcore. В остальных используется стандартный бэкенд.
+
+    :return: True, если бэкенд подключен.
+    """
+    versions = {"httpx": httpx.__version__, "httpcore": httpcore.__version__}
+    pool = getattr(transport, "_pool", None)
+    supported = all(versions[name].startswith(prefixes) for name, prefixes in SUPPORTED_VERSIONS.items())
+    if not supported or not isinstance(pool, httpcore.ConnectionPool) or not hasattr(pool, "_network_backend"):
+        logger.warning(f"Кеш DNS не поддерживается для httpx {versions['httpx']}, httpcore {versions['httpcore']}")
+        return False
+
+    pool._network_backend = backend
+    return True
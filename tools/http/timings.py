@@ -0,0 +1,195 @@
+import json
+import re
+import time
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from httpx import Response
+from pydantic import BaseModel, Field
+
+# Фазы запроса в порядке выполнения
+PHASES = ("dns", "connect", "tls", "send", "ttfb", "download")
+
+# Длительность разрешения имени, измеренная сетевым бэкендом во время connect_tcp
+_dns_duration: ContextVar[float | None] = ContextVar("dns_duration", default=None)
+
+_SERVER_TIMING_DURATION = re.compile(r";\s*dur=([\d.]+)")
+
+
+def report_dns_duration(duration: float):
+    """
+    Сообщает длительность DNS-запроса текущего соединения. Вызывается из CachingDNSBackend:
+    стандартный бэкенд httpcore разрешает имя внутри connect_tcp, и тогда DNS входит в connect.
+    """
+    _dns_duration.set(duration)
+
+
+def parse_server_timing(header: str) -> dict[str, float]:
+    """
+    Разбирает заголовок Server-Timing, например `db;dur=53, app;dur=47.2, cache;desc="Cache Read"`.
+
+    :return: Словарь "метрика -> длительность, мс". Метрики без dur не учитываются.
+    """
+    timings: dict[str, float] = {}
+    for metric in header.split(","):
+        name = metric.split(";", 1)[0].strip()
+        if name and (match := _SERVER_TIMING_DURATION.search(metric)):
+            timings[name] = float(match.group(1))
+    return timings
+
+
+class RequestTimings(BaseModel):
+    """
+    Длительности фаз одного запроса, мс.
+    connect, dns и tls равны 0, если запрос ушел по уже открытому соединению.
+    """
+    route: str = ""
+    status: int | None = None
+    dns: float = 0.0
+    connect: float = 0.0
+    tls: float = 0.0
+    send: float = 0.0
+    ttfb: float = 0.0  # от отправки тела запроса до получения заголовков ответа
+    download: float = 0.0
+    total: float = 0.0
+    server: dict[str, float] = Field(default_factory=dict)  # Server-Timing, мс
+
+
+class TimingCollector:
+    """
+    Обработчик расширения `trace` httpcore: запоминает моменты начала и конца фаз запроса
+    """
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.dns = 0.0
+        self._events: dict[str, float] = {}
+
+    def __call__(self, event_name: str, info: dict[str, Any]):
+        now = time.perf_counter()
+        # http11.send_request_headers.started -> send_request_headers.started
+        _, _, name = event_name.partition(".")
+        self._events.setdefault(name, now)
+        if name == "connect_tcp.complete":
+            dns = _dns_duration.get()
+            if dns is not None:
+                self.dns = dns * 1000
+                _dns_duration.set(None)
+
+    def _between(self, start: str, end: str) -> float:
+        if start in self._events and end in self._events:
+            return (self._events[end] - self._events[start]) * 1000
+        return 0.0
+
+    def build(self, response: Response) -> RequestTimings:
+        return RequestTimings(
+            status=response.status_code,
+            dns=self.dns,
+            connect=max(self._between("connect_tcp.started", "connect_tcp.complete") - self.dns, 0.0),
+            tls=self._between("start_tls.started", "start_tls.complete"),
+            send=self._between("send_request_headers.started", "send_request_body.complete"),
+            ttfb=self._between("send_request_body.complete", "receive_response_headers.complete"),
+            download=self._between("receive_response_body.started", "receive_response_body.complete"),
+            total=(time.perf_counter() - self.started_at) * 1000,
+            server=parse_server_timing(response.headers.get("Server-Timing", ""))
+        )
+
+
+def get_timings(response: Response) -> RequestTimings | None:
+    """
+    Возвращает длительности фаз запроса, сохраненные BaseAPIClient в расширениях ответа.
+    """
+    return response.extensions.get("timings")
+
+
+class RouteTimings(BaseModel):
+    """
+    Количество замеров, сумма и максимум длительностей фаз по маршруту, мс.
+    Метрики Server-Timing есть не во всех ответах, поэтому замеры считаются по каждой фазе отдельно
+    """
+    requests: int = 0
+    counts: dict[str, int] = Field(default_factory=dict)
+    total: dict[str, float] = Field(default_factory=dict)
+    maximum: dict[str, float] = Field(default_factory=dict)
+    # Длительности (total) каждого запроса, если включен `TimingStats.keep_samples`. Воркеры xdist их не передают
+    samples: list[float] = Field(default_factory=list, exclude=True)
+
+    def add(self, name: str, value: float):
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self.total[name] = self.total.get(name, 0.0) + value
+        self.maximum[name] = max(self.maximum.get(name, 0.0), value)
+
+    def merge(self, other: "RouteTimings"):
+        self.requests += other.requests
+        for name, value in other.counts.items():
+            self.counts[name] = self.counts.get(name, 0) + value
+        for name, value in other.total.items():
+            self.total[name] = self.total.get(name, 0.0) + value
+        for name, value in other.maximum.items():
+            self.maximum[name] = max(self.maximum.get(name, 0.0), value)
+
+
+class TimingStats(BaseModel):
+    """
+    Длительности фаз запросов по маршрутам вида "GET /api/v1/courses" за прогон,
+    а также запросы текущего теста для отчета о падении
+    """
+    routes: dict[str, RouteTimings] = Field(default_factory=dict)
+    current_test: list[RequestTimings] = Field(default_factory=list, exclude=True)
+    # Сохранять длительность каждого запроса, а не только сумму и максимум: нужно для сравнения прогонов
+    keep_samples: bool = Field(default=False, exclude=True)
+
+    def record(self, endpoint: str, response: Response):
+        """
+        Учитывает запрос. Вызывается плагином fixtures.request_timings, см. `clients.recorders`.
+
+        :param endpoint: Шаблон маршрута, например /api/v1/courses/{course_id}
+        :param response: Ответ сервера.
+        """
+        timings = get_timings(response)
+        if timings is None:
+            return
+
+        timings.route = f"{response.request.method} {endpoint}"
+        self.current_test.append(timings)
+
+        stats = self.routes.get(timings.route)
+        if stats is None:
+            stats = self.routes[timings.route] = RouteTimings()
+        stats.requests += 1
+        if self.keep_samples:
+            stats.samples.append(timings.total)
+        for phase in (*PHASES, "total"):
+            stats.add(phase, getattr(timings, phase))
+        for name, value in timings.server.items():
+            stats.add(f"server.{name}", value)
+
+    def merge(self, other: "TimingStats"):
+        for route, stats in other.routes.items():
+            self.routes.setdefault(route, RouteTimings()).merge(stats)
+
+    def save(self, path: Path):
+        data = {
+            route: {
+                "requests": stats.requests,
+                "mean_ms": {name: round(value / stats.counts[name], 3) for name, value in stats.total.items()},
+                "max_ms": {name: round(value, 3) for name, value in stats.maximum.items()},
+            }
+            for route, stats in sorted(self.routes.items())
+        }
+        path.write_text(json.dumps({"routes": data}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def format_current_test(self) -> str:
+        """
+        Таблица фаз запросов текущего теста.
+        """
+        header = f"{'маршрут':<45} {'статус':>6} " + " ".join(f"{phase:>8}" for phase in (*PHASES, "total"))
+        lines = [header + "  server-timing"]
+        for timings in self.current_test:
+            phases = " ".join(f"{getattr(timings, phase):>8.1f}" for phase in (*PHASES, "total"))
+            server = ", ".join(f"{name}={value:g}" for name, value in timings.server.items())
+            lines.append(f"{timings.route:<45} {timings.status or '':>6} {phases}  {server}")
+        return "\n".join(lines)
+
+
+timing_stats = TimingStats()
@@ -0,0 +1,160 @@
+import argparse
+import inspect
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from httpx import Client
+
+from clients.schema_registry import schema_registry
+from clients.transport import build_client, build_transport
+from config import ReportingLevel, settings
+from tools.data_generator import derive_seed, fake, get_run_seed
+from tools.load.scenario import Argument, Scenario, ScenarioStep, import_object, resolve_ref, to_jsonable
+
+
+@dataclass
+class StepResult:
+    route: str
+    status: int | None
+    duration: float
+    error: str | None = None
+
+
+class VirtualUser:
+    """
+    Виртуальный пользователь: один раз выполняет сценарий со свежими данными Fake.
+    Данные генерируются из сида пользователя, поэтому повтор нагрузки с тем же сидом использует те же данные.
+
+    Методы клиентов вызываются без декораторов шагов Allure и трекера покрытия,
+    значения из предыдущих шагов подставляются по ссылкам сценария.
+    """
+    def __init__(self, scenario: Scenario, seed: int):
+        self.scenario = scenario
+        self.seed = seed
+        self.history: list[dict[str, Any]] = []
+        self._clients: dict[str | None, Client] = {}  # токен -> HTTP клиент
+
+    def _resolve(self, argument: Argument) -> Any:
+        if argument.schema_path is None:
+            return resolve_ref(argument.ref, self.history) if argument.ref is not None else argument.value
+
+        values = {**argument.values}
+        values.update({key: resolve_ref(ref, self.history) for key, ref in argument.refs.items()})
+        return schema_registry.build_request(import_object(argument.schema_path), **values)
+
+    def _http_client(self, step: ScenarioStep) -> Client:
+        token = resolve_ref(step.auth, self.history) if step.auth is not None else None
+        client = self._clients.get(token)
+        if client is None:
+            headers = {"Authorization": f"Bearer {token}"} if token is not None else None
+            # Свой пул соединений у каждого виртуального пользователя, как у настоящих клиентов API
+            client = self._clients[token] = build_client(headers=headers, transport=build_transport())
+        return client
+
+    def _run_step(self, step: ScenarioStep) -> StepResult:
+        arguments = {name: self._resolve(argument) for name, argument in step.arguments.items()}
+        api_client = import_object(step.client)(client=self._http_client(step))
+        method = inspect.unwrap(getattr(type(api_client), step.method))
+
+        start = time.perf_counter()
+        response = method(api_client, **arguments)
+        duration = time.perf_counter() - start
+
+        try:
+            body = response.json()
+        except ValueError:
+            body = None
+        self.history.append({
+            "request": {name: to_jsonable(value) for name, value in arguments.items()},
+            "response": body
+        })
+
+        error = None
+        if response.status_code != step.expected_status:
+            error = f"статус {response.status_code}, ожидался {step.expected_status}"
+        return StepResult(step.route, response.status_code, duration, error)
+
+    def run(self) -> list[StepResult]:
+        """
+        Выполняет шаги сценария до первой ошибки: следующие шаги зависят от ее результата.
+        """
+        results: list[StepResult] = []
+        try:
+            with fake.seeded(self.seed):
+                for step in self.scenario.steps:
+                    try:
+                        result = self._run_step(step)
+                    except Exception as error:
+                        result = StepResult(step.route, None, 0.0, f"{type(error).__name__}: {error}")
+                    results.append(result)
+                    if result.error:
+                        break
+        finally:
+            for client in self._clients.values():
+                client.close()
+        return results
+
+
+def run_load(scenario: Scenario, users: int, concurrency: int, seed: int) -> list[StepResult]:
+    """
+    Выполняет сценарий `users` раз, не более `concurrency` виртуальных пользователей одновременно.
+
+    :param seed: Сид нагрузки, из которого выводятся сиды виртуальных пользователей.
+    """
+    def run_user(index: int) -> list[StepResult]:
+        return VirtualUser(scenario, derive_seed(f"{scenario.name}:{index}", seed)).run()
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="virtual-user") as executor:
+        runs = executor.map(run_user, range(users))
+        return [result for run in runs for result in run]
+
+
+def summarize(results: list[StepResult]) -> list[str]:
+    by_route: dict[str, list[StepResult]] = {}
+    for result in results:
+        by_route.setdefault(result.route, []).append(result)
+
+    lines = [f"{'маршрут':<50} {'запросов':>8} {'ошибок':>7} {'p50, мс':>9} {'p95, мс':>9}"]
+    for route, route_results in by_route.items():
+        durations = [result.duration * 1000 for result in route_results if result.status is not None]
+        errors = sum(1 for result in route_results if result.error)
+        p50 = statistics.median(durations) if durations else 0.0
+        p95 = statistics.quantiles(durations, n=20)[-1] if len(durations) > 1 else p50
+        lines.append(f"{route:<50} {len(route_results):>8} {errors:>7} {p50:>9.1f} {p95:>9.1f}")
+    return lines
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Воспроизведение записанного сценария как нагрузочного")
+    parser.add_argument("scenario", type=Path, help="Файл сценария, записанный с --record-scenarios")
+    parser.add_argument("--users", type=int, default=100, help="Сколько раз выполнить сценарий")
+    parser.add_argument("--concurrency", type=int, default=10, help="Одновременно работающих виртуальных пользователей")
+    parser.add_argument("--seed", type=int, default=None, help="Сид данных. С тем же сидом нагрузка использует те же данные")
+    args = parser.parse_args()
+
+    # Шаги Allure вне тестов не нужны и только тратят время
+    settings.reporting.level = ReportingLevel.OFF
+    scenario = Scenario.load(args.scenario)
+
+    seed = args.seed if args.seed is not None else get_run_seed()
+    start = time.perf_counter()
+    results = run_load(scenario, args.users, args.concurrency, seed)
+    elapsed = time.perf_counter() - start
+
+    print(f"Сценарий {scenario.name}: {args.users} пользователей за {elapsed:.1f} с, сид {seed}")
+    for line in summarize(results):
+        print(line)
+
+    errors = [result.error for result in results if result.error]
+    for error in sorted(set(errors))[:10]:
+        print(f"Ошибка: {error}")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
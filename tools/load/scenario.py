@@ -0,0 +1,199 @@
+import importlib
+import inspect
+import json
+import re
+from pathlib import Path
+from typing import Any, Callable, Literal
+
+from httpx import Response
+from pydantic import BaseModel, Field
+
+from tools.logger import get_logger
+
+logger = get_logger("LOAD_SCENARIO")
+
+# Строки короче не считаются идентификаторами: иначе совпадения вроде "1" или "" давали бы ложные ссылки
+MIN_REF_LENGTH = 6
+
+# Сценарий, который записывается для текущего теста. None означает, что запись выключена
+_current: "ScenarioRecorder | None" = None
+
+
+class ValueRef(BaseModel):
+    """
+    Ссылка на значение из запроса или ответа предыдущего шага, например steps[2].response.course.id
+    """
+    step: int
+    part: Literal["request", "response"]
+    path: str  # ключи через точку, индексы списков - числами
+
+
+class Argument(BaseModel):
+    """
+    Аргумент метода клиента.
+
+    Для моделей запросов записывается схема, ссылки на значения предыдущих шагов и обязательные поля
+    без значения по умолчанию. Остальные поля при воспроизведении заново генерируются Fake.
+    """
+    schema_path: str | None = None  # модуль:класс схемы
+    refs: dict[str, ValueRef] = Field(default_factory=dict)  # поле (алиас) -> ссылка
+    values: dict[str, Any] = Field(default_factory=dict)  # поле (алиас) -> значение
+    ref: ValueRef | None = None  # ссылка для аргумента, который не является моделью
+    value: Any = None
+
+
+class ScenarioStep(BaseModel):
+    client: str  # модуль:класс клиента
+    method: str
+    route: str  # метод и шаблон маршрута, например POST /api/v1/courses
+    auth: ValueRef | None = None  # ссылка на токен из заголовка Authorization
+    arguments: dict[str, Argument] = Field(default_factory=dict)
+    expected_status: int
+
+
+class Scenario(BaseModel):
+    """
+    Последовательность вызовов клиентов, записанная по тесту и его фикстурам
+    """
+    name: str
+    steps: list[ScenarioStep] = Field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: Path) -> "Scenario":
+        return cls.model_validate_json(path.read_text(encoding="utf-8"))
+
+    def save(self, directory: Path) -> Path:
+        directory.mkdir(parents=True, exist_ok=True)
+        file_name = re.sub(r"[^\w.-]+", "_", self.name).strip("_")
+        path = directory / f"{file_name}.json"
+        path.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        return path
+
+
+def import_object(path: str) -> Any:
+    """
+    Импортирует объект по пути вида clients.courses.courses_client:CoursesAPIClient
+    """
+    module_name, name = path.split(":")
+    return getattr(importlib.import_module(module_name), name)
+
+
+def to_jsonable(value: Any) -> Any:
+    """
+    Приводит аргумент метода клиента к виду, в котором он хранится в истории шагов.
+    """
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    return value
+
+
+def flatten_strings(value: Any, prefix: str, into: dict[str, str]):
+    """
+    Собирает строковые значения вложенной структуры: значение -> путь к нему.
+    Для повторяющихся значений сохраняется первый путь.
+    """
+    if isinstance(value, dict):
+        for key, item in value.items():
+            flatten_strings(item, f"{prefix}.{key}" if prefix else str(key), into)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            flatten_strings(item, f"{prefix}.{index}" if prefix else str(index), into)
+    elif isinstance(value, str) and len(value) >= MIN_REF_LENGTH:
+        into.setdefault(value, prefix)
+
+
+def resolve_ref(ref: ValueRef, history: list[dict[str, Any]]) -> Any:
+    """
+    Возвращает значение по ссылке из истории выполненных шагов.
+    """
+    value = history[ref.step][ref.part]
+    for key in ref.path.split("."):
+        value = value[int(key)] if isinstance(value, list) else value[key]
+    return value
+
+
+class ScenarioRecorder:
+    """
+    Записывает вызовы методов клиентов и заменяет значения, полученные на предыдущих шагах, ссылками
+    """
+    def __init__(self, name: str):
+        self.scenario = Scenario(name=name)
+        self._values: dict[str, ValueRef] = {}  # известное значение -> где оно впервые появилось
+
+    def _remember(self, value: Any, step: int, part: Literal["request", "response"]):
+        found: dict[str, str] = {}
+        flatten_strings(value, "", found)
+        for item, path in found.items():
+            self._values.setdefault(item, ValueRef(step=step, part=part, path=path))
+
+    def _argument(self, value: Any) -> Argument:
+        if not isinstance(value, BaseModel):
+            ref = self._values.get(value) if isinstance(value, str) else None
+            return Argument(ref=ref) if ref is not None else Argument(value=to_jsonable(value))
+
+        schema = type(value)
+        data = to_jsonable(value)
+        argument = Argument(schema_path=f"{schema.__module__}:{schema.__qualname__}")
+        for name, field in schema.model_fields.items():
+            key = field.alias or name
+            if key not in data:
+                continue
+            if isinstance(data[key], str) and (ref := self._values.get(data[key])) is not None:
+                argument.refs[key] = ref
+            elif field.is_required():
+                argument.values[key] = data[key]
+        return argument
+
+    def record(self, func: Callable, args: tuple, kwargs: dict, endpoint: str, response: Response):
+        arguments = inspect.signature(func).bind(*args, **kwargs).arguments
+        client = arguments.pop("self")
+
+        auth = None
+        authorization = client.client.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            auth = self._values.get(authorization.removeprefix("Bearer "))
+            if auth is None:
+                logger.warning(f"Токен для {func.__qualname__} не найден в предыдущих шагах сценария")
+
+        step = len(self.scenario.steps)
+        self.scenario.steps.append(
+            ScenarioStep(
+                client=f"{type(client).__module__}:{type(client).__qualname__}",
+                method=func.__name__,
+                route=f"{response.request.method} {endpoint}",
+                auth=auth,
+                arguments={name: self._argument(value) for name, value in arguments.items()},
+                expected_status=response.status_code
+            )
+        )
+
+        self._remember({name: to_jsonable(value) for name, value in arguments.items()}, step, "request")
+        try:
+            self._remember(json.loads(response.content), step, "response")
+        except ValueError:
+            pass
+
+
+def start_recording(name: str):
+    global _current
+    _current = ScenarioRecorder(name)
+
+
+def stop_recording() -> Scenario | None:
+    global _current
+    recorder, _current = _current, None
+    return recorder.scenario if recorder is not None else None
+
+
+def record_call(func: Callable, args: tuple, kwargs: dict, endpoint: str, response: Response):
+    """
+    Запоминает вызов метода клиента. Вызывается плагином fixtures.load_scenarios, см. `clients.recorders`.
+
+    :param func: Метод клиента без декораторов.
+    :param args: Позиционные аргументы вызова, включая self.
+    :param kwargs: Именованные аргументы вызова.
+    :param endpoint: Шаблон маршрута, например /api/v1/courses/{course_id}
+    :param response: Ответ сервера.
+    """
+    if _current is not None:
+        _current.record(func, args, kwargs, endpoint, response)
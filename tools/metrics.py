@@ -0,0 +1,273 @@
+import bisect
+import http.server
+import re
+import threading
+from functools import wraps
+from typing import Callable, TypeVar
+
+from pydantic import BaseModel, Field
+
+Func = TypeVar("Func", bound=Callable)
+
+# Границы корзин гистограмм длительностей, секунды
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Сегменты пути, которые заменяются на {id}, чтобы число временных рядов не зависело от данных
+_ID_SEGMENT = re.compile(r"^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)$")
+
+Labels = tuple[tuple[str, str], ...]
+
+
+def normalize_path(path: str) -> str:
+    """
+    Заменяет идентификаторы в пути на {id}: /api/v1/courses/7f1c... -> /api/v1/courses/{id}
+    """
+    return "/".join("{id}" if _ID_SEGMENT.match(segment) else segment for segment in path.split("/"))
+
+
+class _Shard:
+    """
+    Значения метрик, записанные одним потоком. Поток пишет только в свой шард, поэтому
+    запись не требует блокировок; шарды объединяются при чтении.
+    """
+    def __init__(self):
+        self.counters: dict[tuple[str, Labels], float] = {}
+        self.histograms: dict[tuple[str, Labels], list[float]] = {}  # [корзины..., sum, count]
+
+    def absorb(self, other: "_Shard"):
+        """
+        Прибавляет значения шарда завершившегося потока: он больше не пишет в свой шард.
+        """
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0.0) + value
+        for key, values in other.histograms.items():
+            current = self.histograms.get(key)
+            self.histograms[key] = list(values) if current is None else [left + right for left, right in zip(current, values)]
+
+
+class MetricsSnapshot(BaseModel):
+    """
+    Объединенные значения метрик, которые можно передать между процессами и сложить
+    """
+    counters: list[tuple[str, Labels, float]] = Field(default_factory=list)
+    histograms: list[tuple[str, Labels, list[float]]] = Field(default_factory=list)
+
+    def merge(self, other: "MetricsSnapshot") -> "MetricsSnapshot":
+        counters: dict[tuple[str, Labels], float] = {}
+        for name, labels, value in (*self.counters, *other.counters):
+            key = (name, tuple(map(tuple, labels)))
+            counters[key] = counters.get(key, 0.0) + value
+
+        histograms: dict[tuple[str, Labels], list[float]] = {}
+        for name, labels, values in (*self.histograms, *other.histograms):
+            key = (name, tuple(map(tuple, labels)))
+            if key in histograms:
+                histograms[key] = [left + right for left, right in zip(histograms[key], values)]
+            else:
+                histograms[key] = list(values)
+
+        return MetricsSnapshot(
+            counters=[(name, labels, value) for (name, labels), value in counters.items()],
+            histograms=[(name, labels, values) for (name, labels), values in histograms.items()]
+        )
+
+
+class Counter:
+    def __init__(self, registry: "MetricsRegistry", name: str):
+        self._registry = registry
+        self.name = name
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        counters = self._registry.shard().counters
+        key = (self.name, tuple(sorted(labels.items())))
+        counters[key] = counters.get(key, 0.0) + amount
+
+
+class Histogram:
+    def __init__(self, registry: "MetricsRegistry", name: str, buckets: tuple[float, ...]):
+        self._registry = registry
+        self.name = name
+        self.buckets = buckets
+
+    def observe(self, value: float, **labels: str):
+        histograms = self._registry.shard().histograms
+        key = (self.name, tuple(sorted(labels.items())))
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0.0] * (len(self.buckets) + 3)
+        # Корзины хранятся без накопления, кумулятивные значения считаются при выводе
+        values[bisect.bisect_left(self.buckets, value)] += 1
+        values[-2] += value
+        values[-1] += 1
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик прогона: счетчики и гистограммы с метками, вывод в формате OpenMetrics.
+
+    У каждого потока свой шард. Шарды завершившихся потоков (пулы SetupGraph, нагрузки, прогрева)
+    прибавляются к общему шарду `_retired`, поэтому число шардов не растет с числом созданных потоков.
+    """
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: list[tuple[threading.Thread, _Shard]] = []
+        self._retired = _Shard()
+        self._lock = threading.Lock()  # для регистрации шарда нового потока и объединения шардов
+        self._families: dict[str, tuple[str, str, tuple[float, ...]]] = {}  # имя -> (тип, описание, корзины)
+
+    def shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._retire_finished()
+                self._shards.append((threading.current_thread(), shard))
+        return shard
+
+    def _retire_finished(self):
+        """
+        Переносит шарды завершившихся потоков в `_retired`. Вызывается под `_lock`.
+        """
+        alive = []
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                alive.append((thread, shard))
+            else:
+                self._retired.absorb(shard)
+        self._shards = alive
+
+    def counter(self, name: str, description: str) -> Counter:
+        self._families[name] = ("counter", description, ())
+        return Counter(self, name)
+
+    def histogram(self, name: str, description: str, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        self._families[name] = ("histogram", description, buckets)
+        return Histogram(self, name, buckets)
+
+    def snapshot(self) -> MetricsSnapshot:
+        snapshot = MetricsSnapshot()
+        with self._lock:
+            self._retire_finished()
+            # копия `_retired` под блокировкой: в него прибавляются шарды других потоков
+            retired = _Shard()
+            retired.absorb(self._retired)
+            shards = [retired, *(shard for _, shard in self._shards)]
+        for shard in shards:
+            # dict() копирует словарь целиком под GIL, поэтому запись из других потоков ему не мешает
+            snapshot = snapshot.merge(
+                MetricsSnapshot(
+                    counters=[(name, labels, value) for (name, labels), value in dict(shard.counters).items()],
+                    histograms=[(name, labels, list(values)) for (name, labels), values in dict(shard.histograms).items()]
+                )
+            )
+        return snapshot
+
+    def render(self, snapshot: MetricsSnapshot | None = None) -> str:
+        """
+        Выводит метрики в текстовом формате OpenMetrics.
+
+        :param snapshot: Значения метрик, по умолчанию - текущие значения реестра.
+        """
+        snapshot = snapshot if snapshot is not None else self.snapshot()
+        lines: list[str] = []
+        for family, (kind, description, buckets) in sorted(self._families.items()):
+            lines.append(f"# TYPE {family} {kind}")
+            lines.append(f"# HELP {family} {description}")
+            if kind == "counter":
+                for name, labels, value in sorted(snapshot.counters):
+                    if name == family:
+                        lines.append(f"{family}_total{_format_labels(labels)} {value:g}")
+                continue
+
+            for name, labels, values in sorted(snapshot.histograms):
+                if name != family:
+                    continue
+                cumulative = 0.0
+                for bound, count in zip((*buckets, float("inf")), values):
+                    cumulative += count
+                    le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                    lines.append(f"{family}_bucket{_format_labels(labels, ('le', le))} {cumulative:g}")
+                lines.append(f"{family}_sum{_format_labels(labels)} {values[-2]:g}")
+                lines.append(f"{family}_count{_format_labels(labels)} {values[-1]:g}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Labels, *extra: tuple[str, str]) -> str:
+    items = [*labels, *extra]
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(str(value))}"' for key, value in items) + "}"
+
+
+class MetricsServer:
+    """
+    Локальный HTTP сервер, который отдает текущие метрики по /metrics
+    """
+    def __init__(self, registry: "MetricsRegistry", port: int):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-server", daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+registry = MetricsRegistry()
+
+api_requests = registry.counter("api_requests", "Количество HTTP запросов по методу, маршруту и статусу ответа")
+api_request_duration = registry.histogram(
+    "api_request_duration_seconds",
+    "Длительность HTTP запроса до получения заголовков ответа"
+)
+fixture_setup_duration = registry.histogram("fixture_setup_duration_seconds", "Длительность setup фикстур")
+assertions = registry.counter("assertions", "Количество проверок по функции и результату")
+tests = registry.counter("tests", "Количество тестов по результату, включая перезапуски (rerun)")
+test_duration = registry.histogram("test_duration_seconds", "Длительность теста: setup, call и teardown")
+
+
+def count_assertion(func: Func) -> Func:
+    """
+    Декоратор функции проверки: считает успешные и упавшие проверки в метрике `assertions`.
+    Упавшей считается проверка, которая выбросила любое исключение (например, ValidationError).
+    """
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        try:
+            result = func(*args, **kwargs)
+        except Exception:
+            assertions.inc(assertion=func.__name__, outcome="failed")
+            raise
+        assertions.inc(assertion=func.__name__, outcome="passed")
+        return result
+
+    return wrapper
+
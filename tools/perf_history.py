@@ -0,0 +1,278 @@
+import math
+import sqlite3
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+from tools.http.timings import RequestTimings, TimingStats
+
+
+class PerfSamples(BaseModel):
+    """
+    Длительности за прогон, мс: запросов по маршрутам вида "GET /api/v1/courses" (total каждого запроса)
+    и тестов - сумма total всех запросов, выполненных во время setup, call и teardown теста.
+    Тест обычно делает несколько запросов, поэтому за прогон у него одно значение (несколько - при soak-прогоне)
+    и сравнивается он по окнам прогонов, см. `PerfHistory.test_windows`.
+    Собираются из замеров TimingStats, см. `add_test` и `add_routes`.
+    """
+    routes: dict[str, list[float]] = Field(default_factory=dict)
+    tests: dict[str, list[float]] = Field(default_factory=dict)
+
+    def add_test(self, nodeid: str, timings: list[RequestTimings]):
+        """
+        :param timings: Запросы теста, `TimingStats.current_test`.
+        """
+        if timings:
+            self.tests.setdefault(nodeid, []).append(sum(request.total for request in timings))
+
+    def add_routes(self, stats: TimingStats):
+        """
+        Добавляет длительности запросов по маршрутам. Требует `TimingStats.keep_samples`.
+        """
+        for route, route_timings in stats.routes.items():
+            if route_timings.samples:
+                self.routes.setdefault(route, []).extend(route_timings.samples)
+
+    def merge(self, other: "PerfSamples"):
+        for route, values in other.routes.items():
+            self.routes.setdefault(route, []).extend(values)
+        for test, values in other.tests.items():
+            self.tests.setdefault(test, []).extend(values)
+
+    def by_kind(self) -> dict[tuple[str, str], list[float]]:
+        return {
+            **{("route", route): values for route, values in self.routes.items()},
+            **{("test", test): values for test, values in self.tests.items()},
+        }
+
+
+perf_samples = PerfSamples()
+
+
+def mann_whitney_p_value(baseline: list[float], current: list[float]) -> float:
+    """
+    Односторонний критерий Манна-Уитни: вероятность получить такой же или больший сдвиг `current`
+    вверх относительно `baseline`, если распределения одинаковы. Нормальное приближение с поправками
+    на совпадающие значения и на непрерывность.
+    """
+    n1, n2 = len(current), len(baseline)
+    if not n1 or not n2:
+        return 1.0
+
+    values = sorted([(value, True) for value in current] + [(value, False) for value in baseline])
+    rank_sum = 0.0
+    ties = 0.0
+    start = 0
+    while start < len(values):
+        end = start
+        while end + 1 < len(values) and values[end + 1][0] == values[start][0]:
+            end += 1
+        rank = (start + end) / 2 + 1  # средний ранг группы одинаковых значений
+        rank_sum += rank * sum(is_current for _, is_current in values[start:end + 1])
+        count = end - start + 1
+        ties += count ** 3 - count
+        start = end + 1
+
+    n = n1 + n2
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Comparison(BaseModel):
+    """
+    Сравнение длительностей маршрута или теста с базовым прогоном
+    """
+    kind: str  # route или test
+    name: str
+    baseline_count: int
+    current_count: int
+    baseline_median: float
+    current_median: float
+    shift: float  # относительное изменение медианы: 0.25 - на 25% медленнее
+    p_value: float
+    regressed: bool
+
+
+def compare_samples(
+        baseline: dict[tuple[str, str], list[float]],
+        current: dict[tuple[str, str], list[float]],
+        alpha: float = 0.01,
+        min_shift: float = 0.1,
+        min_samples: int = 5
+) -> list[Comparison]:
+    """
+    Сравнивает распределения длительностей текущего прогона с базовым.
+
+    Замедлением считается статистически значимый сдвиг (p < `alpha`), при котором медиана выросла
+    не меньше чем на `min_shift`: на большой выборке значимым оказывается и сдвиг на доли миллисекунды.
+    Маршруты и тесты, у которых в одной из выборок меньше `min_samples` значений, не сравниваются.
+
+    :return: Сравнения, самые большие сдвиги медианы - первыми.
+    """
+    comparisons = []
+    for key in baseline.keys() & current.keys():
+        before, after = baseline[key], current[key]
+        if len(before) < min_samples or len(after) < min_samples:
+            continue
+
+        baseline_median, current_median = statistics.median(before), statistics.median(after)
+        shift = (current_median - baseline_median) / baseline_median if baseline_median else 0.0
+        p_value = mann_whitney_p_value(before, after)
+        comparisons.append(Comparison(
+            kind=key[0],
+            name=key[1],
+            baseline_count=len(before),
+            current_count=len(after),
+            baseline_median=baseline_median,
+            current_median=current_median,
+            shift=shift,
+            p_value=p_value,
+            regressed=p_value < alpha and shift >= min_shift
+        ))
+    return sorted(comparisons, key=lambda comparison: comparison.shift, reverse=True)
+
+
+def format_comparisons(comparisons: list[Comparison]) -> str:
+    """
+    Таблица сравнения для отчета.
+    """
+    lines = [f"{'':<2}{'тип':<6} {'медиана, мс':>21} {'сдвиг':>8} {'p':>8} {'n':>11}  название"]
+    for comparison in comparisons:
+        medians = f"{comparison.baseline_median:.1f} -> {comparison.current_median:.1f}"
+        counts = f"{comparison.baseline_count}/{comparison.current_count}"
+        lines.append(
+            f"{'!' if comparison.regressed else '':<2}{comparison.kind:<6} {medians:>21} "
+            f"{comparison.shift:>+8.1%} {comparison.p_value:>8.4f} {counts:>11}  {comparison.name}"
+        )
+    return "\n".join(lines)
+
+
+def current_git_sha() -> str:
+    """
+    SHA текущего коммита или "unknown", если git недоступен.
+    """
+    try:
+        result = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.TimeoutExpired):
+        return "unknown"
+    return result.stdout.strip() if result.returncode == 0 else "unknown"
+
+
+class PerfHistory:
+    """
+    Локальная история длительностей запросов по прогонам в SQLite.
+    Прогон помечается SHA коммита и окружением, с которым сравниваются только прогоны того же окружения.
+    """
+    def __init__(self, path: str | Path):
+        """
+        :param path: Путь к файлу базы данных.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS perf_runs (
+                run_id TEXT PRIMARY KEY,
+                git_sha TEXT NOT NULL,
+                environment TEXT NOT NULL,
+                recorded_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS perf_samples (
+                run_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                value REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS perf_samples_run_id ON perf_samples (run_id);
+            """
+        )
+
+    def record(self, run_id: str, git_sha: str, environment: str, samples: PerfSamples):
+        """
+        Записывает длительности прогона. Замеры прогона с тем же run_id заменяются.
+        Фиксация транзакции выполняется в `close`.
+        """
+        self.connection.execute("DELETE FROM perf_samples WHERE run_id = ?", (run_id,))
+        self.connection.execute(
+            "INSERT OR REPLACE INTO perf_runs VALUES (?, ?, ?, ?)",
+            (run_id, git_sha, environment, time.time())
+        )
+        self.connection.executemany(
+            "INSERT INTO perf_samples VALUES (?, ?, ?, ?)",
+            [
+                (run_id, kind, name, value)
+                for (kind, name), values in samples.by_kind().items()
+                for value in values
+            ]
+        )
+
+    def find_baseline(self, environment: str, exclude_run_id: str, reference: str | None = None) -> tuple[str, str] | None:
+        """
+        Находит базовый прогон: последний прогон окружения или прогон, заданный `reference`.
+
+        :param reference: run_id или начало SHA коммита. Если задан, окружение не учитывается.
+        :return: (run_id, git_sha) или None, если подходящего прогона нет.
+        """
+        if reference:
+            query = (
+                "SELECT run_id, git_sha FROM perf_runs WHERE run_id != ? AND (run_id = ? OR git_sha LIKE ? || '%') "
+                "ORDER BY recorded_at DESC LIMIT 1"
+            )
+            parameters = (exclude_run_id, reference, reference)
+        else:
+            query = "SELECT run_id, git_sha FROM perf_runs WHERE run_id != ? AND environment = ? ORDER BY recorded_at DESC LIMIT 1"
+            parameters = (exclude_run_id, environment)
+        return self.connection.execute(query, parameters).fetchone()
+
+    def test_windows(self, environment: str, exclude_run_id: str, runs: int, reference: str | None = None) -> tuple[list[str], list[str]]:
+        """
+        Окна прогонов окружения для сравнения тестов. У теста одно значение за прогон, поэтому
+        текущий прогон вместе с `runs` - 1 предыдущими сравнивается с `runs` прогонами перед ними.
+
+        :param reference: run_id базового прогона: базовое окно заканчивается им, текущее составляют
+            прогоны после него.
+        :return: (run_id прогонов текущего окна без текущего прогона, run_id прогонов базового окна),
+            новые прогоны - первыми.
+        """
+        rows = self.connection.execute(
+            "SELECT run_id, recorded_at FROM perf_runs WHERE run_id != ? AND environment = ? ORDER BY recorded_at DESC",
+            (exclude_run_id, environment)
+        ).fetchall()
+        if reference is None:
+            run_ids = [run_id for run_id, _ in rows]
+            return run_ids[:runs - 1], run_ids[runs - 1:2 * runs - 1]
+
+        [recorded_at] = self.connection.execute("SELECT recorded_at FROM perf_runs WHERE run_id = ?", (reference,)).fetchone()
+        recent = [run_id for run_id, run_recorded_at in rows if run_recorded_at > recorded_at]
+        baseline = [run_id for run_id, run_recorded_at in rows if run_recorded_at <= recorded_at]
+        return recent[:runs - 1], baseline[:runs]
+
+    def samples(self, run_id: str) -> dict[tuple[str, str], list[float]]:
+        samples: dict[tuple[str, str], list[float]] = {}
+        rows = self.connection.execute("SELECT kind, name, value FROM perf_samples WHERE run_id = ?", (run_id,))
+        for kind, name, value in rows.fetchall():
+            samples.setdefault((kind, name), []).append(value)
+        return samples
+
+    def test_samples(self, run_ids: list[str]) -> dict[tuple[str, str], list[float]]:
+        """
+        Длительности тестов за несколько прогонов.
+        """
+        samples: dict[tuple[str, str], list[float]] = {}
+        rows = self.connection.execute(
+            f"SELECT name, value FROM perf_samples WHERE kind = 'test' AND run_id IN ({', '.join('?' * len(run_ids))})",
+            run_ids
+        )
+        for name, value in rows.fetchall():
+            samples.setdefault(("test", name), []).append(value)
+        return samples
+
+    def close(self):
+        self.connection.commit()
+        self.connection.close()
@@ -0,0 +1,139 @@
+import ast
+import json
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+CLIENTS_DIR = Path(__file__).resolve().parent.parent / "clients"
+
+# Маршруты и модули клиентов, вызванные текущим тестом (включая его фикстуры).
+# None означает, что запись карты маршрутов выключена
+_current: "RouteUsage | None" = None
+
+
+class RouteUsage(BaseModel):
+    """
+    Маршруты и модули клиентов, которые затрагивает тест
+    """
+    routes: set[str] = Field(default_factory=set)
+    modules: set[str] = Field(default_factory=set)
+
+
+class RouteImpactMap(BaseModel):
+    """
+    Карта "тест -> маршруты API", построенная по предыдущему прогону
+    """
+    tests: dict[str, RouteUsage] = Field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "RouteImpactMap":
+        if not path.exists():
+            return cls()
+        return cls.model_validate_json(path.read_text(encoding="utf-8"))
+
+    def save(self, path: Path):
+        data = {
+            node_id: {"routes": sorted(test.routes), "modules": sorted(test.modules)}
+            for node_id, test in sorted(self.tests.items())
+        }
+        path.write_text(json.dumps({"tests": data}, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def merge(self, other: "RouteImpactMap"):
+        """
+        Обновляет карту данными другого прогона (например, xdist воркера).
+        Записи тестов из `other` заменяют старые записи целиком.
+        """
+        self.tests.update(other.tests)
+
+    def is_affected(self, node_id: str, routes: set[str], modules: set[str]) -> bool:
+        """
+        Проверяет, затрагивает ли тест измененные маршруты или модули.
+        Тесты, которых нет в карте, считаются затронутыми: их влияние неизвестно.
+
+        :param node_id: Идентификатор теста pytest.
+        :param routes: Измененные маршруты. Маршрут `/api/v1/courses` затрагивает и `/api/v1/courses/{course_id}`.
+        :param modules: Измененные модули клиентов с учетом импортирующих их модулей.
+        """
+        test = self.tests.get(node_id)
+        if test is None:
+            return True
+
+        if test.modules & modules:
+            return True
+
+        return any(
+            route == changed or route.startswith(changed.rstrip("/") + "/")
+            for route in test.routes
+            for changed in routes
+        )
+
+
+def start_recording():
+    global _current
+    _current = RouteUsage()
+
+
+def stop_recording() -> RouteUsage | None:
+    global _current
+    test, _current = _current, None
+    return test
+
+
+def record_route(route: str, module: str):
+    """
+    Запоминает вызов маршрута клиентом. Вызывается плагином fixtures.route_impact, см. `clients.recorders`.
+
+    :param route: Шаблон маршрута, например /api/v1/courses/{course_id}
+    :param module: Модуль клиента, выполнившего запрос
+    """
+    if _current is not None:
+        _current.routes.add(route)
+        _current.modules.add(module)
+
+
+def to_module_name(value: str) -> str:
+    """
+    Приводит путь к модулю (clients/courses/courses_schema.py) к имени модуля (clients.courses.courses_schema).
+    """
+    value = value.strip()
+    if value.endswith(".py"):
+        value = value[:-3]
+    return value.replace("\\", ".").replace("/", ".").strip(".")
+
+
+def build_clients_import_graph() -> dict[str, set[str]]:
+    """
+    Строит граф импортов модулей пакета clients без их импорта.
+
+    :return: Словарь "модуль -> модули clients, которые он импортирует".
+    """
+    graph: dict[str, set[str]] = {}
+    for path in CLIENTS_DIR.rglob("*.py"):
+        module = to_module_name(str(path.relative_to(CLIENTS_DIR.parent)))
+        imports: set[str] = set()
+        for node in ast.walk(ast.parse(path.read_text(encoding="utf-8"))):
+            if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith("clients"):
+                imports.add(node.module)
+                # from clients import api_coverage
+                imports.update(f"{node.module}.{alias.name}" for alias in node.names)
+            elif isinstance(node, ast.Import):
+                imports.update(alias.name for alias in node.names if alias.name.startswith("clients"))
+        graph[module] = imports
+    return graph
+
+
+def expand_changed_modules(changed: set[str]) -> set[str]:
+    """
+    Дополняет измененные модули всеми модулями clients, которые импортируют их прямо или транзитивно.
+    Например, изменение users_schema затрагивает courses_schema и courses_client.
+    """
+    graph = build_clients_import_graph()
+    affected = set(changed)
+    updated = True
+    while updated:
+        updated = False
+        for module, imports in graph.items():
+            if module not in affected and imports & affected:
+                affected.add(module)
+                updated = True
+    return affected
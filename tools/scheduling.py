@@ -0,0 +1,38 @@
+from xdist.scheduler import LoadScopeScheduling
+
+from tools.durations import DurationHistory
+
+
+class DurationScheduling(LoadScopeScheduling):
+    """
+    Планировщик xdist, распределяющий тесты по истории их длительностей.
+
+    - каждый тест - отдельная единица работы, кроме тестов с общей дорогой фикстурой
+      уровня class/module/package: они объединяются, чтобы фикстура выполнилась на одном воркере;
+    - единицы работы выдаются воркерам от самой долгой к самой короткой (longest processing time first),
+      поэтому длинные тесты не остаются в хвосте прогона.
+    """
+    def __init__(self, config, log=None, *, history: DurationHistory, threshold: float):
+        super().__init__(config, log)
+        self.estimates = history.test_estimates()
+        self.groups = history.shared_fixture_groups(threshold)
+        # Тесты без истории оцениваются средним значением, чтобы не уходить ни в начало, ни в конец очереди
+        self.default_estimate = sum(self.estimates.values()) / len(self.estimates) if self.estimates else 1.0
+        self._ordered = False
+
+    def _split_scope(self, nodeid: str) -> str:
+        if group := self.groups.get(nodeid):
+            return f"fixture:{group}"
+        return nodeid
+
+    def _estimate(self, work_unit: dict[str, bool]) -> float:
+        return sum(self.estimates.get(nodeid, self.default_estimate) for nodeid in work_unit)
+
+    def _assign_work_unit(self, node):
+        if not self._ordered:
+            ordered = sorted(self.workqueue.items(), key=lambda item: self._estimate(item[1]), reverse=True)
+            self.workqueue.clear()
+            self.workqueue.update(ordered)
+            self._ordered = True
+
+        super()._assign_work_unit(node)
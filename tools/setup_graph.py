@@ -0,0 +1,94 @@
+import contextvars
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+
+@dataclass
+class SetupNode:
+    """
+    Шаг подготовки данных: функция и шаги, результаты которых она принимает
+    """
+    name: str
+    func: Callable[..., Any]
+    after: tuple[str, ...] = field(default_factory=tuple)
+
+
+class SetupGraph:
+    """
+    Граф шагов подготовки данных теста.
+
+    Независимые шаги выполняются параллельно в пуле потоков, поэтому время подготовки
+    определяется самой длинной цепочкой зависимых шагов, а не суммой всех шагов.
+
+    Пример:
+        graph = SetupGraph()
+        graph.add("file", lambda: files_client.create_file(file_request))
+        graph.add("course", lambda file: courses_client.create_course(...), after=["file"])
+        course = graph.run()["course"]
+    """
+    def __init__(self, max_workers: int = 8):
+        """
+        :param max_workers: Максимальное количество одновременно выполняемых шагов.
+        """
+        self.max_workers = max_workers
+        self.nodes: dict[str, SetupNode] = {}
+
+    def add(self, name: str, func: Callable[..., Any], after: Iterable[str] = ()) -> "SetupGraph":
+        """
+        Добавляет шаг.
+
+        :param name: Уникальное имя шага.
+        :param func: Функция шага. Результаты шагов из `after` передаются в нее позиционно, в том же порядке.
+        :param after: Имена шагов, которые должны завершиться до начала этого шага.
+        :return: Граф для цепочки вызовов.
+        """
+        if name in self.nodes:
+            raise ValueError(f'Шаг "{name}" уже добавлен')
+        self.nodes[name] = SetupNode(name, func, tuple(after))
+        return self
+
+    def _validate(self):
+        for node in self.nodes.values():
+            for dependency in node.after:
+                if dependency not in self.nodes:
+                    raise ValueError(f'Шаг "{node.name}" зависит от неизвестного шага "{dependency}"')
+
+    def run(self) -> dict[str, Any]:
+        """
+        Выполняет все шаги с учетом зависимостей.
+
+        Для каждого запуска создается новый пул потоков: Allure привязывает поток к текущему
+        тесту при первом шаге в нем, и переиспользованные потоки писали бы шаги в чужой тест.
+        Каждый шаг выполняется в копии контекста вызывающего потока (contextvars).
+
+        :return: Словарь "имя шага -> результат".
+        :raises ValueError: Если граф содержит неизвестные шаги или цикл.
+        :raises Exception: Первая ошибка шага. Еще не начатые шаги при этом не выполняются.
+        """
+        self._validate()
+        results: dict[str, Any] = {}
+        pending = dict(self.nodes)
+        running: dict[Future, str] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="setup-graph") as executor:
+            try:
+                while pending or running:
+                    for name, node in list(pending.items()):
+                        if all(dependency in results for dependency in node.after):
+                            args = [results[dependency] for dependency in node.after]
+                            context = contextvars.copy_context()
+                            running[executor.submit(context.run, node.func, *args)] = name
+                            del pending[name]
+
+                    if not running:
+                        raise ValueError(f"Цикл в зависимостях шагов: {', '.join(pending)}")
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results[running.pop(future)] = future.result()
+            finally:
+                for future in running:
+                    future.cancel()
+
+        return results
@@ -0,0 +1,165 @@
+import os
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from pydantic import BaseModel
+
+# Кадры, которые относятся к самому профилированию и импорту модулей, а не к тестам
+IGNORED_FRAMES = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+)
+
+
+def read_rss() -> int | None:
+    """
+    Текущий RSS процесса в байтах. Доступен только в Linux.
+    """
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def count_descriptors() -> tuple[int | None, int | None]:
+    """
+    Количество открытых файловых дескрипторов и сокетов среди них. Доступно только в Linux.
+    """
+    try:
+        names = os.listdir("/proc/self/fd")
+    except OSError:
+        return None, None
+
+    sockets = 0
+    for name in names:
+        try:
+            if os.readlink(f"/proc/self/fd/{name}").startswith("socket:"):
+                sockets += 1
+        except OSError:
+            # Дескриптор listdir закрывается, пока мы по ним проходим
+            continue
+    return len(names), sockets
+
+
+class ResourceSample(BaseModel):
+    iteration: int
+    elapsed: float  # секунд с начала прогона
+    rss_bytes: int | None
+    open_fds: int | None
+    open_sockets: int | None
+    traced_bytes: int  # память, выделенная Python и отслеживаемая tracemalloc
+
+
+class SoakReport(BaseModel):
+    """
+    Рост потребления ресурсов с конца первой (прогревочной) итерации до конца прогона
+    """
+    iterations: int
+    duration: float
+    rss_growth_bytes: int | None
+    fd_growth: int | None
+    socket_growth: int | None
+    traced_growth_bytes: int
+    rss_growth_per_hour: float | None  # наклон линейной регрессии по замерам
+    top_allocations: list[str]
+    samples: list[ResourceSample]
+
+    def violations(self, rss_budget_bytes: int, fd_budget: int) -> list[str]:
+        messages = []
+        if self.rss_growth_bytes is not None and self.rss_growth_bytes > rss_budget_bytes:
+            messages.append(f"RSS вырос на {self.rss_growth_bytes / 2 ** 20:.1f} МиБ, бюджет {rss_budget_bytes / 2 ** 20:.1f} МиБ")
+        if self.fd_growth is not None and self.fd_growth > fd_budget:
+            messages.append(f"Открытых дескрипторов стало больше на {self.fd_growth}, бюджет {fd_budget}")
+        return messages
+
+    def summary(self) -> list[str]:
+        def mib(value: int | float | None) -> str:
+            return "н/д" if value is None else f"{value / 2 ** 20:+.2f} МиБ"
+
+        def count(value: int | None) -> str:
+            return "н/д" if value is None else f"{value:+}"
+
+        lines = [
+            f"Итераций: {self.iterations}, длительность: {self.duration:.0f} с",
+            f"RSS: {mib(self.rss_growth_bytes)} ({mib(self.rss_growth_per_hour)} в час)",
+            f"Память Python (tracemalloc): {mib(self.traced_growth_bytes)}",
+            f"Файловые дескрипторы: {count(self.fd_growth)}",
+            f"Сокеты: {count(self.socket_growth)}",
+            "Места с наибольшим ростом выделенной памяти:",
+        ]
+        lines.extend(f"  {allocation}" for allocation in self.top_allocations)
+        return lines
+
+
+@dataclass
+class SoakMonitor:
+    """
+    Собирает замеры RSS, дескрипторов, сокетов и tracemalloc между итерациями soak-прогона.
+
+    Базовая линия снимается после первой итерации: она прогревает кеши, импорты и пулы соединений.
+    """
+    frames: int = 5  # глубина стека в tracemalloc, больше - точнее места выделения и медленнее прогон
+    samples: list[ResourceSample] = field(default_factory=list)
+    _baseline: tracemalloc.Snapshot | None = None
+    _started_at: float = 0.0
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+        self._started_at = time.monotonic()
+
+    def sample(self, iteration: int) -> ResourceSample:
+        open_fds, open_sockets = count_descriptors()
+        sample = ResourceSample(
+            iteration=iteration,
+            elapsed=time.monotonic() - self._started_at,
+            rss_bytes=read_rss(),
+            open_fds=open_fds,
+            open_sockets=open_sockets,
+            traced_bytes=tracemalloc.get_traced_memory()[0]
+        )
+        self.samples.append(sample)
+        if self._baseline is None:
+            self._baseline = tracemalloc.take_snapshot().filter_traces(IGNORED_FRAMES)
+        return sample
+
+    def report(self, top: int = 10) -> SoakReport:
+        """
+        Строит отчет о росте ресурсов и останавливает tracemalloc.
+        """
+        first, last = self.samples[0], self.samples[-1]
+        snapshot = tracemalloc.take_snapshot().filter_traces(IGNORED_FRAMES)
+        tracemalloc.stop()
+
+        def growth(name: str) -> int | None:
+            before, after = getattr(first, name), getattr(last, name)
+            return None if before is None or after is None else after - before
+
+        rss_per_hour = None
+        points = [(sample.elapsed, sample.rss_bytes) for sample in self.samples if sample.rss_bytes is not None]
+        if len(points) > 2:
+            slope, _ = statistics.linear_regression(*zip(*points))
+            rss_per_hour = slope * 3600
+
+        stats = snapshot.compare_to(self._baseline, "traceback")[:top]
+        return SoakReport(
+            iterations=last.iteration,
+            duration=last.elapsed,
+            rss_growth_bytes=growth("rss_bytes"),
+            fd_growth=growth("open_fds"),
+            socket_growth=growth("open_sockets"),
+            traced_growth_bytes=last.traced_bytes - first.traced_bytes,
+            rss_growth_per_hour=rss_per_hour,
+            top_allocations=[
+                f"{stat.size_diff / 1024:+.1f} КиБ в {stat.count_diff:+} блоках: "
+                + " <- ".join(f"{frame.filename}:{frame.lineno}" for frame in reversed(stat.traceback))
+                for stat in stats
+            ],
+            samples=self.samples
+        )
@@ -0,0 +1,177 @@
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from pathlib import Path
+from typing import Any, Iterator
+
+from tools.warmup import is_warming_up
+
+
+class SpanKind(IntEnum):
+    """
+    Значения SpanKind из OTLP
+    """
+    INTERNAL = 1
+    CLIENT = 3
+
+
+class StatusCode(IntEnum):
+    """
+    Значения Status.code из OTLP
+    """
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+@dataclass
+class Span:
+    name: str
+    trace_id: str  # 32 hex символа
+    span_id: str  # 16 hex символов
+    parent_span_id: str | None
+    kind: SpanKind = SpanKind.INTERNAL
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int = 0
+    attributes: dict[str, Any] = field(default_factory=dict)
+    status: StatusCode = StatusCode.UNSET
+    status_message: str = ""
+
+    @property
+    def traceparent(self) -> str:
+        """
+        Заголовок W3C Trace Context, по которому сервер продолжает трассу клиента.
+        """
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_otlp(self) -> dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": int(self.kind),
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": int(self.status), "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# Текущий спан. Копируется в потоки SetupGraph вместе с остальным контекстом
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Минимальный трассировщик без зависимостей от OpenTelemetry SDK.
+
+    Спаны пишутся в файл в формате OTLP/JSON (одна строка - один ExportTraceServiceRequest),
+    который принимают OpenTelemetry Collector (otlpjsonfile receiver) и Jaeger/Tempo при импорте.
+    Пока трассировка не включена, `span` ничего не делает.
+    """
+    def __init__(self, service_name: str = "autotests-api"):
+        self.service_name = service_name
+        self.path: Path | None = None
+        self._finished: list[Span] = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def enable(self, path: Path):
+        self.path = path
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    @contextmanager
+    def span(
+            self,
+            name: str,
+            kind: SpanKind = SpanKind.INTERNAL,
+            attributes: dict[str, Any] | None = None,
+            new_trace: bool = False
+    ) -> Iterator[Span | None]:
+        """
+        Создает дочерний спан текущего спана.
+
+        :param name: Имя спана.
+        :param kind: Тип спана, для HTTP запросов - CLIENT.
+        :param attributes: Атрибуты спана.
+        :param new_trace: Начать новую трассу, например для каждого теста.
+        :return: Спан или None, если трассировка выключена.
+        """
+        if not self.enabled or is_warming_up():
+            yield None
+            return
+
+        parent = None if new_trace else _current_span.get()
+        span = Span(
+            name=name,
+            trace_id=parent.trace_id if parent is not None else secrets.token_hex(16),
+            span_id=secrets.token_hex(8),
+            parent_span_id=parent.span_id if parent is not None else None,
+            kind=kind,
+            attributes=dict(attributes or {})
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.status = StatusCode.ERROR
+            span.status_message = f"{type(error).__name__}: {error}"
+            raise
+        finally:
+            span.end_ns = time.time_ns()
+            _current_span.reset(token)
+            with self._lock:
+                self._finished.append(span)
+
+    def flush(self):
+        """
+        Дописывает завершенные спаны в файл одной строкой OTLP/JSON.
+        """
+        with self._lock:
+            spans, self._finished = self._finished, []
+        if not spans or self.path is None:
+            return
+
+        request = {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    _otlp_attribute("service.name", self.service_name),
+                    _otlp_attribute("process.pid", os.getpid()),
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "tools.tracing"},
+                    "spans": [span.to_otlp() for span in spans]
+                }]
+            }]
+        }
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write(json.dumps(request, ensure_ascii=False) + "\n")
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+tracer = Tracer()
@@ -0,0 +1,22 @@
+from contextlib import contextmanager
+
+# Флаг прогрева. Обычная переменная, а не ContextVar: прогрев отправляет запросы из нескольких потоков
+_active = False
+
+
+@contextmanager
+def warming_up():
+    """
+    Помечает запросы прогрева: они не попадают в покрытие, длительности фаз, историю производительности,
+    метрики, записанные сценарии нагрузки, трассировку и отчет сравнения окружений.
+    """
+    global _active
+    _active = True
+    try:
+        yield
+    finally:
+        _active = False
+
+
+def is_warming_up() -> bool:
+    return _active
@@ -0,0 +1,59 @@
+from typing import Callable, TypeVar
+
+import pytest
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+
+def is_worker(config: pytest.Config) -> bool:
+    """
+    True в процессе xdist воркера.
+    """
+    return hasattr(config, "workerinput")
+
+
+def is_controller(config: pytest.Config) -> bool:
+    """
+    True в контроллере xdist (-n N): он раздает тесты воркерам и сам их не выполняет.
+    """
+    return config.pluginmanager.has_plugin("dsession")
+
+
+def worker_id(config: pytest.Config) -> str | None:
+    """
+    Идентификатор xdist воркера, например gw0, или None вне воркера.
+    """
+    return config.workerinput["workerid"] if is_worker(config) else None
+
+
+def send_to_controller(config: pytest.Config, key: str, value: BaseModel | str) -> bool:
+    """
+    В xdist воркере передает данные контроллеру, где их принимает `collect_from_workers` с тем же ключом.
+    Вызывается из pytest_sessionfinish: файлы и отчеты пишет только контроллер.
+
+    :param value: Модель или уже сериализованные данные. Модель сериализуется только в воркере.
+    :return: True, если это воркер и данные переданы.
+    """
+    if not is_worker(config):
+        return False
+    config.workeroutput[key] = value.model_dump_json() if isinstance(value, BaseModel) else value
+    return True
+
+
+def collect_from_workers(key: str, load: Callable[[str], T], merge: Callable[[T], None]):
+    """
+    Создает хук pytest_testnodedown, который объединяет данные, переданные воркерами через `send_to_controller`:
+
+        pytest_testnodedown = collect_from_workers("codec_metrics", CodecMetrics.model_validate_json, codec_metrics.merge)
+
+    :param key: Ключ данных в workeroutput.
+    :param load: Разбор сериализованных данных, например `Model.model_validate_json`.
+    :param merge: Объединение данных воркера с данными контроллера.
+    """
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_testnodedown(node, error):
+        if data := node.workeroutput.get(key):
+            merge(load(data))
+
+    return pytest_testnodedown